@@ -1,106 +1,2546 @@
-import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import plotly.express as px
 import numpy as np
-from datetime import datetime, timedelta
 import dash
-from dash import dcc, html, Input, Output, callback
+from dash import dcc, html, Input, Output, State, MATCH, ALL, callback, no_update
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
-import webbrowser
+from flask import request, Response, g
+from plotly.io.json import to_json_plotly
 import threading
 import time
 import os
+import io
+import sys
+import json
+import pickle
+import mmap
+import gzip
+import base64
+import hashlib
+import hmac
+import random
+import bisect
+import contextlib
+import functools
+import dataclasses
+import mimetypes
+import pkgutil
+import re
+from collections import OrderedDict
+from dash.fingerprint import check_fingerprint
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+def compress_payload(body, brotli_quality=5, gzip_level=6):
+    """Identity, gzip and (when available) brotli variants of a response body"""
+    # The defaults suit payloads built per request or at boot; static files use higher levels
+    variants = {'identity': body, 'gzip': gzip.compress(body, compresslevel=gzip_level, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(body, quality=brotli_quality)
+    return variants
+
+
+def payload_response(variants, etag=None, cache_control='no-cache', mimetype='application/json'):
+    """Flask response for precompressed variants, negotiated on Accept-Encoding"""
+    encoding = request.accept_encodings.best_match(
+        [enc for enc in ('br', 'gzip') if enc in variants]
+    )
+    if etag and request.if_none_match.contains_weak(f'{etag}-{encoding or "identity"}'):
+        response = Response(status=304)
+    else:
+        # WSGI servers only accept bytes; mmap-backed payloads are copied out of the
+        # shared page cache here (bytes() of a bytes object is a no-op)
+        response = Response(bytes(variants[encoding or 'identity']), mimetype=mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    if etag:
+        response.set_etag(f'{etag}-{encoding or "identity"}')
+    response.headers['Cache-Control'] = cache_control
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+
+class StaticAssets:
+    """Index page and component bundles, compressed once and served by content hash"""
+
+    # URL of a component bundle inside the index page
+    SUITE_URL = re.compile(r'_dash-component-suites/(?P<package>[^/"]+)/(?P<path>[^"?]+)')
+    # The m<mtime> half of a Dash fingerprint, as in file.v2_14_2m1701127789.min.js
+    FINGERPRINT_HASH = re.compile(r'(\.v[\w-]+m)[0-9a-fA-F]+\.')
+    IMMUTABLE = 'public, max-age=31536000, immutable'
+
+    def __init__(self, app, brotli_quality=9):
+        self.app = app
+        self.brotli_quality = brotli_quality
+        self._assets = {}
+        self._index = None
+        self._lock = threading.Lock()
+
+    def asset(self, package, path):
+        """(content hash, compressed variants) of a registered package file, or None"""
+        key = (package, path)
+        entry = self._assets.get(key)
+        if entry is None:
+            if path not in self.app.registered_paths.get(package, ()):
+                return None
+            with self._lock:
+                entry = self._assets.get(key)
+                if entry is None:
+                    body = pkgutil.get_data(package, path)
+                    entry = (hashlib.sha1(body).hexdigest()[:20],
+                             compress_payload(body, brotli_quality=self.brotli_quality, gzip_level=9))
+                    self._assets[key] = entry
+        return entry
+
+    def serve_asset(self, package, fingerprinted_path):
+        """Response for a component suite request; None leaves it to Dash"""
+        path, has_fingerprint = check_fingerprint(fingerprinted_path)
+        entry = self.asset(package, path)
+        if entry is None:
+            return None
+        content_hash, variants = entry
+        mimetype = mimetypes.types_map.get('.' + path.rsplit('.', 1)[-1], 'application/octet-stream')
+        # Fingerprinted URLs change whenever the content does (the index uses
+        # content hashes; async chunk names carry the package build's stamp)
+        cache_control = self.IMMUTABLE if has_fingerprint else 'no-cache'
+        return payload_response(variants, etag=content_hash, cache_control=cache_control, mimetype=mimetype)
+
+    def fingerprint(self, match):
+        """Swap a bundle URL's mtime fingerprint for one derived from its content"""
+        path, has_fingerprint = check_fingerprint(match.group('path'))
+        entry = self.asset(match.group('package'), path) if has_fingerprint else None
+        if entry is None:
+            return match.group(0)
+        return self.FINGERPRINT_HASH.sub(lambda m: m.group(1) + entry[0] + '.', match.group(0), count=1)
+
+    def index(self):
+        """(etag, compressed variants) of the rendered index page, built once"""
+        if self._index is None:
+            html_page = self.SUITE_URL.sub(self.fingerprint, self.app.index())
+            body = html_page.encode('utf-8')
+            self._index = (hashlib.sha1(body).hexdigest()[:20],
+                           compress_payload(body, brotli_quality=self.brotli_quality, gzip_level=9))
+        return self._index
+
+    def prebuild(self):
+        """Render the index and compress every bundle it references"""
+        with self.app.server.test_request_context(self.app.config.requests_pathname_prefix):
+            self.index()
+
+
+class Telemetry:
+    """Prometheus counters, gauges and histograms, merged across worker processes"""
+
+    FLUSH_SECONDS = 1.0
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.metrics = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._dirty = False
+        self._flusher = None
+
+    def counter(self, name, documentation, labels=()):
+        return self._register(Counter(self, name, documentation, labels))
+
+    def gauge(self, name, documentation, labels=()):
+        return self._register(Gauge(self, name, documentation, labels))
+
+    def histogram(self, name, documentation, labels=(), buckets=()):
+        return self._register(Histogram(self, name, documentation, labels, buckets))
+
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def start(self):
+        """Begin periodic snapshots from this process (idempotent, and fork-aware)"""
+        if not self.directory or (self._flusher is not None and self._pid == os.getpid()):
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                for metric in self.metrics.values():
+                    metric.values.clear()
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.FLUSH_SECONDS)
+            if self._dirty:
+                self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {name: [[list(labels), value] for labels, value in metric.values.items()]
+                    for name, metric in self.metrics.items()}
+
+    def flush(self):
+        """Write this process's values to <directory>/<pid>.json"""
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'{os.getpid()}.json')
+        self._dirty = False
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(path + '.tmp', path)
+
+    def collect(self):
+        """Values of every metric summed over all processes, as {name: {labels: value}}"""
+        snapshots = [(os.getpid(), self.snapshot())]
+        if self.directory and os.path.isdir(self.directory):
+            for filename in os.listdir(self.directory):
+                pid = filename[:-len('.json')]
+                if not filename.endswith('.json') or not pid.isdigit() or int(pid) == os.getpid():
+                    continue
+                try:
+                    with open(os.path.join(self.directory, filename)) as f:
+                        snapshots.append((int(pid), json.load(f)))
+                except (OSError, ValueError):
+                    continue
+        totals = {name: {} for name in self.metrics}
+        for pid, snapshot in snapshots:
+            for name, values in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None or (isinstance(metric, Gauge) and not process_alive(pid)):
+                    continue
+                for labels, value in values:
+                    labels = tuple(labels)
+                    totals[name][labels] = metric.merge(totals[name].get(labels), value)
+        return totals
+
+    def exposition(self):
+        """Prometheus text format (0.0.4) for every registered metric"""
+        lines = []
+        for name, values in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            for labels, value in sorted(values.items()):
+                lines.extend(metric.samples(labels, value))
+        return '\n'.join(lines) + '\n'
+
+
+def process_alive(pid):
+    """Whether a process with this pid still exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def format_labels(names, values, extra=()):
+    """{name="value",...} with Prometheus escaping, or '' without labels"""
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+class Counter:
+    """Monotonic total per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, telemetry, name, documentation, labels):
+        self.telemetry = telemetry
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self.telemetry._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+            self.telemetry._dirty = True
+
+    def merge(self, total, value):
+        return value if total is None else total + value
+
+    def samples(self, labels, value):
+        return [f'{self.name}{format_labels(self.labels, labels)} {value}']
+
+
+class Gauge(Counter):
+    """Value that goes up and down, such as requests in flight"""
+
+    kind = 'gauge'
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Counter):
+    """Bucketed observations (latencies, sizes) per label set"""
+
+    kind = 'histogram'
+
+    def __init__(self, telemetry, name, documentation, labels, buckets):
+        super().__init__(telemetry, name, documentation, labels)
+        self.buckets = sorted(buckets)
+
+    def observe(self, value, **labels):
+        """Count one observation; stored as per-bucket counts plus sum and count"""
+        key = tuple(labels[name] for name in self.labels)
+        bucket = bisect.bisect_left(self.buckets, value)
+        with self.telemetry._lock:
+            counts = self.values.get(key)
+            if counts is None:
+                counts = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[bucket] += 1
+            counts[-1] += value
+            self.telemetry._dirty = True
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def merge(self, total, value):
+        return list(value) if total is None else [a + b for a, b in zip(total, value)]
+
+    def samples(self, labels, value):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ['+Inf'], value[:-1]):
+            cumulative += count
+            le = bound if bound == '+Inf' else repr(float(bound))
+            lines.append(f'{self.name}_bucket{format_labels(self.labels, labels, [("le", le)])} {cumulative}')
+        lines.append(f'{self.name}_sum{format_labels(self.labels, labels)} {value[-1]}')
+        lines.append(f'{self.name}_count{format_labels(self.labels, labels)} {cumulative}')
+        return lines
+
+
+# Process-wide telemetry, exported at /metrics. Set METRICS_DIR to aggregate
+# across gunicorn workers (gunicorn.conf.py does this by default).
+TELEMETRY = Telemetry(os.environ.get('METRICS_DIR') or None)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1 << 10, 4 << 10, 16 << 10, 64 << 10, 256 << 10, 1 << 20, 4 << 20, 16 << 20)
+TAB_RENDER_SECONDS = TELEMETRY.histogram(
+    'zestmoney_tab_render_seconds', 'Time to answer a tab switch (render_tab_content or payload store)',
+    ['tab'], LATENCY_BUCKETS)
+CHART_BUILD_SECONDS = TELEMETRY.histogram(
+    'zestmoney_chart_build_seconds', 'Time spent in a create_* chart builder', ['chart'], LATENCY_BUCKETS)
+RESPONSE_BYTES = TELEMETRY.histogram(
+    'zestmoney_response_bytes', 'Response body size as sent (after compression)', ['route'], SIZE_BUCKETS)
+CACHE_REQUESTS = TELEMETRY.counter(
+    'zestmoney_cache_requests_total', 'Figure and payload cache lookups', ['cache', 'result'])
+REQUESTS_IN_FLIGHT = TELEMETRY.gauge(
+    'zestmoney_requests_in_flight', 'Requests currently being handled')
+BACKGROUND_JOBS = TELEMETRY.counter(
+    'zestmoney_background_jobs_total', 'Background job requests and outcomes', ['kind', 'result'])
+
+
+def timed_chart(chart, builder):
+    """Chart builder that records its build time"""
+    def build(*args, **kwargs):
+        with CHART_BUILD_SECONDS.time(chart=chart):
+            return builder(*args, **kwargs)
+    return build
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack on a timer and writes folded stacks"""
+
+    extension = 'folded'
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.stacks = {}
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+
+    def start(self):
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                key = ';'.join(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f'{stack} {count}\n')
+
+
+class DeterministicProfiler:
+    """cProfile of the request thread, written as .pstats"""
+
+    extension = 'pstats'
 
-class ZestMoneyAnalytics:
     def __init__(self):
-        self.initialize_data()
-        self.setup_styling()
-        
-    def initialize_data(self):
-        # Financial Performance Data
-        self.financial_data = {
-            'year': [2018, 2019, 2020, 2021, 2022, 2023, 2024],
-            'revenue_cr': [8.2, 26.7, 72.4, 89.3, 138.4, 243.7, 320.0],
-            'loss_cr': [15.2, 45.0, 78.0, 125.8, 398.8, 412.4, 485.0],
-            'expenses_cr': [23.4, 71.7, 150.4, 215.1, 543.8, 662.2, 805.0],
-            'growth_rate': [0, 225.6, 171.2, 23.3, 55.0, 76.0, 31.3],
-            'burn_multiple': [2.85, 2.68, 2.08, 2.41, 3.93, 2.72, 2.52],
-            'gross_margin': [28.5, 12.5, 18.7, 22.1, 15.3, 8.9, 12.5],
-            'marketing_expenses': [0, 0, 28.5, 48.2, 125.0, 165.0, 220.0],
-            'employee_costs': [0, 0, 32.4, 52.8, 93.3, 130.4, 165.0],
-            'bad_debt_provisions': [0, 0, 38.2, 78.5, 198.5, 142.8, 195.0]
+        import cProfile
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def write(self, path):
+        self.profile.dump_stats(path)
+
+
+PROFILERS = {'sample': SamplingProfiler, 'cprofile': DeterministicProfiler}
+
+
+# Built-in sample datasets, used when no DATA_SOURCE is configured
+SAMPLE_DATA = {
+    # Financial Performance Data
+    'financial': {
+        'year': [2018, 2019, 2020, 2021, 2022, 2023, 2024],
+        'revenue_cr': [8.2, 26.7, 72.4, 89.3, 138.4, 243.7, 320.0],
+        'loss_cr': [15.2, 45.0, 78.0, 125.8, 398.8, 412.4, 485.0],
+        'expenses_cr': [23.4, 71.7, 150.4, 215.1, 543.8, 662.2, 805.0],
+        'growth_rate': [0, 225.6, 171.2, 23.3, 55.0, 76.0, 31.3],
+        'burn_multiple': [2.85, 2.68, 2.08, 2.41, 3.93, 2.72, 2.52],
+        'gross_margin': [28.5, 12.5, 18.7, 22.1, 15.3, 8.9, 12.5],
+        'marketing_expenses': [0, 0, 28.5, 48.2, 125.0, 165.0, 220.0],
+        'employee_costs': [0, 0, 32.4, 52.8, 93.3, 130.4, 165.0],
+        'bad_debt_provisions': [0, 0, 38.2, 78.5, 198.5, 142.8, 195.0]
+    },
+
+    # Operational Data
+    'operational': {
+        'year': [2018, 2019, 2020, 2021, 2022, 2023, 2024],
+        'users_millions': [0.5, 1.2, 3.0, 6.0, 12.0, 17.0, 17.0],
+        'active_users_millions': [0.2, 0.5, 1.2, 2.8, 6.5, 8.5, 6.8],
+        'merchants': [50, 200, 1000, 3000, 7500, 10000, 12000],
+        'npa_rate': [2.5, 3.5, 4.2, 5.0, 6.5, 6.8, 7.2],
+        'industry_npa': [1.5, 1.5, 1.5, 1.5, 1.5, 1.5, 1.5],
+        'churn_rate': [15, 18, 20, 25, 30, 35, 40],
+        'nps_score': [65, 70, 75, 70, 65, 60, 55],
+        'app_rating': [4.2, 4.1, 3.9, 3.7, 3.4, 3.1, 2.9]
+    },
+
+    # Strategic Opportunities
+    'opportunities': {
+        'name': ['B2B Credit Infrastructure', 'SME Lending Platform', 'Credit Scoring APIs', 'RegTech Solutions', 'Open Banking APIs', 'AI Risk Management'],
+        'tam_billions': [25, 195, 18, 12, 32, 28],
+        'capital_required': [20, 60, 12, 8, 35, 25],
+        'time_to_market': [15, 24, 10, 8, 24, 20],
+        'revenue_potential': [9, 8, 8, 7, 9, 8],
+        'risk_score': [4, 8, 3, 2, 5, 6],
+        'attractiveness': [7.8, 6.1, 7.5, 7.6, 7.4, 7.3]
+    },
+
+    # Funding History
+    'funding': {
+        'round': ['Seed', 'Series A', 'Series B', 'Series C', 'Bridge', 'Emergency'],
+        'amount': [4.7, 22, 20, 50, 15, 8.5],
+        'year': [2016, 2017, 2019, 2021, 2022, 2023],
+        'valuation': [20, 85, 180, 435, 420, 380]
+    },
+
+    # Market Data
+    'market': {
+        'segment': ['Digital Payments', 'SME Lending', 'Credit APIs', 'RegTech', 'Open Banking', 'AI Fintech'],
+        'size_billions': [85, 195, 18, 12, 32, 28],
+        'cagr': [45, 24, 32, 36, 52, 59],
+        'addressable_pct': [25, 55, 85, 70, 50, 35]
+    },
+
+    # Customer Segments
+    'customer': {
+        'segment': ['Young Professionals', 'Students', 'SME Owners', 'Freelancers', 'Tech Workers', 'Urban Salaried'],
+        'size_millions': [28, 22, 15, 12, 18, 65],
+        'avg_transaction': [25000, 18000, 45000, 22000, 48000, 35000],
+        'default_rate': [8, 15, 6, 12, 5, 7],
+        'ltv': [125000, 85000, 280000, 110000, 320000, 220000],
+        'cac': [3500, 2800, 5500, 4200, 4800, 3200],
+        'profitability': [8, 6, 9, 7, 10, 9]
+    },
+
+    # Risk Data
+    'risk': {
+        'category': ['Credit Risk', 'Regulatory Risk', 'Market Risk', 'Technology Risk', 'Operational Risk', 'Funding Risk'],
+        'probability': [9, 8, 7, 5, 6, 8],
+        'impact': [10, 9, 7, 6, 7, 9],
+        'mitigation_cost': [25, 12, 8, 15, 10, 35]
+    }
+}
+
+
+class DataSource:
+    """Loads named datasets as dicts of columns"""
+
+    def load(self, name):
+        """Columns of one dataset, or None when this source does not have it"""
+        raise NotImplementedError
+
+    def version(self):
+        """Cheap fingerprint that changes whenever the underlying data does"""
+        raise NotImplementedError
+
+
+class InlineDataSource(DataSource):
+    """In-memory dict-of-lists datasets (the built-in sample data by default)"""
+
+    def __init__(self, datasets=None, fallback=None):
+        self.datasets = SAMPLE_DATA if datasets is None else datasets
+        # The sample data's generated datasets are built when first loaded
+        self.generators = SAMPLE_GENERATORS if datasets is None else {}
+        self.fallback = fallback
+
+    def load(self, name):
+        dataset = self.datasets.get(name)
+        if dataset is None and name in self.generators:
+            dataset = self.generators[name]()
+        if dataset is None:
+            return self.fallback.load(name) if self.fallback else None
+        return {column: values.copy() for column, values in dataset.items()}
+
+    def version(self):
+        digest = hashlib.sha1()
+        for name in sorted(self.datasets):
+            for column, values in sorted(self.datasets[name].items()):
+                digest.update(f'{name}.{column}'.encode('utf-8'))
+                if isinstance(values, np.ndarray) and values.dtype.kind != 'O':
+                    # str(array) elides the middle of long arrays, so hash the raw bytes
+                    digest.update(f'{values.dtype.str}{values.shape}'.encode('utf-8'))
+                    digest.update(np.ascontiguousarray(values).tobytes())
+                else:
+                    values = values.tolist() if isinstance(values, np.ndarray) else values
+                    digest.update(json.dumps(values, default=str).encode('utf-8'))
+        # Generated datasets only change with the code
+        digest.update(json.dumps(sorted(self.generators)).encode('utf-8'))
+        if self.fallback:
+            digest.update(self.fallback.version().encode('utf-8'))
+        return digest.hexdigest()[:12]
+
+
+class FileDataSource(DataSource):
+    """One file per dataset in a directory: <name>.parquet, .arrow/.feather or .csv"""
+
+    EXTENSIONS = ('.parquet', '.arrow', '.feather', '.csv')
+
+    def __init__(self, directory, fallback=None):
+        self.directory = directory
+        self.fallback = fallback
+
+    def _path(self, name):
+        for extension in self.EXTENSIONS:
+            path = os.path.join(self.directory, name + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def load(self, name):
+        path = self._path(name)
+        if path is None:
+            return self.fallback.load(name) if self.fallback else None
+
+        if path.endswith('.csv'):
+            import pandas as pd  # deferred: pandas roughly doubles cold-start time
+            frame = pd.read_csv(path, memory_map=True)
+            return {column: frame[column].to_numpy() for column in frame.columns}
+
+        import pyarrow as pa
+        if path.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            table = pq.read_table(path, memory_map=True)
+        else:
+            table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        return {column: arrow_column_to_numpy(table.column(column)) for column in table.column_names}
+
+    def version(self):
+        stats = []
+        for filename in sorted(os.listdir(self.directory)):
+            if filename.endswith(self.EXTENSIONS):
+                stat = os.stat(os.path.join(self.directory, filename))
+                stats.append([filename, stat.st_size, stat.st_mtime_ns])
+        if self.fallback:
+            stats.append(self.fallback.version())
+        return hashlib.sha1(json.dumps(stats).encode('utf-8')).hexdigest()[:12]
+
+
+class SQLDataSource(DataSource):
+    """One table per dataset in a local SQLite or DuckDB file"""
+
+    def __init__(self, path, engine='sqlite', fallback=None):
+        self.path = path
+        self.engine = engine
+        self.fallback = fallback
+
+    def load(self, name):
+        if self.engine == 'duckdb':
+            import duckdb
+            connection = duckdb.connect(self.path, read_only=True)
+            try:
+                tables = {row[0] for row in connection.execute('SHOW TABLES').fetchall()}
+                if name in tables:
+                    return connection.execute(f'SELECT * FROM "{name}"').fetchnumpy()
+            finally:
+                connection.close()
+        else:
+            import sqlite3
+            connection = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+            try:
+                # Let SQLite read pages straight from a memory map of the file
+                connection.execute('PRAGMA mmap_size = 268435456')
+                found = connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (name,)
+                ).fetchone()
+                if found:
+                    cursor = connection.execute(f'SELECT * FROM "{name}"')
+                    columns = [description[0] for description in cursor.description]
+                    rows = cursor.fetchall()
+                    return {column: [row[i] for row in rows] for i, column in enumerate(columns)}
+            finally:
+                connection.close()
+        return self.fallback.load(name) if self.fallback else None
+
+    def version(self):
+        stat = os.stat(self.path)
+        stats = [self.path, stat.st_size, stat.st_mtime_ns]
+        if self.fallback:
+            stats.append(self.fallback.version())
+        return hashlib.sha1(json.dumps(stats).encode('utf-8')).hexdigest()[:12]
+
+
+def arrow_column_to_numpy(column):
+    """NumPy view of an Arrow column, zero-copy for single-chunk numeric data"""
+    if column.num_chunks == 1:
+        return column.chunk(0).to_numpy(zero_copy_only=False)
+    return column.to_numpy()
+
+
+class HyperLogLog:
+    """Fixed-memory distinct counter over 64-bit hashes (2**precision byte registers)"""
+
+    def __init__(self, precision=14, registers=None):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8) if registers is None else registers
+
+    def add_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        remaining_bits = 64 - self.precision
+        index = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << remaining_bits) - 1)
+        # Rank = position of the leftmost set bit in the remaining bits
+        bit_length = np.zeros(len(remainder), dtype=np.int64)
+        nonzero = remainder > 0
+        bit_length[nonzero] = np.floor(np.log2(remainder[nonzero].astype(np.float64))).astype(np.int64) + 1
+        rank = (remaining_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+
+class EventIngest:
+    """Incremental, bounded-memory aggregation of loan, repayment and user events"""
+
+    COLUMNS = ['event_type', 'timestamp', 'user_id', 'amount', 'revenue', 'category']
+    TOTALS = ['revenue', 'expenses', 'marketing', 'employee', 'bad_debt',
+              'disbursed', 'defaulted', 'signups', 'churned']
+
+    def __init__(self, state_path, block_bytes=64 << 20):
+        self.state_path = state_path
+        self.block_bytes = block_bytes
+        if os.path.exists(state_path):
+            with open(state_path, 'rb') as f:
+                self.state = pickle.load(f)
+        else:
+            self.state = {'files': {}, 'years': {}, 'active_users': {}}
+        # CSV size and mtime when a final line without a newline was held back, by path
+        self.state.setdefault('tails', {})
+        # Bytes of unterminated final lines left for a later run
+        self.held_bytes = 0
+        self.cohorts = CohortEngine(self.cohort_path(state_path))
+
+    @staticmethod
+    def cohort_path(state_path):
+        """Cohort matrices saved next to the ingest state"""
+        return os.path.splitext(state_path)[0] + '.cohorts.npz'
+
+    def ingest(self, paths, final=False):
+        """Fold any unprocessed rows of the given files into the totals; returns rows read"""
+        rows = 0
+        for path in paths:
+            for chunk in self.iter_chunks(path, final):
+                self.aggregate(chunk)
+                rows += len(chunk)
+        self.save()
+        return rows
+
+    def iter_chunks(self, path, final=False):
+        """Yield DataFrames of rows not yet ingested, advancing the stored offset"""
+        path = os.path.abspath(path)
+        offset = self.state['files'].get(path, 0)
+        if path.endswith('.parquet'):
+            chunks = self._iter_parquet(path, offset)
+        else:
+            if os.path.getsize(path) < offset:
+                raise ValueError(f"{path} is smaller than its ingested offset; rebuild {self.state_path}")
+            chunks = self._iter_csv(path, offset, final)
+        for chunk, offset in chunks:
+            yield chunk
+            self.state['files'][path] = offset
+
+    def _iter_csv(self, path, offset, final=False):
+        import pandas as pd
+        tails = self.state['tails']
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            header = f.readline()
+            offset = max(offset, len(header))
+            block_bytes = self.block_bytes
+            while True:
+                f.seek(offset)
+                block = f.read(block_bytes)
+                cut = block.rfind(b'\n')
+                if cut == -1 and len(block) == block_bytes:
+                    block_bytes *= 2
+                    continue
+                if cut == -1:
+                    # EOF. A final line without a newline may still be being written; it is
+                    # taken once the file is unchanged since the run that held it back
+                    tail = [stat.st_size, stat.st_mtime_ns]
+                    if block and not final and tails.get(path) != tail:
+                        tails[path] = tail
+                        self.held_bytes += len(block)
+                        return
+                    tails.pop(path, None)
+                    if not block:
+                        return
+                    cut = len(block) - 1
+                block = block[:cut + 1]
+                offset += len(block)
+                yield pd.read_csv(io.BytesIO(header + block), usecols=lambda c: c in self.COLUMNS), offset
+
+    def _iter_parquet(self, path, offset):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        columns = [c for c in self.COLUMNS if c in parquet_file.schema_arrow.names]
+        rows = 0
+        for batch in parquet_file.iter_batches(batch_size=1 << 20, columns=columns):
+            if rows + batch.num_rows > offset:
+                skip = max(offset - rows, 0)
+                yield batch.slice(skip).to_pandas(), rows + batch.num_rows
+            rows += batch.num_rows
+
+    def aggregate(self, chunk):
+        """Fold one chunk of events into the per-year running totals"""
+        import pandas as pd
+        timestamps = chunk['timestamp']
+        if timestamps.dtype.kind in 'iuf':
+            dates = pd.to_datetime(timestamps, unit='s')
+            years = dates.dt.year.to_numpy()
+            months = years * 12 + dates.dt.month.to_numpy() - 1
+        else:
+            timestamps = timestamps.astype(str)
+            years = timestamps.str.slice(0, 4).astype(int).to_numpy()
+            months = years * 12 + timestamps.str.slice(5, 7).astype(int).to_numpy() - 1
+        events = chunk['event_type'].to_numpy()
+        amount = pd.to_numeric(chunk['amount'], errors='coerce').fillna(0).to_numpy() if 'amount' in chunk else np.zeros(len(chunk))
+        revenue = pd.to_numeric(chunk['revenue'], errors='coerce').fillna(0).to_numpy() if 'revenue' in chunk else np.zeros(len(chunk))
+        # A chunk with no categories reads as an all-NaN float column, which can't be compared to strings
+        category = chunk['category'].fillna('').astype(str).to_numpy() if 'category' in chunk else np.full(len(chunk), '')
+
+        is_expense = events == 'expense'
+        is_default = events == 'default'
+        sums = {
+            'revenue': revenue,
+            # Defaults are written off as bad-debt provisions, which are an expense
+            'expenses': amount * (is_expense | is_default),
+            'marketing': amount * (is_expense & (category == 'marketing')),
+            'employee': amount * (is_expense & (category == 'employee')),
+            'bad_debt': amount * is_default,
+            'disbursed': amount * (events == 'loan_disbursed'),
+            'defaulted': amount * is_default,
+            'signups': (events == 'user_signup').astype(np.float64),
+            'churned': (events == 'user_churn').astype(np.float64)
         }
-        
-        # Operational Data
-        self.operational_data = {
-            'year': [2018, 2019, 2020, 2021, 2022, 2023, 2024],
-            'users_millions': [0.5, 1.2, 3.0, 6.0, 12.0, 17.0, 17.0],
-            'active_users_millions': [0.2, 0.5, 1.2, 2.8, 6.5, 8.5, 6.8],
-            'merchants': [50, 200, 1000, 3000, 7500, 10000, 12000],
-            'npa_rate': [2.5, 3.5, 4.2, 5.0, 6.5, 6.8, 7.2],
-            'industry_npa': [1.5, 1.5, 1.5, 1.5, 1.5, 1.5, 1.5],
-            'churn_rate': [15, 18, 20, 25, 30, 35, 40],
-            'nps_score': [65, 70, 75, 70, 65, 60, 55],
-            'app_rating': [4.2, 4.1, 3.9, 3.7, 3.4, 3.1, 2.9]
+
+        unique_years, year_index = np.unique(years, return_inverse=True)
+        for name, values in sums.items():
+            per_year = np.bincount(year_index, weights=values, minlength=len(unique_years))
+            for year, total in zip(unique_years.tolist(), per_year.tolist()):
+                totals = self.state['years'].setdefault(year, dict.fromkeys(self.TOTALS, 0.0))
+                totals[name] += total
+
+        is_user_event = np.isin(events, ('user_signup', 'user_active', 'default'))
+        if is_user_event.any():
+            user_hashes = pd.util.hash_array(chunk['user_id'].to_numpy()[is_user_event].astype(str))
+            self.cohorts.update(months[is_user_event], events[is_user_event], user_hashes, amount[is_user_event])
+
+        is_active = events == 'user_active'
+        if is_active.any():
+            hashes = pd.util.hash_array(chunk['user_id'].to_numpy()[is_active].astype(str))
+            active_years = years[is_active]
+            for year in np.unique(active_years).tolist():
+                counter = self.state['active_users'].setdefault(year, HyperLogLog())
+                counter.add_hashes(hashes[active_years == year])
+
+    def save(self):
+        """Persist cohorts, then totals and offsets, atomically"""
+        self.cohorts.save()
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.state_path)
+
+    def to_datasets(self):
+        """Financial and operational series derived from the running totals"""
+        years = sorted(self.state['years'])
+        totals = [self.state['years'][year] for year in years]
+        crore = 1e7
+
+        revenue = [t['revenue'] / crore for t in totals]
+        expenses = [t['expenses'] / crore for t in totals]
+        growth_rate = [0] + [
+            (current - previous) / previous * 100 if previous else 0
+            for previous, current in zip(revenue, revenue[1:])
+        ]
+        active_users = [
+            self.state['active_users'][year].count() if year in self.state['active_users'] else 0
+            for year in years
+        ]
+        users = np.cumsum([t['signups'] for t in totals]).tolist()
+
+        financial = {
+            'year': years,
+            'revenue_cr': revenue,
+            'loss_cr': [e - r for e, r in zip(expenses, revenue)],
+            'expenses_cr': expenses,
+            'growth_rate': growth_rate,
+            'burn_multiple': [e / r if r else 0 for e, r in zip(expenses, revenue)],
+            'marketing_expenses': [t['marketing'] / crore for t in totals],
+            'employee_costs': [t['employee'] / crore for t in totals],
+            'bad_debt_provisions': [t['bad_debt'] / crore for t in totals]
         }
-        
-        # Strategic Opportunities
-        self.opportunities = {
-            'name': ['B2B Credit Infrastructure', 'SME Lending Platform', 'Credit Scoring APIs', 'RegTech Solutions', 'Open Banking APIs', 'AI Risk Management'],
-            'tam_billions': [25, 195, 18, 12, 32, 28],
-            'capital_required': [20, 60, 12, 8, 35, 25],
-            'time_to_market': [15, 24, 10, 8, 24, 20],
-            'revenue_potential': [9, 8, 8, 7, 9, 8],
-            'risk_score': [4, 8, 3, 2, 5, 6],
-            'attractiveness': [7.8, 6.1, 7.5, 7.6, 7.4, 7.3]
+        operational = {
+            'year': years,
+            'users_millions': [u / 1e6 for u in users],
+            'active_users_millions': [a / 1e6 for a in active_users],
+            'npa_rate': [t['defaulted'] / t['disbursed'] * 100 if t['disbursed'] else 0 for t in totals],
+            'churn_rate': [t['churned'] / a * 100 if a else 0 for t, a in zip(totals, active_users)]
         }
-        
-        # Funding History
-        self.funding_data = {
-            'round': ['Seed', 'Series A', 'Series B', 'Series C', 'Bridge', 'Emergency'],
-            'amount': [4.7, 22, 20, 50, 15, 8.5],
-            'year': [2016, 2017, 2019, 2021, 2022, 2023],
-            'valuation': [20, 85, 180, 435, 420, 380]
+        return {'financial': financial, 'operational': operational}
+
+
+class CohortEngine:
+    """Acquisition x activity month retention and default matrices, updated incrementally"""
+
+    MATRICES = ('cohort_size', 'retained', 'defaults', 'default_amount')
+
+    def __init__(self, path):
+        self.path = path
+        arrays = {}
+        if os.path.exists(path):
+            with np.load(path) as saved:
+                arrays = {name: saved[name] for name in saved.files}
+        self.first_month = int(arrays.get('first_month', -1))
+        self.cohort_size = arrays.get('cohort_size', np.zeros(0, dtype=np.int64))
+        self.retained = arrays.get('retained', np.zeros((0, 0), dtype=np.int64))
+        self.defaults = arrays.get('defaults', np.zeros((0, 0), dtype=np.int64))
+        self.default_amount = arrays.get('default_amount', np.zeros((0, 0), dtype=np.float64))
+        self.user_hashes = arrays.get('user_hashes', np.zeros(0, dtype=np.uint64))
+        self.user_cohort = arrays.get('user_cohort', np.zeros(0, dtype=np.int32))
+        self.user_last_active = arrays.get('user_last_active', np.zeros(0, dtype=np.int32))
+
+    def extend(self, low, high):
+        """Grow the matrices to cover months low..high"""
+        if self.first_month < 0:
+            self.first_month = low
+        before = max(self.first_month - low, 0)
+        after = max(high - (self.first_month + len(self.cohort_size) - 1), 0)
+        if before or after:
+            self.first_month -= before
+            self.cohort_size = np.pad(self.cohort_size, (before, after))
+            for name in ('retained', 'defaults', 'default_amount'):
+                setattr(self, name, np.pad(getattr(self, name), ((before, after), (before, after))))
+
+    def update(self, months, events, user_hashes, amounts):
+        """Fold signup, activity and default events (parallel arrays) into the matrices"""
+        # Activity counts once per user and month after the user's last active month, so each
+        # user's events must arrive in month order, as appended event files deliver them
+        relevant = np.isin(events, ('user_signup', 'user_active', 'default'))
+        months = np.asarray(months, dtype=np.int32)[relevant]
+        events = events[relevant]
+        user_hashes = np.asarray(user_hashes, dtype=np.uint64)[relevant]
+        amounts = np.asarray(amounts, dtype=np.float64)[relevant]
+        if not len(months):
+            return
+        self.extend(int(months.min()), int(months.max()))
+        size = len(self.cohort_size)
+
+        # Register users not seen before, in their signup (else earliest) month
+        chunk_hashes, chunk_users = np.unique(user_hashes, return_inverse=True)
+        is_signup = events == 'user_signup'
+        cohort = group_min(chunk_users, months, len(chunk_hashes))
+        signup = group_min(chunk_users[is_signup], months[is_signup], len(chunk_hashes))
+        cohort = np.where(signup < np.iinfo(np.int32).max, signup, cohort)
+        positions = np.searchsorted(self.user_hashes, chunk_hashes)
+        known = positions < len(self.user_hashes)
+        known[known] = self.user_hashes[positions[known]] == chunk_hashes[known]
+        if not known.all():
+            self.user_hashes = np.insert(self.user_hashes, positions[~known], chunk_hashes[~known])
+            self.user_cohort = np.insert(self.user_cohort, positions[~known], cohort[~known])
+            self.user_last_active = np.insert(self.user_last_active, positions[~known], -1)
+            self.cohort_size += np.bincount(cohort[~known] - self.first_month, minlength=size)
+            positions = np.searchsorted(self.user_hashes, chunk_hashes)
+        users = positions[chunk_users]
+        cohorts = self.user_cohort[users] - self.first_month
+
+        # Distinct (user, month) activity, counted once per month after the user's last
+        is_active = is_signup | (events == 'user_active')
+        pairs = np.unique(users[is_active].astype(np.int64) << 32 | months[is_active].astype(np.int64))
+        pair_users, pair_months = pairs >> 32, (pairs & 0xFFFFFFFF).astype(np.int32)
+        new = pair_months > self.user_last_active[pair_users]
+        cells = (self.user_cohort[pair_users[new]] - self.first_month) * size + pair_months[new] - self.first_month
+        self.retained += np.bincount(cells, minlength=size * size).reshape(size, size)
+        last = np.append(pair_users[1:] != pair_users[:-1], True)
+        self.user_last_active[pair_users[last]] = np.maximum(self.user_last_active[pair_users[last]],
+                                                             pair_months[last])
+
+        is_default = events == 'default'
+        cells = cohorts[is_default] * size + months[is_default] - self.first_month
+        self.defaults += np.bincount(cells, minlength=size * size).reshape(size, size)
+        self.default_amount += np.bincount(cells, weights=amounts[is_default],
+                                           minlength=size * size).reshape(size, size)
+
+    def save(self):
+        """Write all arrays to the .npz atomically"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f, first_month=self.first_month,
+                **{name: getattr(self, name) for name in self.MATRICES},
+                user_hashes=self.user_hashes, user_cohort=self.user_cohort, user_last_active=self.user_last_active
+            )
+        os.replace(tmp_path, self.path)
+
+    @classmethod
+    def read_dataset(cls, path):
+        """The cohorts dataset from a saved .npz, reading only the matrices"""
+        with np.load(path) as saved:
+            return cohort_dataset(int(saved['first_month']), **{name: saved[name] for name in cls.MATRICES})
+
+
+def group_min(groups, values, count):
+    """Minimum of values per group id 0..count-1 (int32 max for empty groups)"""
+    result = np.full(count, np.iinfo(np.int32).max, dtype=np.int32)
+    if not len(groups):
+        return result
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    first = np.append(True, groups[1:] != groups[:-1])
+    result[groups[first]] = values[first]
+    return result
+
+
+def cohort_dataset(first_month, cohort_size, retained, defaults, default_amount):
+    """Cohorts dataset: month labels plus the acquisition x activity month matrices"""
+    months = first_month + np.arange(len(cohort_size))
+    return {
+        'month': [f"{month // 12}-{month % 12 + 1:02d}" for month in months.tolist()],
+        'cohort_size': cohort_size,
+        'retained': retained,
+        'defaults': defaults,
+        'default_amount': default_amount
+    }
+
+
+def cohort_ages(matrix):
+    """Acquisition x activity month matrix as acquisition x months since acquisition (NaN past the data)"""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    months = len(matrix)
+    columns = np.arange(months)[:, None] + np.arange(months)[None, :]
+    aged = np.take_along_axis(matrix, np.minimum(columns, months - 1), axis=1)
+    aged[columns >= months] = np.nan
+    return aged
+
+
+def sample_cohorts(first_month=2023 * 12 + 6, months=18):
+    """Illustrative cohorts for the sample data: 18 monthly cohorts to December 2024"""
+    cohort = np.arange(months)[:, None]
+    age = np.arange(months)[None, :] - cohort
+    size = np.round(420_000 * 0.95 ** np.arange(months)).astype(np.int64)
+    with np.errstate(invalid='ignore'):
+        rate = np.where(age == 0, 1.0, 0.46 * (0.9 - 0.006 * cohort) ** (age - 1))
+    retained = np.where(age >= 0, np.round(size[:, None] * rate), 0).astype(np.int64)
+    defaults = np.round(size[:, None] * 0.0025 * (1 + 0.04 * cohort) * (age >= 2)).astype(np.int64)
+    return cohort_dataset(first_month, size, retained, defaults, defaults * 18_000.0)
+
+
+# Sample datasets generated on first load rather than listed, so importing the app stays cheap
+SAMPLE_GENERATORS = {'cohorts': sample_cohorts}
+
+
+class EventDataSource(DataSource):
+    """Financial and operational series and cohorts from EventIngest state, the rest from a fallback"""
+
+    def __init__(self, state_path, fallback):
+        self.state_path = state_path
+        self.fallback = fallback
+        self._derived = None
+
+    def load(self, name):
+        if name == 'cohorts':
+            path = EventIngest.cohort_path(self.state_path)
+            if os.path.exists(path):
+                return CohortEngine.read_dataset(path)
+        fallback = self.fallback.load(name)
+        if name not in ('financial', 'operational'):
+            return fallback
+        if self._derived is None:
+            self._derived = EventIngest(self.state_path).to_datasets()
+        derived = dict(self._derived[name])
+        if fallback:
+            by_year = {year: i for i, year in enumerate(fallback['year'])}
+            for column, values in fallback.items():
+                if column not in derived:
+                    derived[column] = [
+                        values[by_year[year]] if year in by_year else None for year in derived['year']
+                    ]
+        return derived
+
+    def version(self):
+        stat = os.stat(self.state_path)
+        stats = [self.state_path, stat.st_size, stat.st_mtime_ns, self.fallback.version()]
+        return hashlib.sha1(json.dumps(stats).encode('utf-8')).hexdigest()[:12]
+
+
+def open_data_source(spec=None):
+    """Data source from a DATA_SOURCE spec: a directory, sqlite:///path or duckdb:///path"""
+    spec = os.environ.get('DATA_SOURCE', '') if spec is None else spec
+    source = sample = InlineDataSource()
+    if spec:
+        source = FileDataSource(spec, fallback=sample)
+        for engine in ('sqlite', 'duckdb'):
+            if spec.startswith(engine + ':///'):
+                source = SQLDataSource(spec[len(engine) + 4:], engine=engine, fallback=sample)
+
+    state_path = os.environ.get('INGEST_STATE', '')
+    if state_path and os.path.exists(state_path):
+        source = EventDataSource(state_path, fallback=source)
+    return source
+
+
+class LazyDataset:
+    """Instance attribute that loads its dataset on first access"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.load_dataset(self.name)
+
+
+def numeric_axis(values):
+    """Float view of an x axis (numbers, datetimes or date strings) for bucketing"""
+    values = np.asarray(values)
+    if values.dtype.kind in 'iuf':
+        return values.astype(np.float64)
+    return values.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of n_out points preserving visual shape"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket is the third triangle vertex
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+        area = np.abs(
+            (x[selected] - next_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (next_y - y[selected])
+        )
+        selected = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        indices[i + 1] = selected
+    return indices
+
+
+def minmax_indices(y, n_out):
+    """Indices of the ends and the min and max of each of (n_out - 2) / 2 equal buckets, in order"""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    # Two points per bucket plus the two ends, so never more than n_out
+    buckets = (n_out - 2) // 2
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    with np.errstate(invalid='ignore'):
+        lows = offsets + np.nanargmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+        highs = offsets + np.nanargmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    indices = np.unique(np.concatenate([[0, n - 1], lows, highs]))
+    return indices[indices < n]
+
+
+def downsample(x, y, n_out, x_range=None, method='lttb'):
+    """Visible, downsampled (x, y) for a line trace"""
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    x_numeric = numeric_axis(x)
+    if x_range is not None:
+        low, high = numeric_axis(list(x_range))
+        first = max(int(np.searchsorted(x_numeric, low, side='left')) - 1, 0)
+        last = min(int(np.searchsorted(x_numeric, high, side='right')) + 1, len(x))
+        x, y, x_numeric = x[first:last], y[first:last], x_numeric[first:last]
+    if len(x) <= n_out:
+        return x, y
+    if method == 'minmax':
+        indices = minmax_indices(y, n_out)
+    else:
+        indices = lttb_indices(x_numeric, np.nan_to_num(y), n_out)
+    return x[indices], y[indices]
+
+
+def relayout_x_range(relayout_data):
+    """Visible x range from a Graph's relayoutData; None means full range"""
+    if 'xaxis.range[0]' in relayout_data:
+        return relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+    if 'xaxis.range' in relayout_data:
+        return tuple(relayout_data['xaxis.range'])
+    return None
+
+
+# Runway scenarios
+# Monte Carlo paths of annual revenue, operating expenses and bad-debt
+# provisions, calibrated on the years of financial data that break expenses
+# down. Cash runs out in the year cumulative burn exceeds the opening
+# balance; the month is interpolated within that year.
+RUNWAY_HORIZON_YEARS = 5
+RUNWAY_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def calibrate_runway(financial):
+    """Starting levels, growth, volatility and provision ratio from the financial dataset"""
+    years = np.asarray(financial['year'], dtype=np.float64)
+    whole_years = np.arange(np.ceil(years[0]), np.floor(years[-1]) + 1)
+    revenue, expenses, provisions = (
+        np.interp(whole_years, years, np.asarray(financial[column], dtype=np.float64))
+        for column in ('revenue_cr', 'expenses_cr', 'bad_debt_provisions')
+    )
+    reported = provisions >= 0.01 * revenue
+    if reported.sum() < 3:
+        reported = np.ones_like(reported)
+    whole_years, revenue, provisions = whole_years[reported], revenue[reported], provisions[reported]
+    operating = expenses[reported] - provisions
+    revenue_growth = np.diff(np.log(revenue))
+    expense_growth = np.diff(np.log(operating))
+    ratio = provisions / revenue
+    return {
+        'year': int(whole_years[-1]),
+        'revenue': float(revenue[-1]),
+        'opex': float(operating[-1]),
+        'revenue_growth': float(np.expm1(revenue_growth.mean()) * 100),
+        'growth_volatility': float(revenue_growth.std(ddof=1) * 100),
+        'expense_growth': float(np.expm1(expense_growth.mean()) * 100),
+        'expense_volatility': float(expense_growth.std(ddof=1) * 100),
+        'provision_ratio': float(ratio.mean()),
+        'provision_volatility': float(ratio.std(ddof=1) / ratio.mean())
+    }
+
+
+class RunwaySimulator:
+    """Batched Monte Carlo of cash runway over stochastic revenue, expense and provision paths"""
+
+    # Share of an expense shock that follows the revenue shock (variable costs)
+    EXPENSE_CORRELATION = 0.5
+
+    def __init__(self, paths=1_000_000, years=RUNWAY_HORIZON_YEARS, batch_size=1 << 17, seed=0):
+        self.paths = paths
+        self.years = years
+        self.batch_size = batch_size
+        self.seed = seed
+        self._shocks = None
+        self._lock = threading.Lock()
+
+    def shocks(self):
+        """(revenue, expense, provision) standard-normal shocks, drawn on first use"""
+        # Reused for every scenario (common random numbers), so a slider move rescales the same paths
+        if self._shocks is None:
+            with self._lock:
+                if self._shocks is None:
+                    rng = np.random.Generator(np.random.SFC64(self.seed))
+                    revenue = rng.standard_normal((self.years, self.paths), dtype=np.float32)
+                    expense = rng.standard_normal((self.years, self.paths), dtype=np.float32)
+                    correlation = np.float32(self.EXPENSE_CORRELATION)
+                    expense *= np.sqrt(1 - correlation * correlation)
+                    expense += correlation * revenue
+                    provision = rng.standard_normal(self.paths, dtype=np.float32)
+                    self._shocks = revenue, expense, provision
+        return self._shocks
+
+    def simulate(self, cash, revenue, opex, revenue_growth, growth_volatility,
+                 expense_growth, expense_volatility, provision_ratio, provision_volatility, progress=None):
+        """Cash percentiles by year and runway months, for annual rates given as fractions"""
+        revenue_shocks, expense_shocks, provision_shocks = self.shocks()
+        f = np.float32
+        revenue_drift = f(np.log1p(revenue_growth) - growth_volatility ** 2 / 2)
+        expense_drift = f(np.log1p(expense_growth) - expense_volatility ** 2 / 2)
+        provision_sigma = np.sqrt(np.log1p(provision_volatility ** 2))
+        provision_mu = f(np.log(provision_ratio) - provision_sigma ** 2 / 2)
+
+        balances = np.empty((self.years, self.paths), dtype=np.float32)
+        runway = np.full(self.paths, np.inf, dtype=np.float32)
+        for start in range(0, self.paths, self.batch_size):
+            batch = slice(start, start + self.batch_size)
+            revenues = revenue_shocks[:, batch] * f(growth_volatility)
+            revenues += revenue_drift
+            np.cumsum(revenues, axis=0, out=revenues)
+            np.exp(revenues, out=revenues)
+            revenues *= f(revenue)
+            burn = expense_shocks[:, batch] * f(expense_volatility)
+            burn += expense_drift
+            np.cumsum(burn, axis=0, out=burn)
+            np.exp(burn, out=burn)
+            burn *= f(opex)
+            # Burn is operating expenses plus provisions, less revenue
+            burn += (np.exp(provision_shocks[batch] * f(provision_sigma) + provision_mu) - 1) * revenues
+            balance = balances[:, batch]
+            np.cumsum(burn, axis=0, out=balance)
+            np.subtract(f(cash), balance, out=balance)
+            months = runway[batch]
+            for year in range(self.years):
+                # Cash that is not burning does not run out, even at zero
+                out = (balance[year] <= 0) & (burn[year] > 0) & np.isinf(months)
+                opening = balance[year - 1][out] if year else f(cash)
+                months[out] = 12 * (year + opening / burn[year][out])
+            if progress:
+                progress(min(start + self.batch_size, self.paths) / self.paths)
+
+        # Percentiles are order statistics of each year's sorted balances
+        balances.sort(axis=1)
+        ranks = [round(percentile / 100 * (self.paths - 1)) for percentile in RUNWAY_PERCENTILES]
+        horizon = self.years * 12
+        # Months 0..horizon - 1, then paths still solvent at the horizon
+        counts = np.bincount(np.minimum(runway, horizon).astype(np.int64), minlength=horizon + 1)
+        cumulative = np.cumsum(counts) / self.paths
+        return {
+            'paths': self.paths,
+            'cash': {
+                percentile: [float(cash)] + balances[:, rank].astype(float).tolist()
+                for percentile, rank in zip(RUNWAY_PERCENTILES, ranks)
+            },
+            'runway_counts': counts,
+            'median_runway': int(np.searchsorted(cumulative, 0.5)) if cumulative[-2] >= 0.5 else None,
+            'out_within_year': float(cumulative[11])
         }
-        
-        # Market Data
-        self.market_data = {
-            'segment': ['Digital Payments', 'SME Lending', 'Credit APIs', 'RegTech', 'Open Banking', 'AI Fintech'],
-            'size_billions': [85, 195, 18, 12, 32, 28],
-            'cagr': [45, 24, 32, 36, 52, 59],
-            'addressable_pct': [25, 55, 85, 70, 50, 35]
+
+
+def optimize_portfolio(capital, value, risk, budget, risk_cap, unit=1.0):
+    """Indices of the opportunities maximizing total value within a capital budget"""
+    capital = np.asarray(capital, dtype=np.float64)
+    value = np.asarray(value, dtype=np.float64)
+    risk = np.asarray(risk, dtype=np.float64)
+    capacity = int(np.floor(budget / unit + 1e-9))
+    weights = np.ceil(capital / unit - 1e-9).astype(np.int64)
+    candidates = np.flatnonzero((risk <= risk_cap) & (weights <= capacity) & (value > 0))
+
+    best = np.zeros(capacity + 1)
+    taken = np.zeros((len(candidates), capacity + 1), dtype=bool)
+    for row, index in enumerate(candidates):
+        weight = weights[index]
+        with_item = best[:capacity + 1 - weight] + value[index]
+        improved = with_item > best[weight:]
+        taken[row, weight:] = improved
+        best[weight:] = np.where(improved, with_item, best[weight:])
+
+    selected = []
+    remaining = capacity
+    for row in range(len(candidates) - 1, -1, -1):
+        if taken[row, remaining]:
+            selected.append(candidates[row])
+            remaining -= weights[candidates[row]]
+    return np.array(selected[::-1], dtype=np.int64)
+
+
+# Risk register aggregation
+RISK_GRID_SIZE = 10
+RISK_TIMELINE_CATEGORIES = 20
+
+
+class RiskGrid:
+    """Risk register binned into a probability x impact grid of 1..size scores"""
+
+    def __init__(self, probability, impact, mitigation_cost, size=RISK_GRID_SIZE):
+        self.size = size
+        cells = self.score_index(impact) * size + self.score_index(probability)
+        self.counts = np.bincount(cells, minlength=size * size).reshape(size, size)
+        self.costs = np.bincount(cells, weights=mitigation_cost, minlength=size * size).reshape(size, size)
+        self.order = np.lexsort((-mitigation_cost, cells))
+        self.offsets = np.concatenate([[0], np.cumsum(self.counts.ravel())])
+
+    def score_index(self, scores):
+        """0-based grid row/column of scores, rounded and clipped to 1..size"""
+        return (np.clip(np.rint(scores), 1, self.size) - 1).astype(np.int64)
+
+    def items(self, probability, impact):
+        """Register positions of the risks in one cell, costliest first"""
+        if not (1 <= probability <= self.size and 1 <= impact <= self.size):
+            return self.order[:0]
+        cell = (int(impact) - 1) * self.size + int(probability) - 1
+        return self.order[self.offsets[cell]:self.offsets[cell + 1]]
+
+
+# Unit economics
+# LTV and CAC per customer segment from user, transaction and marketing-spend
+# tables. A user's discounted margin does not depend on the date range, so it
+# is folded out of the transactions once; a range then selects the users
+# acquired in it, and the spend to attribute to them.
+CUSTOMER_SEGMENTS = ('Young Professionals', 'Students', 'SME Owners', 'Freelancers',
+                     'Tech Workers', 'Urban Salaried')
+
+
+def assign_segments(occupation, industry, age):
+    """Index into CUSTOMER_SEGMENTS per user; the first matching rule wins"""
+    occupation = np.asarray(occupation).astype(str)
+    industry = np.asarray(industry).astype(str)
+    age = np.asarray(age, dtype=np.float64)
+    rules = [
+        ('Students', occupation == 'student'),
+        ('SME Owners', occupation == 'business'),
+        ('Freelancers', occupation == 'freelancer'),
+        ('Tech Workers', industry == 'tech'),
+        ('Young Professionals', age < 30)
+    ]
+    return np.select([matches for _, matches in rules],
+                     [CUSTOMER_SEGMENTS.index(segment) for segment, _ in rules],
+                     default=CUSTOMER_SEGMENTS.index('Urban Salaried'))
+
+
+def day_numbers(dates):
+    """Days since 1970-01-01 of datetimes or ISO date strings"""
+    dates = np.asarray(dates)
+    if dates.dtype.kind != 'M':
+        import pandas as pd
+        dates = pd.to_datetime(dates).to_numpy()
+    return dates.astype('datetime64[D]').astype(np.int64)
+
+
+def row_positions(keys, ids):
+    """Position of each id in the sorted keys, or -1 where it is missing"""
+    if len(keys) and keys.dtype.kind in 'iu' and ids.dtype.kind in 'iu' and 0 <= keys[0] and keys[-1] < 4 * len(keys):
+        # Dense integer ids: a lookup table instead of a binary search per row
+        lookup = np.full(int(keys[-1]) + 1, -1, dtype=np.int64)
+        lookup[keys] = np.arange(len(keys))
+        positions = np.full(len(ids), -1, dtype=np.int64)
+        in_range = (ids >= 0) & (ids <= keys[-1])
+        positions[in_range] = lookup[ids[in_range]]
+        return positions
+    positions = np.minimum(np.searchsorted(keys, ids), max(len(keys) - 1, 0))
+    return np.where(len(keys) and keys[positions] == ids, positions, -1)
+
+
+class UnitEconomics:
+    """Users, LTV and CAC per customer segment for the users acquired in a date range"""
+
+    def __init__(self, users, transactions, marketing_spend, discount_rate=0.12, horizon_months=36):
+        user_ids = np.asarray(users['user_id'])
+        by_id = np.argsort(user_ids, kind='stable')
+        user_ids = user_ids[by_id]
+        signup = day_numbers(users['signup_date'])[by_id]
+
+        if 'segment' in users:
+            self.segments, segment = np.unique(np.asarray(users['segment']).astype(str), return_inverse=True)
+            self.segments = self.segments.tolist()
+        else:
+            self.segments = list(CUSTOMER_SEGMENTS)
+            segment = assign_segments(users['occupation'], users['industry'], users['age'])
+        segment = segment[by_id]
+        # Channels with spend; users from any other channel share one extra, spend-free slot
+        self.channels, spend_channel = np.unique(np.asarray(marketing_spend['channel']).astype(str),
+                                                 return_inverse=True)
+        user_channel = row_positions(self.channels, np.asarray(users['channel']).astype(str)[by_id])
+        user_channel[user_channel < 0] = len(self.channels)
+
+        # Discounted margin per user over the horizon
+        tx_users = row_positions(user_ids, np.asarray(transactions['user_id']))
+        margin = np.asarray(transactions['revenue'], dtype=np.float64)
+        if 'credit_loss' in transactions:
+            margin = margin - np.asarray(transactions['credit_loss'], dtype=np.float64)
+        known = tx_users >= 0
+        age = (day_numbers(transactions['date']) - signup[np.maximum(tx_users, 0)]) / 365.25
+        counted = known & (age >= 0) & (age < horizon_months / 12)
+        discounted = margin[counted] * np.exp(-np.log1p(discount_rate) * age[counted])
+        ltv = np.bincount(tx_users[counted], weights=discounted, minlength=len(user_ids))
+
+        by_date = np.argsort(signup, kind='stable')
+        self.signup = signup[by_date]
+        self.user_segment = segment[by_date]
+        self.user_channel = user_channel[by_date]
+        self.user_ltv = ltv[by_date]
+
+        spend_day = day_numbers(marketing_spend['date'])
+        by_date = np.argsort(spend_day, kind='stable')
+        self.spend_day = spend_day[by_date]
+        self.spend_channel = spend_channel[by_date]
+        self.spend = np.asarray(marketing_spend['spend'], dtype=np.float64)[by_date]
+
+    def date_range(self):
+        """First and last signup dates, as ISO strings"""
+        if not len(self.signup):
+            return None, None
+        first, last = self.signup[[0, -1]].astype('datetime64[D]')
+        return str(first), str(last)
+
+    def summary(self, start=None, end=None):
+        """Per-segment users, LTV, CAC and LTV/CAC for signups from start to end (inclusive ISO dates)"""
+        start = -np.inf if start is None else np.datetime64(str(start)[:10], 'D').astype(np.int64)
+        end = np.inf if end is None else np.datetime64(str(end)[:10], 'D').astype(np.int64)
+        first, last = np.searchsorted(self.signup, start, 'left'), np.searchsorted(self.signup, end, 'right')
+        segment = self.user_segment[first:last]
+        channel = self.user_channel[first:last]
+
+        spend_first = np.searchsorted(self.spend_day, start, 'left')
+        spend_last = np.searchsorted(self.spend_day, end, 'right')
+        spend = np.bincount(self.spend_channel[spend_first:spend_last],
+                            weights=self.spend[spend_first:spend_last], minlength=len(self.channels) + 1)
+        acquired = np.bincount(channel, minlength=len(self.channels) + 1)
+        channel_cac = np.divide(spend, acquired, out=np.zeros_like(spend), where=acquired > 0)
+
+        users = np.bincount(segment, minlength=len(self.segments))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ltv = np.bincount(segment, weights=self.user_ltv[first:last], minlength=len(self.segments)) / users
+            cac = np.bincount(segment, weights=channel_cac[channel], minlength=len(self.segments)) / users
+            ratio = ltv / cac
+        return {'segment': self.segments, 'users': users, 'ltv': ltv, 'cac': cac, 'ltv_cac': ratio}
+
+
+def sample_unit_economics(users=6000, first_month=2023 * 12, months=24, seed=0):
+    """Illustrative users, monthly transactions and marketing spend for 2023-2024"""
+    rng = np.random.default_rng(seed)
+    segments = SAMPLE_DATA['customer']
+    size = np.asarray(segments['size_millions'], dtype=np.float64)
+    segment = rng.choice(len(size), users, p=size / size.sum())
+
+    # Attributes that assign_segments maps back to each segment
+    occupation = np.array(['salaried', 'student', 'business', 'freelancer', 'salaried', 'salaried'])[segment]
+    industry = np.where(segment == CUSTOMER_SEGMENTS.index('Tech Workers'), 'tech', 'other')
+    age = np.array([22, 18, 28, 24, 24, 30])[segment] + rng.integers(0, 8, users)
+
+    # referral and social average ₹2,000 per signup, search and partnerships ₹5,750
+    channels = np.array(['referral', 'social', 'search', 'partnerships'])
+    channel_cost = np.array([1500.0, 2500.0, 4500.0, 7000.0])
+    paid_share = np.clip((np.asarray(segments['cac'], dtype=np.float64) - 2000) / 3750, 0, 1)
+    channel = 2 * (rng.random(users) < paid_share[segment]) + rng.integers(0, 2, users)
+
+    month_start = np.datetime64('1970-01', 'M') + first_month - 1970 * 12
+    signup_month = rng.integers(0, months, users)
+    signup = (month_start + signup_month).astype('datetime64[D]') + rng.integers(0, 28, users)
+
+    # Active months until churn (8% a month) or the end of the data
+    churn = 0.08
+    lifetime = np.minimum(rng.geometric(churn, users), months - signup_month)
+    tx_users = np.repeat(np.arange(users), lifetime)
+    tx_month = np.arange(len(tx_users)) - np.repeat(np.cumsum(lifetime) - lifetime, lifetime)
+    life_value = np.sum((1 - churn) ** np.arange(36) * 1.12 ** (-np.arange(36) / 12))
+    monthly_margin = np.asarray(segments['ltv'], dtype=np.float64) / life_value
+    margin = monthly_margin[segment[tx_users]] * rng.lognormal(-0.02, 0.2, len(tx_users))
+    loss_share = np.asarray(segments['default_rate'], dtype=np.float64)[segment[tx_users]] / 50
+    revenue = margin / (1 - loss_share)
+
+    spend_months, spend_channels = np.divmod(np.arange(months * len(channels)), len(channels))
+    signups = np.bincount(signup_month * len(channels) + channel, minlength=months * len(channels))
+    return {
+        'users': {
+            'user_id': np.arange(users),
+            'signup_date': signup,
+            'channel': channels[channel],
+            'occupation': occupation,
+            'industry': industry,
+            'age': age
+        },
+        'transactions': {
+            'user_id': tx_users,
+            'date': signup[tx_users] + 30 * tx_month,
+            'revenue': np.round(revenue),
+            'credit_loss': np.round(revenue - margin)
+        },
+        'marketing_spend': {
+            'date': (month_start + spend_months).astype('datetime64[D]'),
+            'channel': channels[spend_channels],
+            'spend': np.round(signups * channel_cost[spend_channels] * rng.normal(1, 0.1, len(signups)))
+        }
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def default_unit_economics():
+    """The sample users, transactions and marketing spend, generated once"""
+    return sample_unit_economics()
+
+
+def default_unit_economics_table(name):
+    return default_unit_economics()[name]
+
+
+SAMPLE_GENERATORS.update({name: functools.partial(default_unit_economics_table, name)
+                          for name in ('users', 'transactions', 'marketing_spend')})
+
+
+# Compact figure JSON
+# Figures reference one shared template by name and carry large numeric arrays
+# as base64 typed arrays ({"dtype": "f8", "bdata": ...}, the encoding newer
+# plotly.js versions read natively). FIGURE_SHIM, served once in the index
+# page, resolves both before plotly.js sees the figure.
+FIGURE_TEMPLATE = 'zestmoney'
+TYPED_ARRAY_MIN_ITEMS = 32
+TYPED_ARRAY_DTYPES = ('i1', 'u1', 'i2', 'u2', 'i4', 'u4')
+
+
+def register_figure_template():
+    """Register the shared template (plotly's, plus the chart defaults) as plotly.py's default"""
+    import plotly.io as pio
+    if FIGURE_TEMPLATE not in pio.templates:
+        template = go.layout.Template(pio.templates['plotly'])
+        template.layout.update(plot_bgcolor='white', margin=dict(l=40, r=40, t=20, b=40))
+        pio.templates[FIGURE_TEMPLATE] = template
+    pio.templates.default = FIGURE_TEMPLATE
+    return pio.templates[FIGURE_TEMPLATE]
+
+
+def typed_array(values):
+    """Base64 typed-array spec for a numeric array, using the narrowest exact dtype"""
+    dtype = 'f8'
+    if values.dtype.kind in 'iu' or (values.dtype.kind == 'f' and np.isfinite(values).all()
+                                     and (values == np.round(values)).all()):
+        low, high = (values.min(), values.max()) if values.size else (0, 0)
+        for candidate in TYPED_ARRAY_DTYPES:
+            info = np.iinfo(candidate)
+            if info.min <= low and high <= info.max:
+                dtype = candidate
+                break
+    spec = {'dtype': dtype, 'bdata': base64.b64encode(values.astype('<' + dtype).tobytes()).decode('ascii')}
+    if values.ndim == 2:
+        spec['shape'] = f'{values.shape[0]},{values.shape[1]}'
+    return spec
+
+
+def encode_arrays(value, min_items=TYPED_ARRAY_MIN_ITEMS):
+    """Trace (or nested trace property) with numeric arrays of min_items or more as typed arrays"""
+    if isinstance(value, dict):
+        return {key: encode_arrays(item, min_items) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)) and len(value) >= min_items:
+        array = np.asarray(value)
+        if array.dtype.kind in 'iuf' and array.ndim in (1, 2):
+            return typed_array(array)
+    return value
+
+
+def compact_figure(figure, min_items=TYPED_ARRAY_MIN_ITEMS):
+    """Figure dict for a dcc.Graph: shared template by name, large numeric arrays base64-encoded"""
+    if hasattr(figure, 'to_plotly_json'):
+        figure = figure.to_plotly_json()
+    compact = dict(figure, data=[encode_arrays(trace, min_items) for trace in figure.get('data', [])])
+    compact['layout'] = dict(figure.get('layout', {}), template=FIGURE_TEMPLATE)
+    return compact
+
+
+# Wraps Plotly.newPlot/react as soon as dcc loads plotly.js (it assigns window.Plotly)
+FIGURE_SHIM = """
+(function() {
+    var templates = __TEMPLATES__;
+    var typedArrays = {f8: Float64Array, f4: Float32Array, i1: Int8Array, u1: Uint8Array,
+                       i2: Int16Array, u2: Uint16Array, i4: Int32Array, u4: Uint32Array};
+    function decode(value) {
+        if (Array.isArray(value)) {
+            return value.length && value[0] && typeof value[0] === 'object' ? value.map(decode) : value;
+        }
+        if (!value || typeof value !== 'object' || ArrayBuffer.isView(value)) {
+            return value;
+        }
+        if (typeof value.bdata === 'string' && typedArrays[value.dtype]) {
+            var binary = atob(value.bdata), bytes = new Uint8Array(binary.length);
+            for (var i = 0; i < binary.length; i++) { bytes[i] = binary.charCodeAt(i); }
+            var typed = new typedArrays[value.dtype](bytes.buffer);
+            if (!value.shape) { return typed; }
+            var columns = +String(value.shape).split(',')[1], rows = [];
+            for (var r = 0; r < typed.length; r += columns) { rows.push(typed.subarray(r, r + columns)); }
+            return rows;
+        }
+        var decoded = {};
+        for (var key in value) { decoded[key] = decode(value[key]); }
+        return decoded;
+    }
+    function withTemplate(layout) {
+        if (layout && typeof layout.template === 'string' && templates[layout.template]) {
+            return Object.assign({}, layout, {template: templates[layout.template]});
+        }
+        return layout;
+    }
+    function patch(Plotly) {
+        if (!Plotly || Plotly._compactFigures) { return; }
+        ['newPlot', 'react'].forEach(function(name) {
+            var original = Plotly[name];
+            Plotly[name] = function(gd, data, layout, config) {
+                if (data && !Array.isArray(data) && typeof data === 'object') {
+                    data = Object.assign({}, data, {data: decode(data.data), layout: withTemplate(data.layout)});
+                } else {
+                    data = decode(data);
+                    layout = withTemplate(layout);
+                }
+                return original.call(this, gd, data, layout, config);
+            };
+        });
+        Plotly._compactFigures = true;
+    }
+    var plotly = window.Plotly;
+    patch(plotly);
+    Object.defineProperty(window, 'Plotly', {
+        configurable: true,
+        get: function() { return plotly; },
+        set: function(value) { plotly = value; patch(value); }
+    });
+})();
+"""
+
+
+def figure_shim():
+    """<script> registering the shared template and typed-array decoding in the browser"""
+    template = register_figure_template().to_plotly_json()
+    templates = json.dumps({FIGURE_TEMPLATE: template}, separators=(',', ':')).replace('</', '<\\/')
+    return '<script>' + FIGURE_SHIM.replace('__TEMPLATES__', templates) + '</script>'
+
+
+class MetricRegistry:
+    """Declarative derived metrics, evaluated per dataset in one vectorized pass"""
+
+    def __init__(self):
+        self.definitions = OrderedDict()
+
+    def metric(self, name, dataset, inputs):
+        """Decorator registering a metric function"""
+        def decorator(func):
+            self.definitions[name] = (dataset, tuple(inputs), func)
+            return func
+        return decorator
+
+    def compute(self, dataset, columns):
+        """All metrics of one dataset, converting each input column to an array once"""
+        arrays = {}
+        results = {}
+
+        def resolve(name, pending):
+            # Inputs name another metric of the dataset, computed first, or one of its columns
+            if name in results:
+                return results[name]
+            definition = self.definitions.get(name)
+            if definition is not None and definition[0] == dataset and name not in pending:
+                results[name] = definition[2](*[resolve(column, pending | {name}) for column in definition[1]])
+                return results[name]
+            if name not in columns:
+                if name in pending:
+                    raise ValueError(f"Metric '{name}' depends on itself")
+                raise KeyError(f"'{name}' is neither a column nor a metric of dataset '{dataset}'")
+            if name not in arrays:
+                arrays[name] = np.asarray(columns[name], dtype=np.float64)
+            return arrays[name]
+
+        for name, (metric_dataset, _, _) in self.definitions.items():
+            if metric_dataset == dataset:
+                resolve(name, frozenset())
+        return results
+
+
+class MetricCache:
+    """Registry results for one analytics instance, computed per dataset on first use"""
+
+    def __init__(self, registry, load_dataset):
+        self.registry = registry
+        self.load_dataset = load_dataset
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        if name not in self.registry.definitions:
+            raise KeyError(f"Unknown metric '{name}'")
+        dataset = self.registry.definitions[name][0]
+        if dataset not in self._results:
+            with self._lock:
+                if dataset not in self._results:
+                    self._results[dataset] = self.registry.compute(dataset, self.load_dataset(dataset))
+        return self._results[dataset][name]
+
+
+METRICS = MetricRegistry()
+
+
+# Derived series
+@METRICS.metric('engagement_rate', 'operational', ['active_users_millions', 'users_millions'])
+def engagement_rate(active_users, users):
+    return active_users / users * 100
+
+
+@METRICS.metric('addressable_market', 'market', ['size_billions', 'addressable_pct'])
+def addressable_market(size, addressable_pct):
+    return size * addressable_pct / 100
+
+
+@METRICS.metric('opportunity_marker_size', 'opportunities', ['tam_billions'])
+def opportunity_marker_size(tam):
+    return tam / 3
+
+
+@METRICS.metric('segment_marker_size', 'customer', ['ltv'])
+def segment_marker_size(ltv):
+    return ltv / 4000
+
+
+# KPIs
+@METRICS.metric('total_losses', 'financial', ['loss_cr'])
+def total_losses(loss):
+    return float(np.nansum(loss))
+
+
+@METRICS.metric('current_revenue', 'financial', ['revenue_cr'])
+def current_revenue(revenue):
+    return float(revenue[-1])
+
+
+@METRICS.metric('revenue_growth', 'financial', ['growth_rate'])
+def revenue_growth(growth_rate):
+    return float(growth_rate[-1])
+
+
+@METRICS.metric('peak_valuation', 'funding', ['valuation'])
+def peak_valuation(valuation):
+    return float(np.nanmax(valuation))
+
+
+@METRICS.metric('current_users', 'operational', ['users_millions'])
+def current_users(users):
+    return float(users[-1])
+
+
+@METRICS.metric('npa_multiple', 'operational', ['npa_rate', 'industry_npa'])
+def npa_multiple(npa_rate, industry_npa):
+    return float(npa_rate[-1] / industry_npa[-1])
+
+
+class FigureCache:
+    """Bounded LRU cache for built tab layouts and figures"""
+
+    def __init__(self, max_entries=32, name='figure'):
+        self.max_entries = max_entries
+        self.name = name
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, builder):
+        """Return the cached value for key, building it on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                CACHE_REQUESTS.inc(cache=self.name, result='hit')
+                return self._entries[key]
+            self.misses += 1
+        CACHE_REQUESTS.inc(cache=self.name, result='miss')
+
+        # Build outside the lock so one slow tab does not block the others
+        value = builder()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store a prebuilt value"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tab=None):
+        """Drop every entry, or only the entries for one tab"""
+        with self._lock:
+            if tab is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == tab]:
+                    del self._entries[key]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Background jobs
+# With BACKGROUND_JOBS on, tab layouts and scenario figures that are not
+# cached yet are built in a pool of spawned processes instead of inside the
+# request, so a slow build neither trips the gunicorn timeout nor holds one of
+# the worker's threads. The browser polls the job with a dcc.Interval.
+class JobQueue:
+    """Disk-backed background jobs, run in a process pool and deduplicated by what they compute"""
+
+    def __init__(self, directory, workers=1, stale_seconds=300, ttl_seconds=3600):
+        self.directory = directory
+        self.workers = workers
+        self.stale_seconds = stale_seconds
+        self.ttl_seconds = ttl_seconds
+        self._executor = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, job_id, suffix='.json'):
+        return os.path.join(self.directory, job_id + suffix)
+
+    def executor(self):
+        """The process pool, started on first use; spawned, since the server process has threads"""
+        with self._lock:
+            if self._executor is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def submit(self, kind, params):
+        """Id of the job computing kind(params), started unless an identical job is live or done"""
+        key = json.dumps([kind, params], sort_keys=True, default=str)
+        job_id = hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+        state = self.status(job_id)
+        if state is not None and state['status'] != 'failed' and not self.is_stale(state):
+            BACKGROUND_JOBS.inc(kind=kind, result='deduplicated')
+            return job_id
+
+        self.prune()
+        queued = {'kind': kind, 'params': params, 'status': 'queued', 'progress': None,
+                  'message': 'Queued', 'updated': time.time()}
+        tmp_path = self.path(job_id, f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(queued, f)
+        try:
+            if state is None:
+                # Linking a complete file into place fails if another request created it first
+                os.link(tmp_path, self.path(job_id))
+            else:
+                # Of the requests that saw this failed or stale state, only the one whose claim links restarts it
+                os.link(tmp_path, self.path(job_id, f".{state['updated']!r}.claim"))
+                write_job_state(self.path(job_id), queued)
+        except FileExistsError:
+            BACKGROUND_JOBS.inc(kind=kind, result='deduplicated')
+            return job_id
+        finally:
+            os.remove(tmp_path)
+
+        future = self.executor().submit(run_job, self.directory, job_id, kind, params)
+        future.add_done_callback(lambda done: self._check_crash(done, job_id, kind, params))
+        BACKGROUND_JOBS.inc(kind=kind, result='submitted')
+        return job_id
+
+    def _check_crash(self, future, job_id, kind, params):
+        # run_job records its own errors; this catches a job process that died outright
+        error = future.exception()
+        if error is not None:
+            write_job_state(self.path(job_id), {'kind': kind, 'params': params, 'status': 'failed', 'progress': None,
+                                                'message': f"{type(error).__name__}: {error}",
+                                                'updated': time.time()})
+            with self._lock:
+                self._executor = None  # a broken pool refuses new work; start a fresh one
+
+    def status(self, job_id):
+        """The job's state dict (status queued, running, done or failed), or None if unknown"""
+        try:
+            with open(self.path(job_id)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def result(self, job_id):
+        """Decoded result of a finished job"""
+        with open(self.path(job_id, '.result.json')) as f:
+            return json.load(f)
+
+    def is_stale(self, state):
+        return state['status'] in ('queued', 'running') and time.time() - state['updated'] > self.stale_seconds
+
+    def prune(self):
+        """Remove finished jobs and retry claims older than the TTL"""
+        cutoff = time.time() - self.ttl_seconds
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.claim'):
+                with contextlib.suppress(FileNotFoundError):
+                    if os.path.getmtime(os.path.join(self.directory, filename)) < cutoff:
+                        os.remove(os.path.join(self.directory, filename))
+                continue
+            if not filename.endswith('.json') or filename.endswith('.result.json'):
+                continue
+            job_id = filename[:-len('.json')]
+            state = self.status(job_id)
+            if state and state['status'] in ('done', 'failed') and state['updated'] < cutoff:
+                for suffix in ('.json', '.result.json'):
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(self.path(job_id, suffix))
+
+
+def write_job_state(path, state):
+    """Replace a job's state file atomically, so pollers never read a partial file"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+# What each job kind computes, as JSON, in a job process's analytics instance
+JOB_KINDS = {
+    'tab': lambda analytics, params: analytics.get_tab_content(params['tab']),
+    'figures': lambda analytics, params: [analytics.build_figure(chart, **params['kwargs'])
+                                          for chart in params['charts']]
+}
+
+# The job process's own analytics instance, kept across the jobs it runs
+_job_analytics = None
+
+
+def run_job(directory, job_id, kind, params):
+    """Job process entry point: compute one job, recording progress and then the result or error"""
+    global _job_analytics
+    path = os.path.join(directory, job_id + '.json')
+    last_report = 0.0
+
+    def report(progress=None, message=''):
+        nonlocal last_report
+        # Throttled: a progress bar needs a few updates a second at most
+        if time.time() - last_report >= 0.2:
+            write_job_state(path, {'kind': kind, 'params': params, 'status': 'running', 'progress': progress,
+                                   'message': message, 'updated': time.time()})
+            last_report = time.time()
+
+    report(None, 'Starting')
+    try:
+        if _job_analytics is None:
+            report(None, 'Loading data')
+            _job_analytics = ZestMoneyAnalytics()
+        analytics = _job_analytics
+        if analytics.data_version != params['data_version']:
+            analytics.refresh_data()
+        # The source moved on (or back) since the request; a result for other data would be cached under this version
+        if analytics.data_version != params['data_version']:
+            raise RuntimeError(f"data version {params['data_version']} requested, "
+                               f"but the source is at {analytics.data_version}")
+        analytics.report_progress = report
+        try:
+            body = to_json_plotly(JOB_KINDS[kind](analytics, params))
+        finally:
+            del analytics.report_progress
+        result_path = os.path.join(directory, job_id + '.result.json')
+        with open(result_path + '.tmp', 'w') as f:
+            f.write(body)
+        os.replace(result_path + '.tmp', result_path)
+        state = {'status': 'done', 'progress': 1, 'message': 'Done'}
+    except Exception as error:
+        state = {'status': 'failed', 'progress': None, 'message': f"{type(error).__name__}: {error}"}
+    write_job_state(path, dict(state, kind=kind, params=params, updated=time.time()))
+
+
+# Settings
+# Every tunable of the dashboard, read in one place from environment variables
+# named after the fields (FIGURE_CACHE_SIZE, TAB_MODE, ...).
+@dataclasses.dataclass
+class Settings:
+    """Dashboard settings, by default from the environment"""
+    # Entries in each of the tab layout and serialized payload caches
+    figure_cache_size: int = 32
+    # Seconds between checks that the data source has not changed (0: every request)
+    data_version_check_seconds: float = 5
+    # server: every tab switch renders on the server; eager/lazy: layouts reach the browser once
+    tab_mode: str = 'server'
+    # Answer server-side tab switches from pre-serialized bytes
+    payload_store: bool = True
+    # Brotli quality of payloads compressed per data version, and of bundles compressed once
+    payload_brotli_quality: int = 5
+    asset_brotli_quality: int = 9
+    # Graphs filled by their own callbacks once the tab has rendered
+    lazy_graphs: bool = False
+    # Points per time series trace, and how they are picked (lttb or minmax)
+    downsample_points: int = 800
+    downsample_method: str = 'lttb'
+    # Scatter traces with more points than this are drawn with WebGL (0 keeps SVG). Defaults to
+    # the downsample target, so downsampled series stay SVG and only larger traces use WebGL
+    webgl_threshold: int = None
+    # Runway scenarios: simulated paths, cached slider settings, cash on hand (₹ Cr)
+    runway_paths: int = 1_000_000
+    runway_cache_size: int = 256
+    runway_cash_cr: float = 1000
+    # Opportunity portfolio: capital budget ($M), highest acceptable risk score, value to maximize
+    portfolio_budget: float = 40
+    portfolio_risk_cap: float = 5
+    portfolio_objective: str = 'revenue_potential'
+    portfolio_top_n: int = 3
+    risk_drilldown_rows: int = 20
+    # LTV/CAC: annual discount rate (%), LTV horizon, cached date ranges
+    ltv_discount_rate: float = 12
+    ltv_horizon_months: int = 36
+    ltv_cac_cache_size: int = 256
+    # Uncached tab and scenario builds run as background jobs, polled every job_poll_ms
+    background_jobs: bool = False
+    job_dir: str = '/tmp/zestmoney-jobs'
+    job_workers: int = 1
+    job_stale_seconds: float = 300
+    job_poll_ms: int = 500
+    # Profile a fraction of tab renders, or any carrying X-Profile-Token
+    profile_sample_rate: float = 0
+    profile_token: str = ''
+    profile_mode: str = 'sample'
+    profile_dir: str = 'profiles'
+    # Set by export_static: controls that need the server show their fixed setting instead
+    static_export: bool = False
+
+    def __post_init__(self):
+        self.tab_mode = self.tab_mode.lower()
+        self.profile_mode = self.profile_mode.lower()
+        if self.webgl_threshold is None:
+            self.webgl_threshold = self.downsample_points
+
+    @classmethod
+    def from_env(cls, environ=None, **overrides):
+        """Settings from the upper-cased field names in the environment, then overrides"""
+        environ = os.environ if environ is None else environ
+        values = {}
+        for setting in dataclasses.fields(cls):
+            raw = environ.get(setting.name.upper())
+            if raw is not None:
+                values[setting.name] = raw.lower() == 'true' if setting.type is bool else setting.type(raw)
+        return cls(**dict(values, **overrides))
+
+
+class ZestMoneyAnalytics:
+    # Source datasets, each loaded on first use so a tab only reads what its charts need
+    financial_data = LazyDataset('financial')
+    operational_data = LazyDataset('operational')
+    opportunities = LazyDataset('opportunities')
+    funding_data = LazyDataset('funding')
+    market_data = LazyDataset('market')
+    customer_data = LazyDataset('customer')
+    risk_data = LazyDataset('risk')
+    cohort_data = LazyDataset('cohorts')
+
+    def __init__(self, data_source=None, settings=None):
+        # A fixed source (e.g. synthetic benchmark data) replaces the DATA_SOURCE setting
+        self.fixed_data_source = data_source
+        self.settings = settings or Settings.from_env()
+        self._version_lock = threading.Lock()
+        self.initialize_data()
+        self.setup_styling()
+        register_figure_template()
+        self.figure_cache = FigureCache(max_entries=self.settings.figure_cache_size)
+        self.payload_cache = FigureCache(max_entries=self.settings.figure_cache_size, name='payload')
+        # Runway scenarios: shared simulated paths, results cached per slider setting
+        self.runway_simulator = RunwaySimulator(paths=self.settings.runway_paths)
+        self.runway_cache = FigureCache(max_entries=self.settings.runway_cache_size, name='runway')
+        self.ltv_cac_cache = FigureCache(max_entries=self.settings.ltv_cac_cache_size, name='ltv_cac')
+        # Job processes load DATA_SOURCE themselves, so a fixed source builds in-process
+        self.jobs = None
+        if self.settings.background_jobs and data_source is None:
+            self.jobs = JobQueue(self.settings.job_dir, workers=self.settings.job_workers,
+                                 stale_seconds=self.settings.job_stale_seconds)
+        self.tab_builders = {
+            'dashboard': self.create_dashboard_content,
+            'financial': self.create_financial_content,
+            'operations': self.create_operations_content,
+            'strategic': self.create_strategic_content,
+            'customer': self.create_customer_content,
+            'market': self.create_market_content,
+            'risk': self.create_risk_content
         }
-        
-        # Customer Segments
-        self.customer_data = {
-            'segment': ['Young Professionals', 'Students', 'SME Owners', 'Freelancers', 'Tech Workers', 'Urban Salaried'],
-            'size_millions': [28, 22, 15, 12, 18, 65],
-            'avg_transaction': [25000, 18000, 45000, 22000, 48000, 35000],
-            'default_rate': [8, 15, 6, 12, 5, 7],
-            'ltv': [125000, 85000, 280000, 110000, 320000, 220000],
-            'cac': [3500, 2800, 5500, 4200, 4800, 3200],
-            'profitability': [8, 6, 9, 7, 10, 9]
+        self.chart_builders = {
+            'revenue_loss': self.create_revenue_loss_chart,
+            'user_growth': self.create_user_growth_chart,
+            'funding': self.create_funding_chart,
+            'npa': self.create_npa_chart,
+            'revenue_expense': self.create_revenue_expense_chart,
+            'expense_breakdown': self.create_expense_breakdown_chart,
+            'burn_rate': self.create_burn_rate_chart,
+            'detailed_user': self.create_detailed_user_chart,
+            'merchant': self.create_merchant_chart,
+            'churn': self.create_churn_chart,
+            'rating': self.create_rating_chart,
+            'opportunity_matrix': self.create_opportunity_matrix,
+            'market_size': self.create_market_size_chart,
+            'roadmap': self.create_roadmap_chart,
+            'customer_segmentation': self.create_customer_segmentation,
+            'ltv_cac': self.create_ltv_cac_chart,
+            'market_segments': self.create_market_segments_chart,
+            'growth_rate': self.create_growth_rate_chart,
+            'addressable_market': self.create_addressable_market,
+            'risk_matrix': self.create_risk_matrix,
+            'risk_timeline': self.create_risk_timeline,
+            'cohort_retention': self.create_cohort_retention_chart,
+            'cohort_defaults': self.create_cohort_defaults_chart,
+            'runway_fan': self.create_runway_fan_chart,
+            'runway_distribution': self.create_runway_distribution_chart
         }
-        
-        # Risk Data
-        self.risk_data = {
-            'category': ['Credit Risk', 'Regulatory Risk', 'Market Risk', 'Technology Risk', 'Operational Risk', 'Funding Risk'],
-            'probability': [9, 8, 7, 5, 6, 8],
-            'impact': [10, 9, 7, 6, 7, 9],
-            'mitigation_cost': [25, 12, 8, 15, 10, 35]
+        self.chart_builders = {chart: timed_chart(chart, builder) for chart, builder in self.chart_builders.items()}
+        # Year-indexed line charts that are downsampled and re-queried on zoom, by dataset
+        self.timeseries_charts = {
+            'revenue_loss': 'financial',
+            'revenue_expense': 'financial',
+            'burn_rate': 'financial',
+            'user_growth': 'operational',
+            'detailed_user': 'operational',
+            'merchant': 'operational',
+            'npa': 'operational',
+            'churn': 'operational',
+            'rating': 'operational'
         }
         
-        # Calculate KPIs
-        self.kpis = {
-            'total_losses': sum(self.financial_data['loss_cr']),
-            'peak_valuation': max(self.funding_data['valuation']),
-            'current_revenue': self.financial_data['revenue_cr'][-1],
-            'current_users': self.operational_data['users_millions'][-1],
-            'npa_multiple': self.operational_data['npa_rate'][-1]/self.operational_data['industry_npa'][-1],
-            'revenue_growth': self.financial_data['growth_rate'][-1]
+    def initialize_data(self):
+        """Open the configured data source; datasets load lazily"""
+        self.data_source = self.fixed_data_source or open_data_source()
+        self._datasets = {}
+        self._datasets_lock = threading.Lock()
+        self.metrics = MetricCache(METRICS, self.load_dataset)
+        self._unit_economics = None
+        self._unit_economics_lock = threading.Lock()
+        self._risk_grid = None
+        self._risk_grid_lock = threading.Lock()
+        self.data_version = self.compute_data_version()
+        self._version_checked = time.monotonic()
+
+    def load_dataset(self, name):
+        """Columns of a dataset, read from the data source once"""
+        dataset = self._datasets.get(name)
+        if dataset is None:
+            with self._datasets_lock:
+                dataset = self._datasets.get(name)
+                if dataset is None:
+                    dataset = self.data_source.load(name)
+                    if dataset is None:
+                        raise KeyError(f"Dataset '{name}' not found in data source")
+                    self._datasets[name] = dataset
+                    # Read after the source moved on: make the next check refresh rather than wait
+                    if self.data_source.version() != self.data_version:
+                        self._version_checked = float('-inf')
+        return dataset
+
+    KPI_METRICS = ['total_losses', 'peak_valuation', 'current_revenue',
+                   'current_users', 'npa_multiple', 'revenue_growth']
+
+    @property
+    def kpis(self):
+        """Headline KPIs from the metric registry"""
+        return {name: self.metrics[name] for name in self.KPI_METRICS}
+
+    def compute_data_version(self):
+        """Data source fingerprint, computed without reading any dataset"""
+        return self.data_source.version()
+
+    def refresh_data(self):
+        """Reload source data and drop cached layouts if it changed"""
+        previous_version = self.data_version
+        self.initialize_data()
+        if self.data_version != previous_version:
+            self.invalidate_cache()
+        return self.data_version
+
+    def check_data_version(self, max_age=None):
+        """Refresh the data if the source's version changed, checking at most every max_age seconds"""
+        max_age = self.settings.data_version_check_seconds if max_age is None else max_age
+        if time.monotonic() - self._version_checked < max_age:
+            return self.data_version
+        with self._version_lock:
+            if time.monotonic() - self._version_checked >= max_age:
+                if self.data_source.version() != self.data_version:
+                    self.refresh_data()
+                self._version_checked = time.monotonic()
+        return self.data_version
+
+    def invalidate_cache(self, tab=None):
+        """Explicitly drop cached tab layouts and serialized payloads"""
+        self.figure_cache.invalidate(tab)
+        self.payload_cache.invalidate(tab)
+        if tab in (None, 'financial'):
+            self.runway_cache.invalidate()
+        if tab in (None, 'customer'):
+            self.ltv_cac_cache.invalidate()
+
+    def get_tab_content(self, active_tab):
+        """Tab layout from the figure cache, built on first request"""
+        if active_tab not in self.tab_builders:
+            active_tab = 'dashboard'
+        return self.figure_cache.get_or_build(
+            (active_tab, self.data_version),
+            self.tab_builders[active_tab]
+        )
+
+    def get_tab_payload(self, active_tab):
+        """Encoded variants of the render_tab_content response for a tab"""
+        if active_tab not in self.tab_builders:
+            active_tab = 'dashboard'
+
+        def build():
+            # Same envelope Dash writes for a single-output callback
+            body = {'multi': True, 'response': {'tab-content-area': {'children': self.get_tab_content(active_tab)}}}
+            body = to_json_plotly(body).encode('utf-8')
+            return compress_payload(body, brotli_quality=self.settings.payload_brotli_quality)
+
+        return self.payload_cache.get_or_build((active_tab, self.data_version), build)
+
+    def get_layout_payload(self):
+        """(etag, encoded variants) of the serialized page layout for the current data"""
+        def build():
+            body = to_json_plotly(self.create_layout()).encode('utf-8')
+            return (hashlib.sha1(body).hexdigest()[:20],
+                    compress_payload(body, brotli_quality=self.settings.payload_brotli_quality))
+
+        return self.payload_cache.get_or_build(('_dash-layout', self.data_version), build)
+
+    def prebuild(self):
+        """Build every tab's layout and serialized payload ahead of the first request"""
+        for tab in self.tab_builders:
+            self.get_tab_payload(tab)
+        if hasattr(self, 'static_assets'):
+            self.get_layout_payload()
+            self.static_assets.prebuild()
+
+    def write_payload_file(self, path):
+        """Write all tab payloads to one file and serve them from a read-only memory map"""
+        self.prebuild()
+        index = {'version': self.data_version, 'payloads': {}}
+        blobs = []
+        offset = 0
+        for tab in self.tab_builders:
+            variants = self.get_tab_payload(tab)
+            index['payloads'][tab] = {'variants': {}}
+            for encoding, body in variants.items():
+                index['payloads'][tab]['variants'][encoding] = [offset, len(body)]
+                blobs.append(body)
+                offset += len(body)
+        header = json.dumps(index).encode('utf-8')
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            for body in blobs:
+                f.write(body)
+        os.replace(tmp_path, path)
+        return self.load_payload_file(path)
+
+    def load_payload_file(self, path):
+        """Serve tab payloads from a payload file if it matches the current data version"""
+        if not os.path.exists(path):
+            return False
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header_length = int.from_bytes(mapped[:8], 'little')
+        index = json.loads(mapped[8:8 + header_length])
+        if index['version'] != self.data_version:
+            mapped.close()
+            return False
+        base = 8 + header_length
+        view = memoryview(mapped)
+        for tab, entry in index['payloads'].items():
+            self.payload_cache.put((tab, self.data_version), {
+                encoding: view[base + offset:base + offset + length]
+                for encoding, (offset, length) in entry['variants'].items()
+            })
+        return True
+
+    def graph(self, chart, height):
+        """Graph for a chart: built inline, or a skeleton filled by its own callback"""
+        style = {'height': height}
+        if self.settings.lazy_graphs:
+            skeleton = {'layout': {'xaxis': {'visible': False}, 'yaxis': {'visible': False},
+                                   'plot_bgcolor': 'white'}}
+            return dcc.Loading(
+                dcc.Graph(id={'type': 'lazy-graph', 'chart': chart}, figure=skeleton, style=style),
+                color=self.colors['primary']
+            )
+        if chart in self.timeseries_charts:
+            return dcc.Graph(id={'type': 'timeseries-graph', 'chart': chart},
+                             figure=self.build_figure(chart), style=style)
+        return dcc.Graph(figure=self.build_figure(chart), style=style)
+
+    def build_figure(self, chart, **kwargs):
+        """Compact figure dict from a chart builder"""
+        self.report_progress(None, f"Building {chart.replace('_', ' ')} chart")
+        return compact_figure(self.chart_builders[chart](**kwargs))
+
+    def render_chart(self, chart, relayout_data=None):
+        """Figure for a graph callback: cached full range, or the zoomed range of a time series"""
+        x_range = None
+        if relayout_data and chart in self.timeseries_charts:
+            zoomed = any(key.startswith('xaxis.range') for key in relayout_data)
+            reset = 'xaxis.autorange' in relayout_data
+            dataset = self.load_dataset(self.timeseries_charts[chart])
+            # Nothing to refine when the whole series already fits in the plot
+            if not (zoomed or reset) or len(dataset['year']) <= self.settings.downsample_points:
+                raise PreventUpdate
+            x_range = relayout_x_range(relayout_data)
+        elif relayout_data:
+            raise PreventUpdate
+        if x_range is not None:
+            return self.build_figure(chart, x_range=x_range)
+        return self.figure_cache.get_or_build(('chart:' + chart, self.data_version), lambda: self.build_figure(chart))
+
+    def scatter(self, **properties):
+        """Scatter trace: SVG, or Scattergl with the same properties above webgl_threshold points"""
+        points = properties.get('x')
+        if points is None:
+            points = properties.get('y', ())
+        if self.settings.webgl_threshold and len(points) > self.settings.webgl_threshold:
+            return go.Scattergl(**properties)
+        return go.Scatter(**properties)
+
+    def series(self, x, y, x_range=None):
+        """(x, y) of a time series, downsampled to the plot width for the visible range"""
+        return downsample(x, y, self.settings.downsample_points, x_range=x_range,
+                          method=self.settings.downsample_method)
+
+    # Bars beyond this many are too narrow to carry a value label
+    BAR_LABEL_LIMIT = 50
+
+    def bar_labels(self, values, fmt):
+        """Value labels for a bar trace, or None once the bars are too many to label"""
+        if len(values) > self.BAR_LABEL_LIMIT:
+            return None
+        return [fmt.format(value) for value in values]
+
+    # Scenario sliders: (parameter, label, min, max, step)
+    RUNWAY_SLIDERS = [
+        ('revenue_growth', 'Revenue Growth (%/yr)', 0, 100, 5),
+        ('growth_volatility', 'Growth Volatility (%)', 0, 60, 5),
+        ('expense_growth', 'Expense Growth (%/yr)', -20, 100, 5),
+        ('cash', 'Cash on Hand (₹ Cr)', 100, 3000, 100)
+    ]
+
+    def runway_defaults(self):
+        """Slider starting values: calibrated rates and the configured cash, on the slider grid"""
+        calibration = dict(calibrate_runway(self.financial_data), cash=self.settings.runway_cash_cr)
+        return {
+            name: min(max(round(calibration[name] / step) * step, low), high)
+            for name, _, low, high, step in self.RUNWAY_SLIDERS
         }
 
+    def simulate_runway(self, **scenario):
+        """Runway simulation for slider values (percent rates, ₹Cr cash), cached per parameter set"""
+        scenario = dict(self.runway_defaults(), **scenario)
+        key = self.runway_key(scenario)
+
+        def build():
+            calibration = calibrate_runway(self.financial_data)
+            result = self.runway_simulator.simulate(
+                cash=scenario['cash'],
+                revenue=calibration['revenue'],
+                opex=calibration['opex'],
+                revenue_growth=scenario['revenue_growth'] / 100,
+                growth_volatility=scenario['growth_volatility'] / 100,
+                expense_growth=scenario['expense_growth'] / 100,
+                expense_volatility=calibration['expense_volatility'] / 100,
+                provision_ratio=calibration['provision_ratio'],
+                provision_volatility=calibration['provision_volatility'],
+                progress=lambda done: self.report_progress(done, 'Simulating runway paths')
+            )
+            result['years'] = list(range(calibration['year'], calibration['year'] + self.runway_simulator.years + 1))
+            return result
+
+        return self.runway_cache.get_or_build(key, build)
+
+    def runway_key(self, scenario):
+        """Runway cache key of a complete scenario"""
+        return ('runway', self.data_version) + tuple(float(scenario[name]) for name, *_ in self.RUNWAY_SLIDERS)
+
+    def runway_controls(self):
+        """Sliders for the runway scenario, re-simulated on release"""
+        defaults = self.runway_defaults()
+        if self.settings.static_export:
+            return html.Div([
+                html.P("Default scenario:", style={'fontWeight': 'bold'}),
+                html.Ul([html.Li(f"{label}: {defaults[name]:g}") for name, label, *_ in self.RUNWAY_SLIDERS])
+            ])
+        controls = []
+        for name, label, low, high, step in self.RUNWAY_SLIDERS:
+            controls.extend([
+                html.Label(label, style={'fontWeight': 'bold', 'marginTop': '10px'}),
+                dcc.Slider(id='runway-' + name.replace('_', '-'), min=low, max=high, step=step,
+                           value=defaults[name], marks=None,
+                           tooltip={'placement': 'bottom', 'always_visible': True})
+            ])
+        return html.Div(controls + [self.job_tracker('runway')])
+
+    def unit_economics(self):
+        """Per-user LTV model over the user, transaction and marketing spend datasets, built once"""
+        if self._unit_economics is None:
+            with self._unit_economics_lock:
+                if self._unit_economics is None:
+                    self.report_progress(None, 'Computing customer lifetime value')
+                    self._unit_economics = UnitEconomics(
+                        self.load_dataset('users'),
+                        self.load_dataset('transactions'),
+                        self.load_dataset('marketing_spend'),
+                        discount_rate=self.settings.ltv_discount_rate / 100,
+                        horizon_months=self.settings.ltv_horizon_months
+                    )
+        return self._unit_economics
+
+    def risk_grid(self):
+        """Risk register binned by probability and impact, built once"""
+        if self._risk_grid is None:
+            with self._risk_grid_lock:
+                if self._risk_grid is None:
+                    risks = self.load_dataset('risk')
+                    self._risk_grid = RiskGrid(*(np.asarray(risks[column], dtype=np.float64)
+                                                 for column in ('probability', 'impact', 'mitigation_cost')))
+        return self._risk_grid
+
+    def ltv_cac(self, start=None, end=None):
+        """Segment LTV and CAC for users acquired from start to end, cached per date range"""
+        key = ('ltv_cac', self.data_version, start, end)
+        return self.ltv_cac_cache.get_or_build(key, lambda: self.unit_economics().summary(start, end))
+
+    def ltv_cac_controls(self):
+        """Signup date range for the LTV/CAC chart"""
+        first, last = self.unit_economics().date_range()
+        if self.settings.static_export:
+            return html.P(f"Users acquired {first} to {last}", style={'color': '#6c757d'})
+        return html.Div([
+            dcc.DatePickerRange(
+                id='ltv-cac-range',
+                min_date_allowed=first,
+                max_date_allowed=last,
+                start_date=first,
+                end_date=last,
+                display_format='MMM D, YYYY',
+                style={'marginBottom': '10px'}
+            ),
+            self.job_tracker('ltv-cac')
+        ])
+
+    def report_progress(self, progress=None, message=''):
+        """Progress of the current build (a fraction, or None if unknown); reported only inside a job"""
+
+    def render_tab(self, active_tab):
+        """Tab content for a tab callback: the layout, or a panel polling its background build"""
+        if active_tab not in self.tab_builders:
+            active_tab = 'dashboard'
+        if self.jobs is None or (active_tab, self.data_version) in self.figure_cache:
+            return self.get_tab_content(active_tab)
+        # Job processes load the source's current data, so ask for the version it is at now
+        data_version = self.check_data_version(max_age=0)
+        job_id = self.jobs.submit('tab', {'tab': active_tab, 'data_version': data_version})
+        state = self.jobs.status(job_id)
+        if state['status'] == 'done':
+            return self.finish_tab_job(job_id, state)
+        return self.job_panel(job_id, state)
+
+    def finish_tab_job(self, job_id, state):
+        """A finished tab job's layout, cached like a tab built in this process"""
+        content = self.jobs.result(job_id)
+        if state['params']['data_version'] == self.data_version:
+            self.figure_cache.put((state['params']['tab'], self.data_version), content)
+        return content
+
+    def job_progress(self, state):
+        """Progress bar props (value, label, animated) for a job's state"""
+        if state['progress'] is None:
+            return 100, state['message'], True
+        return state['progress'] * 100, f"{state['message']} ({state['progress']:.0%})", False
+
+    def job_panel(self, job_id, state):
+        """Placeholder for content built by a job: a progress bar until the result replaces it"""
+        value, label, animated = self.job_progress(state)
+        return html.Div([
+            html.Div([
+                dbc.Progress(value=value, label=label, striped=True, animated=animated,
+                             style={'height': '24px', 'margin': '40px 20%'})
+            ], id={'type': 'job-status', 'job': job_id}),
+            dcc.Interval(id={'type': 'job-poll', 'job': job_id}, interval=self.settings.job_poll_ms),
+            html.Div(id={'type': 'job-result', 'job': job_id})
+        ])
+
+    def job_tracker(self, name):
+        """Job id store, poll timer and progress area for figures updated by background jobs"""
+        return html.Div([
+            dcc.Store(id=f'{name}-job'),
+            dcc.Interval(id=f'{name}-job-poll', interval=self.settings.job_poll_ms, disabled=True),
+            html.Div(id=f'{name}-job-status', style={'marginTop': '10px'})
+        ])
+
+    def figures_or_job(self, charts, cached, **kwargs):
+        """Callback outputs for figures: (figures..., job id, poll disabled, status)"""
+        if self.jobs is None or cached:
+            return (*[self.build_figure(chart, **kwargs) for chart in charts], None, True, None)
+        data_version = self.check_data_version(max_age=0)
+        job_id = self.jobs.submit('figures', {'charts': charts, 'kwargs': kwargs, 'data_version': data_version})
+        return (*[no_update] * len(charts), job_id, False, self.job_status_bar(self.jobs.status(job_id)))
+
+    def job_status_bar(self, state):
+        """Progress bar, or an error, for a figure job"""
+        if state['status'] == 'failed':
+            return dbc.Alert(state['message'], color='danger')
+        value, label, animated = self.job_progress(state)
+        return dbc.Progress(value=value, label=label, striped=True, animated=animated)
+
+    def register_figure_job_poll(self, app, name, graph_ids):
+        """Callback applying a finished figure job started by the name-prefixed tracker"""
+        @app.callback(
+            [Output(graph_id, 'figure', allow_duplicate=True) for graph_id in graph_ids],
+            Output(f'{name}-job-poll', 'disabled', allow_duplicate=True),
+            Output(f'{name}-job-status', 'children', allow_duplicate=True),
+            Input(f'{name}-job-poll', 'n_intervals'),
+            State(f'{name}-job', 'data'),
+            prevent_initial_call=True
+        )
+        def poll_figure_job(n_intervals, job_id):
+            state = self.jobs.status(job_id) if self.jobs and job_id else None
+            if state is None:
+                return (*[no_update] * len(graph_ids), True, None)
+            if state['status'] == 'done':
+                return (*self.jobs.result(job_id), True, None)
+            return (*[no_update] * len(graph_ids), state['status'] == 'failed', self.job_status_bar(state))
+
     def setup_styling(self):
         """Setup color schemes"""
         self.colors = {
@@ -114,10 +2554,13 @@ class ZestMoneyAnalytics:
             'dark': '#343a40'
         }
 
-    def create_app(self):
+    def create_app(self, requests_pathname_prefix=None):
         """Create the Dash application with proper tab structure"""
+        tab_mode = self.settings.tab_mode
+        
         app = dash.Dash(
             __name__, 
+            requests_pathname_prefix=requests_pathname_prefix,
             external_stylesheets=[dbc.themes.BOOTSTRAP],
             serve_locally=True,  # Serve assets locally
             suppress_callback_exceptions=True,
@@ -131,6 +2574,77 @@ class ZestMoneyAnalytics:
         app.scripts.config.serve_locally = True
         app.css.config.serve_locally = True
         
+        # Telemetry first, so requests answered by the before_request hooks below are counted too
+        prefix = app.config.routes_pathname_prefix
+        routes = {prefix: 'index', prefix + '_dash-layout': 'layout', prefix + '_dash-dependencies': 'dependencies',
+                  prefix + '_dash-update-component': 'callback', '/metrics': 'metrics'}
+        
+        @app.server.before_request
+        def start_request_telemetry():
+            TELEMETRY.start()
+            REQUESTS_IN_FLIGHT.inc()
+            g.request_start = time.perf_counter()
+        
+        @app.server.after_request
+        def record_response_telemetry(response):
+            if 'tab' in g:
+                TAB_RENDER_SECONDS.observe(time.perf_counter() - g.request_start, tab=g.tab)
+            size = response.calculate_content_length()
+            if size is not None:
+                route = routes.get(request.path, 'assets' if '_dash-component-suites/' in request.path else 'other')
+                RESPONSE_BYTES.observe(size, route=route)
+            return response
+        
+        @app.server.teardown_request
+        def finish_request_telemetry(exc):
+            if 'request_start' in g:
+                REQUESTS_IN_FLIGHT.dec()
+        
+        # Pick up ingested or replaced data before anything is answered from the caches
+        @app.server.before_request
+        def check_data_version():
+            self.check_data_version()
+        
+        # Tab renders (server-side switch or clientside hydration) can be profiled on demand
+        update_path = prefix + '_dash-update-component'
+        
+        @app.server.before_request
+        def start_profile():
+            if request.method != 'POST' or request.path != update_path:
+                return None
+            token = request.headers.get('X-Profile-Token', '')
+            settings = self.settings
+            requested = bool(settings.profile_token) and hmac.compare_digest(token.encode(),
+                                                                             settings.profile_token.encode())
+            if not requested and (not settings.profile_sample_rate or random.random() >= settings.profile_sample_rate):
+                return None
+            inputs = (request.get_json(silent=True) or {}).get('inputs') or []
+            if not any(item.get('id') in ('main-tabs', 'tab-request') for item in inputs):
+                return None
+            profiler = PROFILERS.get(self.settings.profile_mode, SamplingProfiler)()
+            try:
+                profiler.start()
+            except ValueError:  # another profiler already owns this interpreter
+                return None
+            g.profiler = profiler
+            return None
+        
+        @app.server.after_request
+        def write_profile(response):
+            profiler = g.pop('profiler', None)
+            if profiler is not None:
+                profiler.stop()
+                elapsed_ms = (time.perf_counter() - g.request_start) * 1000
+                os.makedirs(self.settings.profile_dir, exist_ok=True)
+                filename = (f"{g.get('tab', 'unknown')}-{elapsed_ms:.0f}ms-"
+                            f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}.{profiler.extension}")
+                profiler.write(os.path.join(self.settings.profile_dir, filename))
+            return response
+        
+        @app.server.route('/metrics')
+        def metrics():
+            return Response(TELEMETRY.exposition(), content_type='text/plain; version=0.0.4; charset=utf-8')
+        
         # Define custom CSS styles for professional look
         app.index_string = '''
         <!DOCTYPE html>
@@ -209,14 +2723,211 @@ class ZestMoneyAnalytics:
                 <footer>
                     {%config%}
                     {%scripts%}
+                    {%figure_shim%}
                     {%renderer%}
                 </footer>
             </body>
         </html>
         '''
+        # Shared figure template and typed-array decoding, sent once per page load
+        app.index_string = app.index_string.replace('{%figure_shim%}', figure_shim())
+        
+        self.static_assets = StaticAssets(app, brotli_quality=self.settings.asset_brotli_quality)
+        # Rebuilt when the data version changes; requests are answered from get_layout_payload
+        app.layout = self.create_layout
+        
+        
+        if tab_mode == 'server':
+            # Single callback for tab navigation
+            @app.callback(
+                Output('tab-content-area', 'children'),
+                Input('main-tabs', 'value')
+            )
+            def render_tab_content(active_tab):
+                g.tab = active_tab if active_tab in self.tab_builders else 'dashboard'
+                return self.render_tab(active_tab)
+        else:
+            # Show the selected pane in the browser; ask the server only for unvisited tabs
+            app.clientside_callback(
+                """
+                function(activeTab, hydrated, paneIds) {
+                    var styles = paneIds.map(function(paneId) {
+                        return {display: paneId.tab === activeTab ? 'block' : 'none'};
+                    });
+                    var request = hydrated.indexOf(activeTab) === -1 ? activeTab : window.dash_clientside.no_update;
+                    // Graphs drawn while their pane was hidden need to re-measure
+                    setTimeout(function() { window.dispatchEvent(new Event('resize')); }, 0);
+                    return [styles, request];
+                }
+                """,
+                Output({'type': 'tab-pane', 'tab': ALL}, 'style'),
+                Output('tab-request', 'data'),
+                Input('main-tabs', 'value'),
+                State('hydrated-tabs', 'data'),
+                State({'type': 'tab-pane', 'tab': ALL}, 'id')
+            )
+            
+            @app.callback(
+                Output({'type': 'tab-pane', 'tab': ALL}, 'children'),
+                Output('hydrated-tabs', 'data'),
+                Input('tab-request', 'data'),
+                State({'type': 'tab-pane', 'tab': ALL}, 'id'),
+                State('hydrated-tabs', 'data'),
+                prevent_initial_call=True
+            )
+            def hydrate_tab(active_tab, pane_ids, hydrated):
+                if not active_tab or active_tab in hydrated:
+                    raise PreventUpdate
+                g.tab = active_tab if active_tab in self.tab_builders else 'dashboard'
+                children = [
+                    self.render_tab(active_tab) if pane_id['tab'] == active_tab else no_update
+                    for pane_id in pane_ids
+                ]
+                return children, hydrated + [active_tab]
+        
+        # Re-query time series at full resolution for the zoomed range
+        @app.callback(
+            Output({'type': 'timeseries-graph', 'chart': MATCH}, 'figure'),
+            Input({'type': 'timeseries-graph', 'chart': MATCH}, 'relayoutData'),
+            State({'type': 'timeseries-graph', 'chart': MATCH}, 'id'),
+            prevent_initial_call=True
+        )
+        def zoom_timeseries(relayout_data, graph_id):
+            return self.render_chart(graph_id['chart'], relayout_data)
+        
+        # Fill each skeleton graph from its own request so tabs paint progressively
+        @app.callback(
+            Output({'type': 'lazy-graph', 'chart': MATCH}, 'figure'),
+            Input({'type': 'lazy-graph', 'chart': MATCH}, 'relayoutData'),
+            State({'type': 'lazy-graph', 'chart': MATCH}, 'id')
+        )
+        def fill_lazy_graph(relayout_data, graph_id):
+            return self.render_chart(graph_id['chart'], relayout_data)
+
+        # Show a finished background tab build in place of its progress bar
+        @app.callback(
+            Output({'type': 'job-result', 'job': MATCH}, 'children'),
+            Output({'type': 'job-status', 'job': MATCH}, 'children'),
+            Output({'type': 'job-poll', 'job': MATCH}, 'disabled'),
+            Input({'type': 'job-poll', 'job': MATCH}, 'n_intervals'),
+            State({'type': 'job-poll', 'job': MATCH}, 'id'),
+            prevent_initial_call=True
+        )
+        def poll_tab_job(n_intervals, poll_id):
+            state = self.jobs.status(poll_id['job']) if self.jobs else None
+            if state is None:
+                return None, dbc.Alert("This build expired; switch tabs to start it again.", color='warning'), True
+            if state['status'] == 'done':
+                return self.finish_tab_job(poll_id['job'], state), None, True
+            if state['status'] == 'failed':
+                return None, dbc.Alert(state['message'], color='danger'), True
+            value, label, animated = self.job_progress(state)
+            return no_update, dbc.Progress(value=value, label=label, striped=True, animated=animated,
+                                           style={'height': '24px', 'margin': '40px 20%'}), False
+
+        # Re-simulate the runway scenario when a slider is released
+        @app.callback(
+            Output('runway-fan-chart', 'figure'),
+            Output('runway-distribution-chart', 'figure'),
+            Output('runway-job', 'data'),
+            Output('runway-job-poll', 'disabled'),
+            Output('runway-job-status', 'children'),
+            [Input('runway-' + name.replace('_', '-'), 'value') for name, *_ in self.RUNWAY_SLIDERS],
+            prevent_initial_call=True
+        )
+        def update_runway(*values):
+            if any(value is None for value in values):
+                raise PreventUpdate
+            scenario = dict(zip([name for name, *_ in self.RUNWAY_SLIDERS], values))
+            cached = self.runway_key(dict(self.runway_defaults(), **scenario)) in self.runway_cache
+            return self.figures_or_job(['runway_fan', 'runway_distribution'], cached, **scenario)
+
+        # Recompute LTV/CAC for the users acquired in the selected date range
+        @app.callback(
+            Output('ltv-cac-graph', 'figure'),
+            Output('ltv-cac-job', 'data'),
+            Output('ltv-cac-job-poll', 'disabled'),
+            Output('ltv-cac-job-status', 'children'),
+            Input('ltv-cac-range', 'start_date'),
+            Input('ltv-cac-range', 'end_date'),
+            prevent_initial_call=True
+        )
+        def update_ltv_cac(start_date, end_date):
+            # Once the per-user model is built, any range is a millisecond query
+            cached = self._unit_economics is not None
+            return self.figures_or_job(['ltv_cac'], cached, start=start_date, end=end_date)
+
+        self.register_figure_job_poll(app, 'runway', ['runway-fan-chart', 'runway-distribution-chart'])
+        self.register_figure_job_poll(app, 'ltv-cac', ['ltv-cac-graph'])
+
+        # List the risks behind a clicked risk matrix cell, from the grid's cell index
+        @app.callback(
+            Output('risk-drilldown', 'children'),
+            Input('risk-matrix-graph', 'clickData'),
+            prevent_initial_call=True
+        )
+        def drill_into_risk_cell(click_data):
+            if not click_data or not click_data.get('points'):
+                raise PreventUpdate
+            point = click_data['points'][0]
+            return self.risk_cell_details(point['x'], point['y'])
+        
+        # Answer tab switches from pre-serialized bytes, skipping Dash's dispatch
+        if tab_mode == 'server' and self.settings.payload_store:
+            @app.server.before_request
+            def serve_tab_payload():
+                if request.method != 'POST' or request.path != update_path:
+                    return None
+                body = request.get_json(silent=True) or {}
+                inputs = body.get('inputs') or []
+                if body.get('output') != 'tab-content-area.children' or len(inputs) != 1:
+                    return None
+                active_tab = inputs[0].get('value')
+                if active_tab not in self.tab_builders:
+                    active_tab = 'dashboard'
+                # Tabs not built yet go through render_tab_content, which starts a background job
+                if self.jobs is not None and (active_tab, self.data_version) not in self.figure_cache:
+                    return None
+                g.tab = active_tab
+                # No ETag: POSTs are not revalidated, and the renderer treats a 304 as a failed callback
+                return payload_response(self.get_tab_payload(active_tab))
+        
+        # Index, layout and bundles from bytes serialized and compressed once
+        layout_path = prefix + '_dash-layout'
+        suites_prefix = prefix + '_dash-component-suites/'
         
-        # App layout with clean tab structure
-        app.layout = dbc.Container([
+        @app.server.before_request
+        def serve_static_payloads():
+            if request.method != 'GET':
+                return None
+            if request.path == layout_path:
+                etag, variants = self.get_layout_payload()
+                return payload_response(variants, etag=etag)
+            if request.path.startswith(suites_prefix):
+                package, _, path = request.path[len(suites_prefix):].partition('/')
+                return self.static_assets.serve_asset(package, path)
+            if request.path == prefix:
+                etag, variants = self.static_assets.index()
+                return payload_response(variants, etag=etag, mimetype='text/html')
+            return None
+        
+        # The callback graph only changes with a deploy: tag it by content so
+        # browsers and proxies can revalidate for a 304
+        conditional_paths = {prefix + '_dash-dependencies'}
+        
+        @app.server.after_request
+        def add_conditional_headers(response):
+            if request.method == 'GET' and request.path in conditional_paths and response.status_code == 200:
+                response.add_etag()
+                response.headers['Cache-Control'] = 'no-cache'
+                response.make_conditional(request)
+            return response
+        
+        return app
+    
+    def create_layout(self):
+        """Page layout: header, KPI cards, tabs and the tab content area"""
+        return dbc.Container([
             # Header Section
             dbc.Row([
                 dbc.Col([
@@ -228,7 +2939,7 @@ class ZestMoneyAnalytics:
                     ], style={'textAlign': 'center', 'padding': '30px 0 20px 0'})
                 ], width=12)
             ]),
-            
+        
             # KPI Cards Row
             dbc.Row([
                 dbc.Col([
@@ -239,7 +2950,7 @@ class ZestMoneyAnalytics:
                         ])
                     ], className="kpi-card")
                 ], width=2),
-                
+            
                 dbc.Col([
                     dbc.Card([
                         dbc.CardBody([
@@ -248,7 +2959,7 @@ class ZestMoneyAnalytics:
                         ])
                     ], className="kpi-card")
                 ], width=2),
-                
+            
                 dbc.Col([
                     dbc.Card([
                         dbc.CardBody([
@@ -257,7 +2968,7 @@ class ZestMoneyAnalytics:
                         ])
                     ], className="kpi-card")
                 ], width=2),
-                
+            
                 dbc.Col([
                     dbc.Card([
                         dbc.CardBody([
@@ -266,7 +2977,7 @@ class ZestMoneyAnalytics:
                         ])
                     ], className="kpi-card")
                 ], width=2),
-                
+            
                 dbc.Col([
                     dbc.Card([
                         dbc.CardBody([
@@ -275,7 +2986,7 @@ class ZestMoneyAnalytics:
                         ])
                     ], className="kpi-card")
                 ], width=2),
-                
+            
                 dbc.Col([
                     dbc.Card([
                         dbc.CardBody([
@@ -285,7 +2996,7 @@ class ZestMoneyAnalytics:
                     ], className="kpi-card")
                 ], width=2)
             ], className="mb-4"),
-            
+        
             # Tabs Navigation
             html.Div([
                 dcc.Tabs(
@@ -304,34 +3015,27 @@ class ZestMoneyAnalytics:
                     parent_className="custom-tabs-container"
                 )
             ], style={'marginBottom': '30px'}),
-            
-            # Tab Content Area
-            html.Div(id='tab-content-area', style={'minHeight': '800px'})
-            
-        ], fluid=True, style={'backgroundColor': '#f8f9fa', 'minHeight': '100vh', 'padding': '0'})
         
-        # Single callback for tab navigation
-        @app.callback(
-            Output('tab-content-area', 'children'),
-            Input('main-tabs', 'value')
-        )
-        def render_tab_content(active_tab):
-            if active_tab == 'financial':
-                return self.create_financial_content()
-            elif active_tab == 'operations':
-                return self.create_operations_content()
-            elif active_tab == 'strategic':
-                return self.create_strategic_content()
-            elif active_tab == 'customer':
-                return self.create_customer_content()
-            elif active_tab == 'market':
-                return self.create_market_content()
-            elif active_tab == 'risk':
-                return self.create_risk_content()
-            else:
-                return self.create_dashboard_content()
+            # Tab Content Area
+            html.Div(id='tab-content-area', style={'minHeight': '800px'}) if self.settings.tab_mode == 'server'
+            else self.create_tab_panes(eager=self.settings.tab_mode == 'eager')
         
-        return app
+        ], fluid=True, style={'backgroundColor': '#f8f9fa', 'minHeight': '100vh', 'padding': '0'})
+    
+    def create_tab_panes(self, eager):
+        """One pane per tab for clientside switching, all built (eager) or hydrated on first visit (lazy)"""
+        hydrated = list(self.tab_builders) if eager else ['dashboard']
+        return html.Div([
+            html.Div(
+                self.get_tab_content(tab) if tab in hydrated else None,
+                id={'type': 'tab-pane', 'tab': tab},
+                style={'display': 'block' if tab == 'dashboard' else 'none'}
+            )
+            for tab in self.tab_builders
+        ] + [
+            dcc.Store(id='hydrated-tabs', data=hydrated),
+            dcc.Store(id='tab-request')
+        ], id='tab-content-area', style={'minHeight': '800px'})
     
     def create_dashboard_content(self):
         """Create executive dashboard content"""
@@ -340,14 +3044,14 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("Revenue vs Loss Trend", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_revenue_loss_chart(), style={'height': '400px'})
+                        self.graph('revenue_loss', '400px')
                     ], className="chart-container")
                 ], width=6),
                 
                 dbc.Col([
                     html.Div([
                         html.H4("User Growth Analysis", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_user_growth_chart(), style={'height': '400px'})
+                        self.graph('user_growth', '400px')
                     ], className="chart-container")
                 ], width=6)
             ], className="mb-4"),
@@ -356,14 +3060,14 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("Funding Timeline", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_funding_chart(), style={'height': '400px'})
+                        self.graph('funding', '400px')
                     ], className="chart-container")
                 ], width=6),
                 
                 dbc.Col([
                     html.Div([
                         html.H4("NPA Trend Analysis", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_npa_chart(), style={'height': '400px'})
+                        self.graph('npa', '400px')
                     ], className="chart-container")
                 ], width=6)
             ], className="mb-4"),
@@ -448,14 +3152,14 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("Revenue & Expense Trends", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_revenue_expense_chart(), style={'height': '450px'})
+                        self.graph('revenue_expense', '450px')
                     ], className="chart-container")
                 ], width=6),
                 
                 dbc.Col([
                     html.Div([
                         html.H4("Expense Breakdown (2024)", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_expense_breakdown_chart(), style={'height': '450px'})
+                        self.graph('expense_breakdown', '450px')
                     ], className="chart-container")
                 ], width=6)
             ], className="mb-4"),
@@ -464,9 +3168,34 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("Burn Rate Analysis", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_burn_rate_chart(), style={'height': '400px'})
+                        self.graph('burn_rate', '400px')
                     ], className="chart-container")
                 ], width=12)
+            ], className="mb-4"),
+
+            dbc.Row([
+                dbc.Col([
+                    html.Div([
+                        html.H4("Runway Scenario", style={'marginBottom': '20px', 'color': '#343a40'}),
+                        self.runway_controls()
+                    ], className="chart-container")
+                ], width=3),
+
+                dbc.Col([
+                    html.Div([
+                        html.H4("Cash Balance Outlook", style={'marginBottom': '20px', 'color': '#343a40'}),
+                        dcc.Graph(id='runway-fan-chart', figure=self.build_figure('runway_fan'),
+                                  style={'height': '400px'})
+                    ], className="chart-container")
+                ], width=5),
+
+                dbc.Col([
+                    html.Div([
+                        html.H4("Runway Distribution", style={'marginBottom': '20px', 'color': '#343a40'}),
+                        dcc.Graph(id='runway-distribution-chart', figure=self.build_figure('runway_distribution'),
+                                  style={'height': '400px'})
+                    ], className="chart-container")
+                ], width=4)
             ])
         ])
     
@@ -477,14 +3206,14 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("User Engagement Analysis", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_detailed_user_chart(), style={'height': '400px'})
+                        self.graph('detailed_user', '400px')
                     ], className="chart-container")
                 ], width=6),
                 
                 dbc.Col([
                     html.Div([
                         html.H4("Merchant Network Growth", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_merchant_chart(), style={'height': '400px'})
+                        self.graph('merchant', '400px')
                     ], className="chart-container")
                 ], width=6)
             ], className="mb-4"),
@@ -493,14 +3222,14 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("Customer Churn Analysis", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_churn_chart(), style={'height': '400px'})
+                        self.graph('churn', '400px')
                     ], className="chart-container")
                 ], width=6),
                 
                 dbc.Col([
                     html.Div([
                         html.H4("App Rating Trend", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_rating_chart(), style={'height': '400px'})
+                        self.graph('rating', '400px')
                     ], className="chart-container")
                 ], width=6)
             ])
@@ -513,7 +3242,7 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("Strategic Opportunity Matrix", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_opportunity_matrix(), style={'height': '500px'})
+                        self.graph('opportunity_matrix', '500px')
                     ], className="chart-container")
                 ], width=8),
                 
@@ -521,16 +3250,7 @@ class ZestMoneyAnalytics:
                     dbc.Card([
                         dbc.CardHeader(html.H5("Top Opportunities", style={'margin': '0', 'color': '#0066CC'})),
                         dbc.CardBody([
-                            html.Div([
-                                html.H6("1. B2B Credit Infrastructure", style={'color': '#28a745'}),
-                                html.P("TAM: $25B, Capital: $20M"),
-                                html.Hr(),
-                                html.H6("2. RegTech Solutions", style={'color': '#17a2b8'}),
-                                html.P("TAM: $12B, Capital: $8M"),
-                                html.Hr(),
-                                html.H6("3. Credit Scoring APIs", style={'color': '#0066CC'}),
-                                html.P("TAM: $18B, Capital: $12M")
-                            ])
+                            self.top_opportunities()
                         ])
                     ], className="h-100")
                 ], width=4)
@@ -540,19 +3260,80 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("Market Size Analysis", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_market_size_chart(), style={'height': '400px'})
+                        self.graph('market_size', '400px')
                     ], className="chart-container")
                 ], width=6),
                 
                 dbc.Col([
                     html.Div([
                         html.H4("Implementation Timeline", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_roadmap_chart(), style={'height': '400px'})
+                        self.graph('roadmap', '400px')
                     ], className="chart-container")
                 ], width=6)
             ])
         ])
     
+    def optimal_portfolio(self):
+        """Indices of the optimizer's opportunity portfolio, most attractive first"""
+        opportunities = self.opportunities
+        selected = optimize_portfolio(
+            opportunities['capital_required'],
+            opportunities[self.settings.portfolio_objective],
+            opportunities['risk_score'],
+            self.settings.portfolio_budget,
+            self.settings.portfolio_risk_cap
+        )
+        attractiveness = np.asarray(opportunities['attractiveness'], dtype=np.float64)
+        return selected[np.argsort(-attractiveness[selected], kind='stable')]
+
+    def top_opportunities(self):
+        """Top Opportunities card body: the first picks of the optimal portfolio"""
+        opportunities = self.opportunities
+        selected = self.optimal_portfolio()
+        rank_colors = [self.colors['success'], self.colors['info'], self.colors['primary']]
+        items = []
+        for rank, index in enumerate(selected[:self.settings.portfolio_top_n]):
+            if rank:
+                items.append(html.Hr())
+            items.extend([
+                html.H6(f"{rank + 1}. {opportunities['name'][index]}",
+                        style={'color': rank_colors[rank % len(rank_colors)]}),
+                html.P(f"TAM: ${opportunities['tam_billions'][index]:g}B, "
+                       f"Capital: ${opportunities['capital_required'][index]:g}M")
+            ])
+        if not items:
+            items.append(html.P("No opportunity fits the budget and risk cap"))
+        capital = float(np.sum(np.asarray(opportunities['capital_required'], dtype=np.float64)[selected]))
+        items.append(html.P(
+            f"Portfolio of {len(selected)}: ${capital:g}M of ${self.settings.portfolio_budget:g}M, "
+            f"risk ≤ {self.settings.portfolio_risk_cap:g}",
+            style={'color': '#6c757d', 'marginTop': '10px', 'marginBottom': '0'}
+        ))
+        return html.Div(items)
+    
+    # Segments listed under each heading of the Segment Insights card
+    INSIGHT_SEGMENTS = 3
+
+    def segment_insights(self):
+        """Segment Insights card body: highest LTV and LTV/CAC over all acquired users"""
+        summary = self.ltv_cac()
+        acquired = np.flatnonzero(summary['users'] > 0)
+        segments = np.asarray(summary['segment'])
+        by_ltv = acquired[np.argsort(-summary['ltv'][acquired], kind='stable')][:self.INSIGHT_SEGMENTS]
+        by_ratio = acquired[np.argsort(-summary['ltv_cac'][acquired], kind='stable')][:self.INSIGHT_SEGMENTS]
+        below = acquired[summary['ltv_cac'][acquired] < 3]
+        items = [
+            html.H6("High-Value Segments:"),
+            html.Ul([html.Li(f"{segments[i]}: ₹{summary['ltv'][i] / 1e5:.1f}L LTV") for i in by_ltv]),
+            html.Hr(),
+            html.H6("Best Returns on Acquisition:"),
+            html.Ul([html.Li(f"{segments[i]}: {summary['ltv_cac'][i]:.1f}x LTV/CAC") for i in by_ratio])
+        ]
+        if len(below):
+            items.append(html.P(f"Below the 3x threshold: {', '.join(segments[below])}",
+                                style={'color': '#6c757d', 'marginBottom': '0'}))
+        return html.Div(items)
+    
     def create_customer_content(self):
         """Create customer analytics content"""
         return html.Div([
@@ -560,28 +3341,14 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("Customer Segmentation", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_customer_segmentation(), style={'height': '500px'})
+                        self.graph('customer_segmentation', '500px')
                     ], className="chart-container")
                 ], width=8),
                 
                 dbc.Col([
                     dbc.Card([
                         dbc.CardHeader(html.H5("Segment Insights", style={'margin': '0', 'color': '#0066CC'})),
-                        dbc.CardBody([
-                            html.H6("High-Value Segments:"),
-                            html.Ul([
-                                html.Li("Tech Workers: ₹3.2L LTV"),
-                                html.Li("SME Owners: ₹2.8L LTV"),
-                                html.Li("Urban Salaried: ₹2.2L LTV")
-                            ]),
-                            html.Hr(),
-                            html.H6("Growth Opportunities:"),
-                            html.Ul([
-                                html.Li("Focus on professionals"),
-                                html.Li("B2B SME lending"),
-                                html.Li("Premium products")
-                            ])
-                        ])
+                        dbc.CardBody(self.segment_insights())
                     ], className="h-100")
                 ], width=4)
             ], className="mb-4"),
@@ -590,9 +3357,27 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("LTV vs CAC Analysis", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_ltv_cac_chart(), style={'height': '400px'})
+                        self.ltv_cac_controls(),
+                        dcc.Graph(id='ltv-cac-graph', figure=self.build_figure('ltv_cac'),
+                                  style={'height': '400px'})
                     ], className="chart-container")
                 ], width=12)
+            ], className="mb-4"),
+            
+            dbc.Row([
+                dbc.Col([
+                    html.Div([
+                        html.H4("Cohort Retention", style={'marginBottom': '20px', 'color': '#343a40'}),
+                        self.graph('cohort_retention', '450px')
+                    ], className="chart-container")
+                ], width=6),
+                
+                dbc.Col([
+                    html.Div([
+                        html.H4("Cohort Cumulative Default Rate", style={'marginBottom': '20px', 'color': '#343a40'}),
+                        self.graph('cohort_defaults', '450px')
+                    ], className="chart-container")
+                ], width=6)
             ])
         ])
     
@@ -603,14 +3388,14 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("Market Size by Segment", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_market_segments_chart(), style={'height': '400px'})
+                        self.graph('market_segments', '400px')
                     ], className="chart-container")
                 ], width=6),
                 
                 dbc.Col([
                     html.Div([
                         html.H4("Growth Rate Analysis", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_growth_rate_chart(), style={'height': '400px'})
+                        self.graph('growth_rate', '400px')
                     ], className="chart-container")
                 ], width=6)
             ], className="mb-4"),
@@ -619,7 +3404,7 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("Addressable Market", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_addressable_market(), style={'height': '400px'})
+                        self.graph('addressable_market', '400px')
                     ], className="chart-container")
                 ], width=12)
             ])
@@ -632,24 +3417,17 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("Risk Assessment Matrix", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_risk_matrix(), style={'height': '500px'})
+                        dcc.Graph(id='risk-matrix-graph', figure=self.build_figure('risk_matrix'),
+                                  style={'height': '500px'}),
+                        html.Div(html.P("Click a cell to list its risks", style={'color': '#6c757d'}),
+                                 id='risk-drilldown') if not self.settings.static_export else None
                     ], className="chart-container")
                 ], width=8),
                 
                 dbc.Col([
                     dbc.Card([
                         dbc.CardHeader(html.H5("Critical Risks", style={'margin': '0', 'color': '#dc3545'})),
-                        dbc.CardBody([
-                            html.H6("Immediate Attention:"),
-                            html.Ul([
-                                html.Li("Credit Risk: 9.2/10"),
-                                html.Li("Regulatory Risk: 8.1/10"),
-                                html.Li("Funding Risk: 8.5/10")
-                            ]),
-                            html.Hr(),
-                            html.H6("Mitigation Cost:"),
-                            html.P("Total: $90M over 18 months")
-                        ])
+                        dbc.CardBody(self.critical_risks())
                     ], className="h-100")
                 ], width=4)
             ], className="mb-4"),
@@ -658,29 +3436,80 @@ class ZestMoneyAnalytics:
                 dbc.Col([
                     html.Div([
                         html.H4("Risk Mitigation Timeline", style={'marginBottom': '20px', 'color': '#343a40'}),
-                        dcc.Graph(figure=self.create_risk_timeline(), style={'height': '400px'})
+                        self.graph('risk_timeline', '400px')
                     ], className="chart-container")
                 ], width=12)
             ])
         ])
     
+    # Risks listed under Immediate Attention
+    CRITICAL_RISKS = 3
+
+    def critical_risks(self):
+        """Critical Risks card body: the highest probability x impact risks and total mitigation cost"""
+        risks = self.risk_data
+        grid = self.risk_grid()
+        probability = np.asarray(risks['probability'], dtype=np.float64)
+        impact = np.asarray(risks['impact'], dtype=np.float64)
+        cost = np.asarray(risks['mitigation_cost'], dtype=np.float64)
+        # Highest score first, the costlier risk first among equal scores
+        top = np.lexsort((-cost, -probability * impact))[:self.CRITICAL_RISKS]
+        total = float(grid.costs.sum())
+        top_cost = float(cost[top].sum())
+        return html.Div([
+            html.H6("Immediate Attention:"),
+            html.Ul([html.Li(f"{risks['category'][i]}: probability {probability[i]:g}, impact {impact[i]:g}")
+                     for i in top]),
+            html.Hr(),
+            html.H6("Mitigation Cost:"),
+            html.P(f"Total: ${total:g}M across {int(grid.counts.sum()):,} risks"),
+            html.P(f"Top {len(top)}: ${top_cost:g}M", style={'color': '#6c757d', 'marginBottom': '0'})
+        ])
+    
+    def risk_cell_details(self, probability, impact):
+        """Drill-down table of one risk matrix cell, costliest risks first"""
+        grid = self.risk_grid()
+        items = grid.items(probability, impact)
+        shown = items[:self.settings.risk_drilldown_rows]
+        columns = list(self.risk_data)
+        
+        def cell(value):
+            return value if isinstance(value, str) else f"{value:g}"
+        
+        cost = grid.costs[int(impact) - 1, int(probability) - 1] if len(items) else 0
+        children = [html.H6(f"Probability {probability} × Impact {impact}: "
+                            f"{len(items)} risks, ${cost:g}M mitigation")]
+        if len(shown):
+            children.append(dbc.Table([
+                html.Thead(html.Tr([html.Th(column.replace('_', ' ').title()) for column in columns])),
+                html.Tbody([
+                    html.Tr([html.Td(cell(self.risk_data[column][index])) for column in columns])
+                    for index in shown
+                ])
+            ], size='sm', hover=True))
+        if len(items) > len(shown):
+            children.append(html.P(f"… and {len(items) - len(shown)} more", style={'color': '#6c757d'}))
+        return children
+    
     # Chart creation methods
-    def create_revenue_loss_chart(self):
+    def create_revenue_loss_chart(self, x_range=None):
         """Revenue vs Loss trend"""
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=self.financial_data['year'],
-            y=self.financial_data['revenue_cr'],
+        x, y = self.series(self.financial_data['year'], self.financial_data['revenue_cr'], x_range)
+        fig.add_trace(self.scatter(
+            x=x,
+            y=y,
             mode='lines+markers',
             name='Revenue',
             line=dict(color=self.colors['success'], width=3),
             hovertemplate='<b>Revenue</b><br>Year: %{x}<br>Amount: ₹%{y} Cr<extra></extra>'
         ))
         
-        fig.add_trace(go.Scatter(
-            x=self.financial_data['year'],
-            y=self.financial_data['loss_cr'],
+        x, y = self.series(self.financial_data['year'], self.financial_data['loss_cr'], x_range)
+        fig.add_trace(self.scatter(
+            x=x,
+            y=y,
             mode='lines+markers',
             name='Net Loss',
             line=dict(color=self.colors['danger'], width=3),
@@ -690,40 +3519,41 @@ class ZestMoneyAnalytics:
         fig.update_layout(
             xaxis_title="Year",
             yaxis_title="Amount (₹ Crores)",
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5)
         )
+        if x_range:
+            fig.update_xaxes(range=list(x_range))
         
         return fig
 
-    def create_user_growth_chart(self):
+    def create_user_growth_chart(self, x_range=None):
         """User growth analysis"""
         fig = make_subplots(specs=[[{"secondary_y": True}]])
         
-        fig.add_trace(go.Scatter(
-            x=self.operational_data['year'],
-            y=self.operational_data['users_millions'],
+        x, y = self.series(self.operational_data['year'], self.operational_data['users_millions'], x_range)
+        fig.add_trace(self.scatter(
+            x=x,
+            y=y,
             mode='lines+markers',
             name='Total Users',
             line=dict(color=self.colors['primary'], width=3)
         ))
         
-        fig.add_trace(go.Scatter(
-            x=self.operational_data['year'],
-            y=self.operational_data['active_users_millions'],
+        x, y = self.series(self.operational_data['year'], self.operational_data['active_users_millions'], x_range)
+        fig.add_trace(self.scatter(
+            x=x,
+            y=y,
             mode='lines+markers',
             name='Active Users',
             line=dict(color=self.colors['info'], width=3)
         ))
         
-        engagement_rate = [active/total*100 for active, total in 
-                          zip(self.operational_data['active_users_millions'], 
-                              self.operational_data['users_millions'])]
+        engagement_rate = self.metrics['engagement_rate']
         
-        fig.add_trace(go.Scatter(
-            x=self.operational_data['year'],
-            y=engagement_rate,
+        x, y = self.series(self.operational_data['year'], engagement_rate, x_range)
+        fig.add_trace(self.scatter(
+            x=x,
+            y=y,
             mode='lines+markers',
             name='Engagement Rate (%)',
             line=dict(color=self.colors['warning'], width=2, dash='dash'),
@@ -732,13 +3562,13 @@ class ZestMoneyAnalytics:
         
         fig.update_layout(
             xaxis_title="Year",
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5)
         )
         
         fig.update_yaxes(title_text="Users (Millions)", secondary_y=False)
         fig.update_yaxes(title_text="Engagement Rate (%)", secondary_y=True)
+        if x_range:
+            fig.update_xaxes(range=list(x_range))
         
         return fig
 
@@ -758,28 +3588,28 @@ class ZestMoneyAnalytics:
         
         fig.update_layout(
             xaxis_title="Funding Round",
-            yaxis_title="Amount ($M)",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="Amount ($M)"
         )
         
         return fig
 
-    def create_npa_chart(self):
+    def create_npa_chart(self, x_range=None):
         """NPA trend analysis"""
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=self.operational_data['year'],
-            y=self.operational_data['npa_rate'],
+        x, y = self.series(self.operational_data['year'], self.operational_data['npa_rate'], x_range)
+        fig.add_trace(self.scatter(
+            x=x,
+            y=y,
             mode='lines+markers',
             name='ZestMoney NPA Rate',
             line=dict(color=self.colors['danger'], width=3)
         ))
         
-        fig.add_trace(go.Scatter(
-            x=self.operational_data['year'],
-            y=self.operational_data['industry_npa'],
+        x, y = self.series(self.operational_data['year'], self.operational_data['industry_npa'], x_range)
+        fig.add_trace(self.scatter(
+            x=x,
+            y=y,
             mode='lines+markers',
             name='Industry Benchmark',
             line=dict(color=self.colors['success'], width=2, dash='dash')
@@ -788,29 +3618,31 @@ class ZestMoneyAnalytics:
         fig.update_layout(
             xaxis_title="Year",
             yaxis_title="NPA Rate (%)",
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5)
         )
+        if x_range:
+            fig.update_xaxes(range=list(x_range))
         
         return fig
 
-    def create_revenue_expense_chart(self):
+    def create_revenue_expense_chart(self, x_range=None):
         """Revenue and expense trend"""
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=self.financial_data['year'],
-            y=self.financial_data['revenue_cr'],
+        x, y = self.series(self.financial_data['year'], self.financial_data['revenue_cr'], x_range)
+        fig.add_trace(self.scatter(
+            x=x,
+            y=y,
             mode='lines+markers',
             name='Revenue',
             line=dict(color=self.colors['success'], width=3),
             fill='tozeroy'
         ))
         
-        fig.add_trace(go.Scatter(
-            x=self.financial_data['year'],
-            y=self.financial_data['expenses_cr'],
+        x, y = self.series(self.financial_data['year'], self.financial_data['expenses_cr'], x_range)
+        fig.add_trace(self.scatter(
+            x=x,
+            y=y,
             mode='lines+markers',
             name='Expenses',
             line=dict(color=self.colors['danger'], width=3),
@@ -820,10 +3652,10 @@ class ZestMoneyAnalytics:
         fig.update_layout(
             xaxis_title="Year",
             yaxis_title="Amount (₹ Crores)",
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5)
         )
+        if x_range:
+            fig.update_xaxes(range=list(x_range))
         
         return fig
 
@@ -839,21 +3671,18 @@ class ZestMoneyAnalytics:
             marker_colors=[self.colors['warning'], self.colors['info'], self.colors['danger'], self.colors['secondary']]
         )])
         
-        fig.update_layout(
-            margin=dict(l=40, r=40, t=20, b=40)
-        )
-        
         return fig
 
-    def create_burn_rate_chart(self):
+    def create_burn_rate_chart(self, x_range=None):
         """Burn rate analysis"""
         fig = go.Figure()
         
+        x, y = self.series(self.financial_data['year'], self.financial_data['burn_multiple'], x_range)
         fig.add_trace(go.Bar(
-            x=self.financial_data['year'],
-            y=self.financial_data['burn_multiple'],
+            x=x,
+            y=y,
             marker_color=self.colors['warning'],
-            text=[f"{x:.1f}x" for x in self.financial_data['burn_multiple']],
+            text=self.bar_labels(y, "{:.1f}x"),
             textposition='auto'
         ))
         
@@ -862,32 +3691,156 @@ class ZestMoneyAnalytics:
         
         fig.update_layout(
             xaxis_title="Year",
-            yaxis_title="Burn Rate Multiple",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="Burn Rate Multiple"
+        )
+        if x_range:
+            fig.update_xaxes(range=list(x_range))
+        
+        return fig
+
+    def create_cohort_retention_chart(self):
+        """Share of each monthly cohort active N months after signup"""
+        cohorts = self.cohort_data
+        with np.errstate(invalid='ignore', divide='ignore'):
+            retention = cohort_ages(cohorts['retained']) / np.asarray(cohorts['cohort_size'])[:, None] * 100
+        fig = go.Figure()
+        
+        fig.add_trace(go.Heatmap(
+            x=np.arange(len(retention)),
+            y=cohorts['month'],
+            z=retention,
+            colorscale='Blues',
+            colorbar=dict(title="Active (%)"),
+            hovertemplate='Cohort %{y}<br>Month %{x}: %{z:.1f}% active<extra></extra>'
+        ))
+        
+        fig.update_layout(
+            xaxis_title="Months Since Signup",
+            yaxis=dict(title="Signup Month", type='category', autorange='reversed')
         )
         
         return fig
 
-    def create_detailed_user_chart(self):
+    def create_cohort_defaults_chart(self):
+        """Cumulative share of each monthly cohort that has defaulted, by months since signup"""
+        cohorts = self.cohort_data
+        defaults = cohort_ages(cohorts['defaults'])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            default_rate = (np.where(np.isnan(defaults), np.nan, np.nancumsum(defaults, axis=1))
+                            / np.asarray(cohorts['cohort_size'])[:, None] * 100)
+        fig = go.Figure()
+        
+        fig.add_trace(go.Heatmap(
+            x=np.arange(len(default_rate)),
+            y=cohorts['month'],
+            z=default_rate,
+            colorscale='Reds',
+            colorbar=dict(title="Defaulted (%)"),
+            hovertemplate='Cohort %{y}<br>Month %{x}: %{z:.2f}% defaulted<extra></extra>'
+        ))
+        
+        fig.update_layout(
+            xaxis_title="Months Since Signup",
+            yaxis=dict(title="Signup Month", type='category', autorange='reversed')
+        )
+        
+        return fig
+
+    def create_runway_fan_chart(self, **scenario):
+        """Simulated cash balance: percentile bands by year"""
+        result = self.simulate_runway(**scenario)
+        years, cash = result['years'], result['cash']
+        fig = go.Figure()
+
+        for low, high, opacity in ((5, 95, 0.15), (25, 75, 0.3)):
+            fig.add_trace(self.scatter(
+                x=years,
+                y=cash[low],
+                mode='lines',
+                name=f'P{low}',
+                line=dict(width=0),
+                showlegend=False
+            ))
+            fig.add_trace(self.scatter(
+                x=years,
+                y=cash[high],
+                mode='lines',
+                name=f'P{low}–P{high}',
+                line=dict(width=0),
+                fill='tonexty',
+                fillcolor=f'rgba(0, 102, 204, {opacity})'
+            ))
+
+        fig.add_trace(self.scatter(
+            x=years,
+            y=cash[50],
+            mode='lines+markers',
+            name='Median',
+            line=dict(color=self.colors['primary'], width=3)
+        ))
+
+        fig.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="Cash Out")
+
+        fig.update_layout(
+            xaxis_title="Year",
+            yaxis_title="Cash (₹ Crores)",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5)
+        )
+
+        return fig
+
+    def create_runway_distribution_chart(self, **scenario):
+        """Share of simulated paths running out of cash in each month"""
+        result = self.simulate_runway(**scenario)
+        counts = result['runway_counts']
+        horizon = len(counts) - 1
+        fig = go.Figure()
+
+        fig.add_trace(go.Bar(
+            x=np.arange(horizon),
+            y=counts[:-1] / result['paths'] * 100,
+            marker_color=self.colors['danger']
+        ))
+
+        if result['median_runway'] is not None:
+            fig.add_vline(x=result['median_runway'], line_dash="dash", line_color=self.colors['dark'],
+                          annotation_text=f"Median {result['median_runway']} months")
+
+        fig.add_annotation(
+            text=(f"Out within 12 months: {result['out_within_year'] * 100:.1f}%<br>"
+                  f"Beyond {horizon} months: {counts[-1] / result['paths'] * 100:.1f}%"),
+            xref='paper', yref='paper', x=1, y=1, xanchor='right', yanchor='top',
+            align='right', showarrow=False
+        )
+
+        fig.update_layout(
+            xaxis_title="Months of Runway",
+            yaxis_title="Paths Running Out (%)"
+        )
+
+        return fig
+
+    def create_detailed_user_chart(self, x_range=None):
         """Detailed user analysis"""
         fig = go.Figure()
         
+        x, y = self.series(self.operational_data['year'], self.operational_data['users_millions'], x_range)
         fig.add_trace(go.Bar(
-            x=self.operational_data['year'],
-            y=self.operational_data['users_millions'],
+            x=x,
+            y=y,
             name='Total Users',
             marker_color=self.colors['primary'],
-            text=[f"{x:.1f}M" for x in self.operational_data['users_millions']],
+            text=self.bar_labels(y, "{:.1f}M"),
             textposition='auto'
         ))
         
+        x, y = self.series(self.operational_data['year'], self.operational_data['active_users_millions'], x_range)
         fig.add_trace(go.Bar(
-            x=self.operational_data['year'],
-            y=self.operational_data['active_users_millions'],
+            x=x,
+            y=y,
             name='Active Users',
             marker_color=self.colors['info'],
-            text=[f"{x:.1f}M" for x in self.operational_data['active_users_millions']],
+            text=self.bar_labels(y, "{:.1f}M"),
             textposition='auto'
         ))
         
@@ -895,41 +3848,43 @@ class ZestMoneyAnalytics:
             xaxis_title="Year",
             yaxis_title="Users (Millions)",
             legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
-            margin=dict(l=40, r=40, t=20, b=40),
-            barmode='group',
-            plot_bgcolor='white'
+            barmode='group'
         )
+        if x_range:
+            fig.update_xaxes(range=list(x_range))
         
         return fig
 
-    def create_merchant_chart(self):
+    def create_merchant_chart(self, x_range=None):
         """Merchant growth"""
         fig = go.Figure()
         
+        x, y = self.series(self.operational_data['year'], self.operational_data['merchants'], x_range)
         fig.add_trace(go.Bar(
-            x=self.operational_data['year'],
-            y=self.operational_data['merchants'],
+            x=x,
+            y=y,
             marker_color=self.colors['info'],
-            text=[f"{x:,}" for x in self.operational_data['merchants']],
+            text=self.bar_labels(y, "{:,.0f}"),
             textposition='auto'
         ))
         
         fig.update_layout(
             xaxis_title="Year",
-            yaxis_title="Merchant Partners",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="Merchant Partners"
         )
+        if x_range:
+            fig.update_xaxes(range=list(x_range))
         
         return fig
 
-    def create_churn_chart(self):
+    def create_churn_chart(self, x_range=None):
         """Churn analysis"""
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=self.operational_data['year'],
-            y=self.operational_data['churn_rate'],
+        x, y = self.series(self.operational_data['year'], self.operational_data['churn_rate'], x_range)
+        fig.add_trace(self.scatter(
+            x=x,
+            y=y,
             mode='lines+markers',
             line=dict(color=self.colors['danger'], width=3),
             fill='tozeroy'
@@ -940,20 +3895,21 @@ class ZestMoneyAnalytics:
         
         fig.update_layout(
             xaxis_title="Year",
-            yaxis_title="Annual Churn Rate (%)",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="Annual Churn Rate (%)"
         )
+        if x_range:
+            fig.update_xaxes(range=list(x_range))
         
         return fig
 
-    def create_rating_chart(self):
+    def create_rating_chart(self, x_range=None):
         """App rating trend"""
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=self.operational_data['year'],
-            y=self.operational_data['app_rating'],
+        x, y = self.series(self.operational_data['year'], self.operational_data['app_rating'], x_range)
+        fig.add_trace(self.scatter(
+            x=x,
+            y=y,
             mode='lines+markers',
             line=dict(color=self.colors['warning'], width=3),
             fill='tozeroy'
@@ -964,10 +3920,10 @@ class ZestMoneyAnalytics:
         
         fig.update_layout(
             xaxis_title="Year",
-            yaxis_title="App Rating",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="App Rating"
         )
+        if x_range:
+            fig.update_xaxes(range=list(x_range))
         
         return fig
 
@@ -975,13 +3931,13 @@ class ZestMoneyAnalytics:
         """Strategic opportunity matrix"""
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(self.scatter(
             x=self.opportunities['risk_score'],
             y=self.opportunities['revenue_potential'],
             mode='markers+text',
             text=self.opportunities['name'],
             marker=dict(
-                size=[tam/3 for tam in self.opportunities['tam_billions']],
+                size=self.metrics['opportunity_marker_size'],
                 color=self.opportunities['attractiveness'],
                 colorscale='Viridis',
                 showscale=True,
@@ -994,9 +3950,7 @@ class ZestMoneyAnalytics:
         
         fig.update_layout(
             xaxis_title="Risk Score (1=Low, 10=High)",
-            yaxis_title="Revenue Potential (1=Low, 10=High)",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="Revenue Potential (1=Low, 10=High)"
         )
         
         return fig
@@ -1015,9 +3969,7 @@ class ZestMoneyAnalytics:
         
         fig.update_layout(
             xaxis_title="Opportunity",
-            yaxis_title="Total Addressable Market ($B)",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="Total Addressable Market ($B)"
         )
         
         return fig
@@ -1030,7 +3982,7 @@ class ZestMoneyAnalytics:
         
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(self.scatter(
             x=timeline,
             y=investment,
             mode='lines+markers+text',
@@ -1042,9 +3994,7 @@ class ZestMoneyAnalytics:
         
         fig.update_layout(
             xaxis_title="Timeline (Months)",
-            yaxis_title="Investment ($M)",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="Investment ($M)"
         )
         
         return fig
@@ -1053,13 +4003,13 @@ class ZestMoneyAnalytics:
         """Customer segmentation"""
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(self.scatter(
             x=self.customer_data['size_millions'],
             y=self.customer_data['profitability'],
             mode='markers+text',
             text=self.customer_data['segment'],
             marker=dict(
-                size=[ltv/4000 for ltv in self.customer_data['ltv']],
+                size=self.metrics['segment_marker_size'],
                 color=self.customer_data['default_rate'],
                 colorscale='RdYlGn_r',
                 showscale=True,
@@ -1070,25 +4020,28 @@ class ZestMoneyAnalytics:
         
         fig.update_layout(
             xaxis_title="Segment Size (Millions)",
-            yaxis_title="Profitability Score",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="Profitability Score"
         )
         
         return fig
 
-    def create_ltv_cac_chart(self):
-        """LTV vs CAC analysis"""
-        ltv_cac_ratio = [ltv/cac for ltv, cac in zip(self.customer_data['ltv'], self.customer_data['cac'])]
+    def create_ltv_cac_chart(self, start=None, end=None):
+        """LTV vs CAC by segment, for the users acquired from start to end"""
+        summary = self.ltv_cac(start, end)
+        acquired = summary['users'] > 0
+        ltv_cac_ratio = summary['ltv_cac'][acquired]
         
         fig = go.Figure()
         
         fig.add_trace(go.Bar(
-            x=self.customer_data['segment'],
+            x=np.asarray(summary['segment'])[acquired],
             y=ltv_cac_ratio,
             marker_color=self.colors['success'],
-            text=[f"{val:.1f}x" for val in ltv_cac_ratio],
-            textposition='auto'
+            text=np.char.mod('%.1fx', ltv_cac_ratio),
+            textposition='auto',
+            customdata=np.column_stack([summary['ltv'][acquired], summary['cac'][acquired], summary['users'][acquired]]),
+            hovertemplate=('%{x}<br>LTV ₹%{customdata[0]:,.0f} / CAC ₹%{customdata[1]:,.0f}'
+                           '<br>%{customdata[2]:,.0f} users<extra></extra>')
         ))
         
         fig.add_hline(y=3, line_dash="dash", line_color="red", 
@@ -1096,9 +4049,7 @@ class ZestMoneyAnalytics:
         
         fig.update_layout(
             xaxis_title="Customer Segment",
-            yaxis_title="LTV/CAC Ratio",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="LTV/CAC Ratio"
         )
         
         return fig
@@ -1117,9 +4068,7 @@ class ZestMoneyAnalytics:
         
         fig.update_layout(
             xaxis_title="Market Segment",
-            yaxis_title="Market Size ($B)",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="Market Size ($B)"
         )
         
         return fig
@@ -1138,17 +4087,14 @@ class ZestMoneyAnalytics:
         
         fig.update_layout(
             xaxis_title="Market Segment",
-            yaxis_title="CAGR (%)",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="CAGR (%)"
         )
         
         return fig
 
     def create_addressable_market(self):
         """Addressable market"""
-        addressable = [size * addr/100 for size, addr in 
-                      zip(self.market_data['size_billions'], self.market_data['addressable_pct'])]
+        addressable = self.metrics['addressable_market']
         
         fig = go.Figure()
         
@@ -1171,58 +4117,67 @@ class ZestMoneyAnalytics:
             xaxis_title="Market Segment",
             yaxis_title="Market Size ($B)",
             legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
-            margin=dict(l=40, r=40, t=20, b=40),
-            barmode='overlay',
-            plot_bgcolor='white'
+            barmode='overlay'
         )
         
         return fig
 
     def create_risk_matrix(self):
-        """Risk matrix"""
+        """Risk matrix: register binned by probability and impact, colored by mitigation cost"""
+        grid = self.risk_grid()
+        scores = np.arange(1, grid.size + 1)
+        # Single-risk cells are labelled with the risk, others with their count
+        labels = np.full(grid.counts.shape, '', dtype=object)
+        for row, column in zip(*np.nonzero(grid.counts)):
+            items = grid.items(column + 1, row + 1)
+            labels[row, column] = (str(self.risk_data['category'][items[0]]) if len(items) == 1
+                                   else f"{len(items)} risks")
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=self.risk_data['probability'],
-            y=self.risk_data['impact'],
-            mode='markers+text',
-            text=self.risk_data['category'],
-            marker=dict(
-                size=[cost*2 for cost in self.risk_data['mitigation_cost']],
-                color=self.risk_data['mitigation_cost'],
-                colorscale='Reds',
-                showscale=True,
-                colorbar=dict(title="Mitigation Cost ($M)")
-            ),
-            textposition='top center'
+        fig.add_trace(go.Heatmap(
+            x=scores,
+            y=scores,
+            z=np.where(grid.counts > 0, grid.costs, np.nan),
+            customdata=grid.counts,
+            text=labels,
+            texttemplate='%{text}',
+            colorscale='Reds',
+            colorbar=dict(title="Mitigation Cost ($M)"),
+            xgap=2,
+            ygap=2,
+            hovertemplate='Probability: %{x}<br>Impact: %{y}<br>Risks: %{customdata}<br>Mitigation: $%{z}M<extra></extra>'
         ))
         
         fig.update_layout(
-            xaxis_title="Probability Score",
-            yaxis_title="Impact Severity",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            xaxis=dict(title="Probability Score", dtick=1),
+            yaxis=dict(title="Impact Severity", dtick=1)
         )
         
         return fig
 
     def create_risk_timeline(self):
-        """Risk mitigation timeline"""
+        """Mitigation cost by risk category, in register order (the costliest categories if there are many)"""
+        categories, first_seen, codes = np.unique(
+            np.asarray(self.risk_data['category']), return_index=True, return_inverse=True
+        )
+        totals = np.bincount(codes, weights=np.asarray(self.risk_data['mitigation_cost'], dtype=np.float64))
+        if len(categories) > RISK_TIMELINE_CATEGORIES:
+            shown = np.argsort(-totals, kind='stable')[:RISK_TIMELINE_CATEGORIES]
+        else:
+            shown = np.argsort(first_seen)
         fig = go.Figure()
         
         fig.add_trace(go.Bar(
-            x=self.risk_data['category'],
-            y=self.risk_data['mitigation_cost'],
+            x=categories[shown],
+            y=totals[shown],
             marker_color=self.colors['danger'],
-            text=[f"${val}M" for val in self.risk_data['mitigation_cost']],
+            text=[f"${val:g}M" for val in totals[shown]],
             textposition='auto'
         ))
         
         fig.update_layout(
             xaxis_title="Risk Category",
-            yaxis_title="Mitigation Cost ($M)",
-            margin=dict(l=40, r=40, t=20, b=40),
-            plot_bgcolor='white'
+            yaxis_title="Mitigation Cost ($M)"
         )
         
         return fig
@@ -1232,17 +4187,10 @@ def main():
     try:
         print("\n🚀 INITIALIZING ZESTMONEY ANALYTICS PLATFORM...")
         
-        # Initialize the analytics platform
-        analytics = ZestMoneyAnalytics()
-        print("✅ Analytics Platform Initialized")
-        
-        # Create the Dash application
-        print("\n🎛️ CREATING INTERACTIVE DASHBOARD...")
-        app = analytics.create_app()
-        print("✅ Dashboard Created Successfully")
-        
-        # Configure for deployment
-        server = app.server
+        # Build the shared module-level app (the same one gunicorn serves)
+        start = time.perf_counter()
+        app = get_app()
+        print(f"✅ Dashboard Created Successfully in {time.perf_counter() - start:.2f}s")
         
         # Get port from environment variable (Heroku sets this)
         port = int(os.environ.get('PORT', 8050))
@@ -1266,6 +4214,7 @@ def main():
         # Only auto-launch browser in development
         if debug and port == 8050:
             def open_browser():
+                import webbrowser
                 time.sleep(1.5)
                 webbrowser.open_new(f'http://{host}:{port}/')
             
@@ -1302,10 +4251,156 @@ def create_app():
     analytics = ZestMoneyAnalytics()
     return analytics.create_app()
 
-# Create app instance for gunicorn
-analytics_instance = ZestMoneyAnalytics()
-app = analytics_instance.create_app()
-server = app.server
+# The gunicorn entry point (app:server) and main() share one app, built on first access
+_app_lock = threading.Lock()
+
+def get_app():
+    """The module's Dash app, built once and shared by gunicorn and main()"""
+    global analytics_instance, app, server
+    with _app_lock:
+        if 'app' not in globals():
+            analytics_instance = ZestMoneyAnalytics()
+            app = analytics_instance.create_app()
+            server = app.server
+    return globals()['app']
+
+def __getattr__(name):
+    # Importing the module stays cheap; app, server and analytics_instance build lazily
+    if name in ('app', 'server', 'analytics_instance'):
+        get_app()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def ingest_main(argv):
+    """Fold new rows of event files into the ingest state used by the dashboard"""
+    import argparse
+    parser = argparse.ArgumentParser(prog='app.py ingest', description=ingest_main.__doc__)
+    parser.add_argument('paths', nargs='+', help='CSV or Parquet event files')
+    parser.add_argument('--state', default=os.environ.get('INGEST_STATE', 'ingest_state.pkl'))
+    parser.add_argument('--block-mb', type=int, default=64, help='Read block size per chunk')
+    parser.add_argument('--final', action='store_true',
+                        help='Take CSV final lines without a newline now, instead of once the file stops changing')
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    ingest = EventIngest(args.state, block_bytes=args.block_mb << 20)
+    rows = ingest.ingest(args.paths, final=args.final)
+    print(f"✅ Ingested {rows:,} new events in {time.time() - start:.1f}s → {args.state}")
+    if ingest.held_bytes:
+        print(f"⏳ Held back {ingest.held_bytes:,} bytes of final lines without a newline until the next run "
+              f"(or --final)")
+
+# A static host sends extensionless files as octet-stream, but the Dash renderer
+# only accepts JSON from _dash-layout and _dash-dependencies with that content type
+STATIC_FETCH_SHIM = """<script>
+    (function() {
+        var fetch = window.fetch;
+        window.fetch = function(url, options) {
+            if (typeof url === 'string' && /_dash-(layout|dependencies)$/.test(url)) { url += '.json'; }
+            return fetch.call(this, url, options);
+        };
+    })();
+</script>"""
+
+
+def export_static(directory, prefix='/', force=False):
+    """Write the dashboard as static files servable from any host, if the data changed"""
+    import shutil
+    with open(__file__, 'rb') as f:
+        code_version = hashlib.sha1(f.read() + dash.__version__.encode('utf-8')).hexdigest()[:12]
+    # Every tab and graph in the layout, since there is no server to fill them in
+    settings = Settings.from_env(tab_mode='eager', lazy_graphs=False, static_export=True)
+    analytics = ZestMoneyAnalytics(settings=settings)
+    manifest = {'data_version': analytics.data_version, 'code_version': code_version}
+    manifest_path = os.path.join(directory, 'export-manifest.json')
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if {k: v for k, v in json.load(f).items() if k in manifest} == manifest:
+                return None
+
+    app = analytics.create_app(requests_pathname_prefix=prefix)
+    app.index_string = app.index_string.replace('{%renderer%}', STATIC_FETCH_SHIM + '{%renderer%}')
+    client = app.server.test_client()
+    routes = app.config.routes_pathname_prefix
+    brotli_quality = analytics.settings.asset_brotli_quality
+    staging = f'{directory.rstrip(os.sep)}.{os.getpid()}.tmp'
+    files = {}
+
+    def fetch(path):
+        response = client.get(routes + path)
+        if response.status_code != 200:
+            raise RuntimeError(f'{path}: HTTP {response.status_code}')
+        return response.data
+
+    def write(path, body):
+        # Precompressed siblings for hosts that serve them (nginx gzip_static/brotli_static, CDNs)
+        for encoding, data in compress_payload(body, brotli_quality=brotli_quality, gzip_level=9).items():
+            target = os.path.join(staging, path + {'identity': '', 'gzip': '.gz', 'br': '.br'}[encoding])
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(data)
+        files[path] = len(body)
+
+    index = fetch('').decode('utf-8')
+    write('index.html', index.encode('utf-8'))
+    write('_dash-layout.json', fetch('_dash-layout'))
+    dependencies = json.loads(fetch('_dash-dependencies'))
+    write('_dash-dependencies.json', json.dumps([dep for dep in dependencies if dep.get('clientside_function')]).encode('utf-8'))
+    write('_favicon.ico', fetch('_favicon.ico'))
+
+    # Bundles the page references, the async chunks dcc and dash_table load next to
+    # their main bundle under the build stamp compiled into it, and plotly.js, which
+    # the renderer requests unfingerprinted when serving locally
+    suites = '_dash-component-suites/'
+    referenced = {(m.group('package'), m.group('path')) for m in StaticAssets.SUITE_URL.finditer(index)}
+    originals = {(package, check_fingerprint(path)[0]) for package, path in referenced}
+    chunks = {('plotly', 'package_data/plotly.min.js')}
+    for package, path in sorted(referenced):
+        body = fetch(suites + package + '/' + path)
+        write(suites + package + '/' + path, body)
+        folder = os.path.dirname(check_fingerprint(path)[0])
+        for stamp in set(re.findall(rb'"(v[\w-]+m[0-9a-fA-F]+)"', body) if path.endswith('.js') else ()):
+            for registered in app.registered_paths.get(package, ()):
+                if (os.path.dirname(registered) == folder and not registered.endswith('.map')
+                        and (package, registered) not in originals):
+                    name, _, extension = registered.partition('.')
+                    chunks.add((package, f'{name}.{stamp.decode()}.{extension}'))
+    for package, path in sorted(chunks):
+        write(suites + package + '/' + path, fetch(suites + package + '/' + path))
+
+    manifest['files'] = files
+    with open(os.path.join(staging, 'export-manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=1)
+    previous = f'{directory.rstrip(os.sep)}.{os.getpid()}.old'
+    if os.path.exists(directory):
+        os.replace(directory, previous)
+    os.replace(staging, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+    return manifest
+
+
+def export_main(argv):
+    """Render the dashboard into a static bundle (HTML, JSON and JS) for a CDN or static host"""
+    import argparse
+    parser = argparse.ArgumentParser(prog='app.py export', description=export_main.__doc__)
+    parser.add_argument('--out', default=os.environ.get('EXPORT_DIR', 'dist'))
+    parser.add_argument('--prefix', default='/', help='URL path the bundle is served under')
+    parser.add_argument('--force', action='store_true', help='export even if data and code are unchanged')
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    manifest = export_static(args.out, prefix=args.prefix, force=args.force)
+    if manifest is None:
+        print(f"✅ {args.out} is already current (data and code unchanged)")
+    else:
+        total = sum(manifest['files'].values())
+        print(f"✅ Exported {len(manifest['files'])} files ({total / 1e6:.1f} MB) for data version "
+              f"{manifest['data_version']} in {time.time() - start:.1f}s → {args.out}")
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ['ingest']:
+        ingest_main(sys.argv[2:])
+    elif sys.argv[1:2] == ['export']:
+        export_main(sys.argv[2:])
+    else:
+        main()
@@ -0,0 +1,751 @@
+"""Benchmarks for the ZestMoney Analytics Dashboard
+
+    python bench.py payloads [--iterations 50]   tab switch CPU and bytes per serving path
+    python bench.py startup [--runs 5]           cold import and app construction time
+    python bench.py memory [--workers 1 2 4]     per-worker memory under preload-and-fork gunicorn
+    python bench.py suite [--rows 10000 1000000] every chart, tab and tab callback on scaled data,
+                          [--save | --baseline F]  compared against a stored baseline
+    python bench.py load [--users 8 32]          tab-switch throughput and latency against gunicorn,
+                         [--workers 1 2 4]         swept over worker and thread counts
+    python bench.py webgl [--rows 1000 10000]    scatter charts as SVG vs WebGL: build time and bytes,
+                          [--serve [--browser C]]  plus client render times from a browser
+    python bench.py ltv [--users 100000 1000000] LTV/CAC model build and per-date-range query time
+"""
+import argparse
+import http.client
+import http.server
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import random
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import urllib.request
+
+TABS = ['dashboard', 'financial', 'operations', 'strategic', 'customer', 'market', 'risk']
+
+
+def tab_request(tab):
+    """Body the Dash renderer posts when main-tabs changes"""
+    return {
+        'output': 'tab-content-area.children',
+        'outputs': {'id': 'tab-content-area', 'property': 'children'},
+        'inputs': [{'id': 'main-tabs', 'property': 'value', 'value': tab}],
+        'changedPropIds': ['main-tabs.value']
+    }
+
+
+def build_client(payload_store):
+    """Fresh analytics instance and Flask test client in the given mode"""
+    from app import ZestMoneyAnalytics
+
+    os.environ['PAYLOAD_STORE'] = str(payload_store)
+    app = ZestMoneyAnalytics().create_app()
+    return app.server.test_client()
+
+
+def bench_payloads(iterations):
+    """CPU ms and response bytes per tab switch for both serving paths"""
+    results = {}
+    for label, payload_store, accept in [
+        ('dash callback', False, 'identity'),
+        ('payload store', True, 'gzip, deflate, br')
+    ]:
+        client = build_client(payload_store)
+        for tab in TABS:
+            # Warm caches so only steady-state tab switches are measured
+            client.post('/_dash-update-component', json=tab_request(tab), headers={'Accept-Encoding': accept})
+            start = time.process_time()
+            for _ in range(iterations):
+                response = client.post('/_dash-update-component', json=tab_request(tab),
+                                       headers={'Accept-Encoding': accept})
+            cpu_ms = (time.process_time() - start) * 1000 / iterations
+            results[(label, tab)] = (cpu_ms, len(response.data), response.headers.get('Content-Encoding', 'identity'))
+    return results
+
+
+STARTUP_PROBE = """
+import time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.server
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def bench_startup(runs):
+    """Cold-start timings from fresh interpreters, plus the heaviest imports"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    imports, builds, totals = [], [], []
+    import_times = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        probe = subprocess.run([sys.executable, '-X', 'importtime', '-c', STARTUP_PROBE],
+                               cwd=here, capture_output=True, text=True, check=True)
+        totals.append(time.perf_counter() - start)
+        import_seconds, build_seconds = map(float, probe.stdout.split())
+        imports.append(import_seconds)
+        builds.append(build_seconds)
+        for line in probe.stderr.splitlines():
+            # "import time: self [us] | cumulative | <indented module name>"
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            _, cumulative, name = line.split('|')
+            if cumulative.strip().isdigit() and len(name) - len(name.lstrip()) <= 3:
+                import_times.setdefault(name.strip(), []).append(int(cumulative) / 1e6)
+    heaviest = sorted(((statistics.median(v), k) for k, v in import_times.items()), reverse=True)
+    return statistics.median(imports), statistics.median(builds), statistics.median(totals), heaviest[:10]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(workers, threads, port, extra_env=None):
+    """Launch gunicorn app:server with gunicorn.conf.py and wait until it answers"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PORT=str(port), WEB_CONCURRENCY=str(workers), WEB_THREADS=str(threads),
+               PAYLOAD_FILE=os.path.join(here, f'.bench-payloads-{port}.bin'), **(extra_env or {}))
+    process = subprocess.Popen([sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'app:server'],
+                               cwd=here, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/_dash-layout', timeout=1).read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('gunicorn did not start within 60s')
+
+
+def stop_gunicorn(process, port):
+    """Shut down a start_gunicorn server and remove its payload file"""
+    process.terminate()
+    process.wait()
+    payload_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), f'.bench-payloads-{port}.bin')
+    if os.path.exists(payload_file):
+        os.remove(payload_file)
+
+
+def post_tab(port, tab, timeout=30):
+    request = urllib.request.Request(
+        f'http://127.0.0.1:{port}/_dash-update-component',
+        data=json.dumps(tab_request(tab)).encode('utf-8'),
+        headers={'Content-Type': 'application/json', 'Accept-Encoding': 'br, gzip'}
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+def memory_kb(pid):
+    """Pss and private (unshared) memory of a process, in kB"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('Pss', 'Private_Clean', 'Private_Dirty'):
+                values[key] = int(rest.split()[0])
+    return values['Pss'], values['Private_Clean'] + values['Private_Dirty']
+
+
+def bench_memory(worker_counts, requests_per_tab):
+    """Average Pss/private memory per worker after serving every tab, for each worker count"""
+    results = []
+    for workers in worker_counts:
+        port = free_port()
+        process = start_gunicorn(workers, 2, port)
+        try:
+            for _ in range(requests_per_tab * workers):
+                for tab in TABS:
+                    post_tab(port, tab)
+            with open(f'/proc/{process.pid}/task/{process.pid}/children') as f:
+                worker_pids = [int(pid) for pid in f.read().split()]
+            samples = [memory_kb(pid) for pid in worker_pids]
+            results.append((workers, memory_kb(process.pid),
+                            statistics.mean(pss for pss, _ in samples),
+                            statistics.mean(private for _, private in samples)))
+        finally:
+            stop_gunicorn(process, port)
+    return results
+
+
+# Relative odds of switching to each tab: analysts keep coming back to the overview
+TAB_WEIGHTS = {'dashboard': 3, 'financial': 2, 'operations': 2, 'strategic': 1,
+               'customer': 1, 'market': 1, 'risk': 1}
+
+
+def tab_sequence(seed):
+    """Endless sequence of tab switches for one simulated analyst (never the same tab twice running)"""
+    rng = random.Random(seed)
+    tab = 'dashboard'
+    while True:
+        choices = [t for t in TABS if t != tab]
+        tab = rng.choices(choices, weights=[TAB_WEIGHTS[t] for t in choices])[0]
+        yield tab
+
+
+def run_analyst(port, seed, deadline, think_seconds, samples, timeout):
+    """Switch tabs over one keep-alive connection until the deadline, recording (tab, seconds, ok)"""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    rng = random.Random(seed)
+    for tab in tab_sequence(seed):
+        if time.time() >= deadline:
+            break
+        body = json.dumps(tab_request(tab)).encode('utf-8')
+        start = time.perf_counter()
+        try:
+            connection.request('POST', '/_dash-update-component', body=body,
+                               headers={'Content-Type': 'application/json', 'Accept-Encoding': 'br, gzip'})
+            response = connection.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            ok = False
+            connection.close()
+        samples.append((tab, time.perf_counter() - start, ok))
+        if think_seconds:
+            time.sleep(rng.expovariate(1 / think_seconds))
+    connection.close()
+
+
+def run_analysts(port, seeds, deadline, think_seconds, timeout):
+    """One client process: a thread per analyst, returning all their samples"""
+    samples = []
+    analysts = [threading.Thread(target=run_analyst, args=(port, seed, deadline, think_seconds, samples, timeout))
+                for seed in seeds]
+    for analyst in analysts:
+        analyst.start()
+    for analyst in analysts:
+        analyst.join()
+    return samples
+
+
+def percentiles(latencies):
+    """p50, p95 and p99 of a list of seconds, in ms"""
+    if len(latencies) < 2:
+        return (latencies[0] * 1000,) * 3 if latencies else (0.0,) * 3
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+def bench_load(worker_counts, thread_counts, user_counts, duration, think_seconds, extra_env=None):
+    """Throughput and per-tab latency percentiles for every workers x threads x users combination
+
+    Each simulated analyst holds a keep-alive connection and switches tabs
+    with exponentially distributed think time between switches (none by
+    default, for peak throughput). Failed requests and timeouts count as
+    errors and are left out of the latency figures.
+    """
+    timeout = int((extra_env or {}).get('WEB_TIMEOUT', os.environ.get('WEB_TIMEOUT', 30)))
+    results = []
+    for workers in worker_counts:
+        for threads in thread_counts:
+            port = free_port()
+            process = start_gunicorn(workers, threads, port, extra_env)
+            try:
+                for tab in TABS:
+                    post_tab(port, tab)
+                for users in user_counts:
+                    # Analysts are spread over client processes so the load generator's
+                    # own GIL does not cap the request rate
+                    clients = min(users, os.cpu_count() or 1)
+                    deadline = time.time() + duration
+                    with ProcessPoolExecutor(clients) as pool:
+                        batches = pool.map(run_analysts, [port] * clients,
+                                           [range(i, users, clients) for i in range(clients)],
+                                           [deadline] * clients, [think_seconds] * clients, [timeout] * clients)
+                        samples = [sample for batch in batches for sample in batch]
+                    per_tab = {tab: percentiles([s for t, s, ok in samples if ok and t == tab]) for tab in TABS}
+                    latencies = [s for _, s, ok in samples if ok]
+                    results.append({
+                        'workers': workers, 'threads': threads, 'users': users,
+                        'rps': len(latencies) / duration,
+                        'errors': sum(1 for _, _, ok in samples if not ok),
+                        'max_ms': max(latencies, default=0) * 1000,
+                        'overall': percentiles(latencies),
+                        'per_tab': per_tab
+                    })
+            finally:
+                stop_gunicorn(process, port)
+    return results, timeout
+
+
+# The seven-year series; the other datasets are small category tables and stay as they are
+TIMESERIES_DATASETS = ('financial', 'operational')
+
+
+def synthetic_datasets(rows, seed=0, segments=False):
+    """Sample datasets with the year-indexed series resampled to `rows` rows
+
+    Each column is interpolated over the same span of years, with a little
+    deterministic noise so downsampling has real shape to preserve. With
+    segments, the other datasets are also repeated to `rows` rows, with
+    numbered names and jittered values.
+    """
+    import numpy as np
+    from app import SAMPLE_DATA
+
+    rng = np.random.default_rng(seed)
+    datasets = dict(SAMPLE_DATA)
+    for name in TIMESERIES_DATASETS:
+        columns = SAMPLE_DATA[name]
+        years = np.asarray(columns['year'], dtype=np.float64)
+        x = np.linspace(years[0], years[-1], rows)
+        datasets[name] = {'year': x}
+        for column, values in columns.items():
+            if column != 'year':
+                series = np.interp(x, years, np.asarray(values, dtype=np.float64))
+                datasets[name][column] = series * rng.normal(1, 0.02, rows)
+    if segments:
+        for name, columns in SAMPLE_DATA.items():
+            if name in TIMESERIES_DATASETS:
+                continue
+            datasets[name] = {}
+            for column, values in columns.items():
+                values = np.asarray(values)
+                index = np.arange(rows) % len(values)
+                if values.dtype.kind in 'iuf':
+                    datasets[name][column] = values[index] * rng.normal(1, 0.05, rows)
+                else:
+                    datasets[name][column] = np.array([f"{values[i]} {n // len(values) + 1}"
+                                                       for n, i in enumerate(index)])
+    return datasets
+
+
+def measure(func, repeat):
+    """Median wall ms over `repeat` calls, peak traced allocation in kB, and the last result"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(timings), peak / 1024, result
+
+
+def bench_suite(scales, repeat, match=None):
+    """Time, peak allocation and serialized bytes of every chart, tab builder and tab callback
+
+    Each scale is 'sample' (the built-in data) or a row count for
+    synthetic_datasets. Caches are dropped before every call so each
+    measurement is a cold build.
+    """
+    from plotly.io.json import to_json_plotly
+    from app import ZestMoneyAnalytics, InlineDataSource
+
+    os.environ['PAYLOAD_STORE'] = 'False'
+    os.environ['TAB_MODE'] = 'server'
+    results = {}
+    for scale in scales:
+        source = InlineDataSource()
+        if scale != 'sample':
+            source = InlineDataSource(synthetic_datasets(int(scale)), fallback=source)
+        analytics = ZestMoneyAnalytics(data_source=source)
+        client = analytics.create_app().server.test_client()
+
+        def cold(builder):
+            def build():
+                analytics.invalidate_cache()
+                return builder()
+            return build
+
+        def callback(tab):
+            analytics.invalidate_cache()
+            return client.post('/_dash-update-component', json=tab_request(tab)).data
+
+        cases = [(f'chart:{name}', cold(lambda name=name: analytics.build_figure(name)), to_json_plotly)
+                 for name in analytics.chart_builders]
+        cases += [(f'tab:{tab}', cold(builder), to_json_plotly)
+                  for tab, builder in analytics.tab_builders.items()]
+        cases += [(f'callback:{tab}', lambda tab=tab: callback(tab), bytes)
+                  for tab in analytics.tab_builders]
+        for name, func, serialize in cases:
+            key = f'{scale}/{name}'
+            if match and match not in key:
+                continue
+            ms, peak_kb, result = measure(func, repeat)
+            results[key] = {'ms': ms, 'peak_kb': peak_kb, 'bytes': len(serialize(result))}
+    return results
+
+
+def scatter_points(figure):
+    """Points in the largest scatter trace of a figure dict, or 0 without one"""
+    import numpy as np
+
+    return max((np.size(trace.get('x') if trace.get('x') is not None else trace.get('y'))
+                for trace in figure.to_plotly_json()['data'] if trace['type'] in ('scatter', 'scattergl')),
+               default=0)
+
+
+def bench_webgl(scales, repeat):
+    """Server build ms and payload bytes of each scatter chart drawn as SVG and as WebGL
+
+    Datasets (including the categorical ones) are scaled to each row count
+    and downsampling is off, so every point reaches the figure. Returns the
+    measurements and, per case, the SVG figure for the render page.
+    """
+    import gzip
+    from plotly.io.json import to_json_plotly
+    from app import ZestMoneyAnalytics, InlineDataSource
+
+    sample = ZestMoneyAnalytics()
+    sample.settings.webgl_threshold = 0
+    sample_points = {chart: scatter_points(builder()) for chart, builder in sample.chart_builders.items()}
+    results = []
+    for rows in scales:
+        source = InlineDataSource(synthetic_datasets(rows, segments=True), fallback=InlineDataSource())
+        analytics = ZestMoneyAnalytics(data_source=source)
+        analytics.settings.downsample_points = rows
+        threshold = analytics.settings.webgl_threshold
+        for chart, builder in analytics.chart_builders.items():
+            analytics.settings.webgl_threshold = 0
+            points = scatter_points(builder())
+            # Only charts whose scatter traces grow with the data
+            if points <= sample_points[chart]:
+                continue
+            row = {'rows': rows, 'chart': chart, 'points': int(points),
+                   'auto': 'webgl' if threshold and points > threshold else 'svg'}
+            for renderer, setting in (('svg', 0), ('webgl', 1)):
+                analytics.settings.webgl_threshold = setting
+                ms, _, figure = measure(lambda: analytics.build_figure(chart), repeat)
+                body = to_json_plotly(figure).encode('utf-8')
+                row[renderer] = {'ms': ms, 'bytes': len(body), 'gzip_bytes': len(gzip.compress(body, 6))}
+                if renderer == 'svg':
+                    row['figure'] = figure
+            results.append(row)
+    return results
+
+
+def bench_ltv(user_counts, repeat, seed=0):
+    """Build seconds of the LTV/CAC model and ms per date-range query, per user count
+
+    Sample users, transactions and spend are generated over three years at
+    each size (about nine transactions per user). Queries cover the whole
+    range, one year and one month.
+    """
+    from app import UnitEconomics, sample_unit_economics
+
+    results = []
+    for users in user_counts:
+        tables = sample_unit_economics(users=users, months=36, seed=seed)
+        start = time.perf_counter()
+        model = UnitEconomics(tables['users'], tables['transactions'], tables['marketing_spend'])
+        row = {'users': users, 'transactions': len(tables['transactions']['user_id']),
+               'build_s': time.perf_counter() - start}
+        for label, start_date, end_date in (('all', None, None), ('year', '2024-01-01', '2024-12-31'),
+                                            ('month', '2024-06-01', '2024-06-30')):
+            row[label + '_ms'] = measure(lambda: model.summary(start_date, end_date), repeat)[0]
+        results.append(row)
+    return results
+
+
+def write_render_page(path, results, repeat):
+    """Self-contained page timing Plotly.newPlot of each case as scatter and scattergl
+
+    Figures are the compact ones the app sends, decoded by the app's own
+    figure shim, and each timing runs until the second animation frame
+    after newPlot resolves, so it includes the browser's paint. When the
+    page is served over HTTP it posts the timings back to /results.
+    """
+    from plotly.io.json import to_json_plotly
+    from plotly.offline import get_plotlyjs
+    from app import figure_shim
+
+    cases = [{'name': f"{row['rows']}/{row['chart']}", 'points': row['points'], 'auto': row['auto'],
+              'figure': row['figure']} for row in results]
+    cases = to_json_plotly(cases).replace('</', '<\\/')
+    page = f"""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Scatter render time</title>
+<style>body {{ font-family: sans-serif; }} td, th {{ padding: 2px 12px; text-align: right; }}</style>
+</head>
+<body>
+{figure_shim()}
+<script>{get_plotlyjs()}</script>
+<h3>Plotly.newPlot to paint, median of {repeat} (ms)</h3>
+<table><thead><tr><th>case</th><th>points</th><th>svg</th><th>webgl</th><th>app picks</th></tr></thead>
+<tbody id="results"></tbody></table>
+<div id="plot" style="width: 900px; height: 450px;"></div>
+<script>
+var CASES = {cases};
+function frames() {{
+    return new Promise(function(resolve) {{ requestAnimationFrame(function() {{ requestAnimationFrame(resolve); }}); }});
+}}
+async function renderMs(figure, type) {{
+    var plot = document.getElementById('plot'), times = [];
+    var data = figure.data.map(function(trace) {{
+        return trace.type === 'scatter' || trace.type === 'scattergl' ? Object.assign({{}}, trace, {{type: type}}) : trace;
+    }});
+    for (var i = 0; i < {repeat}; i++) {{
+        Plotly.purge(plot);
+        await frames();
+        var start = performance.now();
+        await Plotly.newPlot(plot, data, figure.layout);
+        await frames();
+        times.push(performance.now() - start);
+    }}
+    Plotly.purge(plot);
+    times.sort(function(a, b) {{ return a - b; }});
+    return times[Math.floor(times.length / 2)];
+}}
+(async function() {{
+    window.benchResults = [];
+    for (var c of CASES) {{
+        var result = {{name: c.name, points: c.points, auto: c.auto,
+                      svg: await renderMs(c.figure, 'scatter'), webgl: await renderMs(c.figure, 'scattergl')}};
+        window.benchResults.push(result);
+        var row = document.createElement('tr');
+        row.innerHTML = '<td>' + [result.name, result.points, result.svg.toFixed(1),
+                                  result.webgl.toFixed(1), result.auto].join('</td><td>') + '</td>';
+        document.getElementById('results').appendChild(row);
+    }}
+    document.title = 'Scatter render time: done';
+    if (location.protocol.indexOf('http') === 0) {{
+        fetch('/results', {{method: 'POST', body: JSON.stringify(window.benchResults)}});
+    }}
+}})();
+</script>
+</body>
+</html>
+"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(page)
+
+
+def serve_render_page(path, browser=None, timeout=600):
+    """Serve the render page on localhost and return the timings it posts back
+
+    With `browser` (a command line, e.g. "chromium --headless=new") the page
+    is opened there and the browser is closed afterwards; otherwise the URL
+    is printed for any browser to open. Returns None on timeout.
+    """
+    received = {}
+    done = threading.Event()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            with open(path, 'rb') as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            received['results'] = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            self.send_response(204)
+            self.end_headers()
+            done.set()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', free_port()), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/'
+    process = None
+    if browser:
+        process = subprocess.Popen(shlex.split(browser) + [url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        print(f"Waiting for client render times: open {url} in a browser")
+    try:
+        done.wait(timeout)
+    finally:
+        server.shutdown()
+        server.server_close()
+        if process is not None:
+            process.terminate()
+            process.wait()
+    return received.get('results')
+
+
+def compare_to_baseline(results, baseline, tolerance, min_ms):
+    """Names of measurements that grew by more than `tolerance` over the baseline
+
+    Timings also have to grow by at least `min_ms`, so sub-millisecond
+    jitter is not reported.
+    """
+    regressions = {}
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        grown = [metric for metric in ('ms', 'peak_kb', 'bytes')
+                 if current[metric] > previous[metric] * (1 + tolerance)
+                 and (metric != 'ms' or current[metric] - previous[metric] >= min_ms)]
+        if grown:
+            regressions[key] = grown
+    return regressions
+
+
+def print_payloads(iterations):
+    results = bench_payloads(iterations)
+
+    print(f"{'tab':<12}{'dash cpu ms':>14}{'dash bytes':>12}{'store cpu ms':>15}{'store bytes':>13}{'encoding':>10}")
+    for tab in TABS:
+        dash_ms, dash_bytes, _ = results[('dash callback', tab)]
+        store_ms, store_bytes, encoding = results[('payload store', tab)]
+        print(f"{tab:<12}{dash_ms:>14.2f}{dash_bytes:>12,}{store_ms:>15.2f}{store_bytes:>13,}{encoding:>10}")
+
+
+def print_startup(runs):
+    import_seconds, build_seconds, total_seconds, heaviest = bench_startup(runs)
+    print(f"import app:        {import_seconds * 1000:8.0f} ms")
+    print(f"build app/server:  {build_seconds * 1000:8.0f} ms")
+    print(f"process cold start:{total_seconds * 1000:8.0f} ms  (median of {runs})")
+    print("\nheaviest imports (cumulative ms):")
+    for seconds, name in heaviest:
+        print(f"  {seconds * 1000:8.1f}  {name}")
+
+
+def print_memory(worker_counts, requests_per_tab):
+    print(f"{'workers':>8}{'master pss MB':>15}{'worker pss MB':>15}{'worker private MB':>19}")
+    for workers, (master_pss, _), worker_pss, worker_private in bench_memory(worker_counts, requests_per_tab):
+        print(f"{workers:>8}{master_pss / 1024:>15.1f}{worker_pss / 1024:>15.1f}{worker_private / 1024:>19.1f}")
+
+
+def print_suite(args):
+    results = bench_suite(['sample'] + args.rows, args.repeat, args.match)
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_ms)
+
+    print(f"{'benchmark':<40}{'ms':>10}{'peak kB':>12}{'bytes':>13}{'vs baseline':>13}")
+    for key, current in results.items():
+        previous = baseline.get(key)
+        change = f"{(current['ms'] / previous['ms'] - 1) * 100:+.0f}%" if previous and previous['ms'] else ''
+        flag = '  REGRESSED: ' + ', '.join(regressions[key]) if key in regressions else ''
+        print(f"{key:<40}{current['ms']:>10.2f}{current['peak_kb']:>12,.0f}{current['bytes']:>13,}{change:>13}{flag}")
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        print(f"\nSaved {len(results)} measurements to {args.baseline}")
+    elif baseline:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline} "
+              f"(tolerance {args.tolerance:.0%}, at least {args.min_ms} ms for timings)")
+    return 1 if regressions else 0
+
+
+def print_load(args):
+    extra_env = dict(item.split('=', 1) for item in args.env)
+    results, timeout = bench_load(args.workers, args.threads, args.users, args.duration, args.think, extra_env)
+    print(f"{'workers':>8}{'threads':>8}{'users':>7}{'req/s':>9}{'errors':>8}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for row in results:
+        p50, p95, p99 = row['overall']
+        warning = '  near worker timeout' if row['max_ms'] >= timeout * 1000 * 0.5 else ''
+        print(f"{row['workers']:>8}{row['threads']:>8}{row['users']:>7}{row['rps']:>9.1f}{row['errors']:>8}"
+              f"{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}{row['max_ms']:>9.1f}{warning}")
+        if args.per_tab:
+            for tab, (p50, p95, p99) in row['per_tab'].items():
+                print(f"{tab:>39}{p50:>17.1f}{p95:>9.1f}{p99:>9.1f}")
+
+
+def print_webgl(args):
+    results = bench_webgl(args.rows, args.repeat)
+    print(f"{'chart':<32}{'points':>9}{'svg ms':>9}{'gl ms':>9}{'svg bytes':>12}{'gl bytes':>12}"
+          f"{'svg gzip':>10}{'gl gzip':>10}  picks")
+    for row in results:
+        svg, gl = row['svg'], row['webgl']
+        print(f"{row['rows']}/{row['chart']:<{31 - len(str(row['rows']))}}{row['points']:>9,}"
+              f"{svg['ms']:>9.1f}{gl['ms']:>9.1f}{svg['bytes']:>12,}{gl['bytes']:>12,}"
+              f"{svg['gzip_bytes']:>10,}{gl['gzip_bytes']:>10,}  {row['auto']}")
+    write_render_page(args.page, results, args.render_repeat)
+    if not args.serve:
+        print(f"\nClient render times: open {args.page} in a browser, or rerun with --serve")
+        return
+    print()
+    renders = serve_render_page(args.page, args.browser, args.timeout)
+    if renders is None:
+        print(f"No client render times within {args.timeout:.0f}s")
+        return
+    print(f"{'chart':<32}{'points':>9}{'svg render ms':>15}{'gl render ms':>14}  picks")
+    for row in renders:
+        print(f"{row['name']:<32}{row['points']:>9,}{row['svg']:>15.1f}{row['webgl']:>14.1f}  {row['auto']}")
+
+
+def print_ltv(args):
+    print(f"{'users':>12}{'transactions':>14}{'build s':>9}{'all ms':>9}{'year ms':>9}{'month ms':>10}")
+    for row in bench_ltv(args.users, args.repeat):
+        print(f"{row['users']:>12,}{row['transactions']:>14,}{row['build_s']:>9.2f}"
+              f"{row['all_ms']:>9.1f}{row['year_ms']:>9.1f}{row['month_ms']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command')
+    payloads = commands.add_parser('payloads', help='tab switch CPU and bytes per serving path')
+    payloads.add_argument('--iterations', type=int, default=50)
+    startup = commands.add_parser('startup', help='cold import and app construction time')
+    startup.add_argument('--runs', type=int, default=5)
+    memory = commands.add_parser('memory', help='per-worker memory under preload-and-fork gunicorn')
+    memory.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    memory.add_argument('--requests', type=int, default=20, help='requests per tab per worker')
+    suite = commands.add_parser('suite', help='every chart, tab and tab callback against a baseline')
+    suite.add_argument('--rows', type=int, nargs='*', default=[10000, 1000000],
+                       help='synthetic dataset sizes, run after the sample data')
+    suite.add_argument('--repeat', type=int, default=3, help='timed calls per benchmark (median reported)')
+    suite.add_argument('--match', help='only run benchmarks whose name contains this')
+    suite.add_argument('--baseline', default='bench-baseline.json')
+    suite.add_argument('--save', action='store_true', help='write the results as the new baseline')
+    suite.add_argument('--tolerance', type=float, default=0.25, help='allowed growth over the baseline')
+    suite.add_argument('--min-ms', type=float, default=1.0, help='ignore timing changes smaller than this')
+    load = commands.add_parser('load', help='tab-switch throughput and latency against gunicorn')
+    load.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    load.add_argument('--threads', type=int, nargs='+', default=[2, 4])
+    load.add_argument('--users', type=int, nargs='+', default=[8, 32], help='concurrent simulated analysts')
+    load.add_argument('--duration', type=float, default=15, help='seconds per run')
+    load.add_argument('--think', type=float, default=0, help='mean seconds between tab switches')
+    load.add_argument('--per-tab', action='store_true', help='also print percentiles for each tab')
+    load.add_argument('--env', nargs='*', default=[], metavar='KEY=VALUE',
+                      help='extra server settings, e.g. PAYLOAD_STORE=False')
+    webgl = commands.add_parser('webgl', help='scatter charts as SVG vs WebGL: server cost and a client render page')
+    webgl.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000])
+    webgl.add_argument('--repeat', type=int, default=3, help='timed builds per chart (median reported)')
+    webgl.add_argument('--page', default='webgl-bench.html', help='where to write the client render page')
+    webgl.add_argument('--render-repeat', type=int, default=5, help='timed renders per case in the page')
+    webgl.add_argument('--serve', action='store_true', help='serve the page locally and print the render times it reports')
+    webgl.add_argument('--browser', help='command that opens the served page, e.g. "chromium --headless=new"')
+    webgl.add_argument('--timeout', type=float, default=600, help='seconds to wait for render times with --serve')
+    ltv = commands.add_parser('ltv', help='LTV/CAC model build and per-date-range query time')
+    ltv.add_argument('--users', type=int, nargs='+', default=[100000, 1000000, 3000000])
+    ltv.add_argument('--repeat', type=int, default=5, help='timed queries per range (median reported)')
+    args = parser.parse_args()
+
+    if args.command == 'startup':
+        print_startup(args.runs)
+    elif args.command == 'memory':
+        print_memory(args.workers, args.requests)
+    elif args.command == 'suite':
+        sys.exit(print_suite(args))
+    elif args.command == 'load':
+        print_load(args)
+    elif args.command == 'webgl':
+        print_webgl(args)
+    elif args.command == 'ltv':
+        print_ltv(args)
+    else:
+        print_payloads(getattr(args, 'iterations', 50))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Gunicorn configuration for the ZestMoney Analytics Dashboard
+
+The app is preloaded in the master: data, tab layouts and serialized tab
+payloads are built once and written to a memory-mapped payload file, then
+workers are forked and share those pages copy-on-write instead of each
+building and holding their own copy.
+
+Workers write metric snapshots to METRICS_DIR, so /metrics on any worker
+reports the totals of all of them.
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8050')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('WEB_THREADS', 2))
+timeout = int(os.environ.get('WEB_TIMEOUT', 30))
+preload_app = True
+
+# Read by app.TELEMETRY on import, so it has to be set before the app is preloaded
+os.environ.setdefault('METRICS_DIR', '/tmp/zestmoney-metrics')
+
+
+def on_starting(server):
+    """Drop metric snapshots left behind by a previous run"""
+    directory = os.environ['METRICS_DIR']
+    if os.path.isdir(directory):
+        for filename in os.listdir(directory):
+            os.remove(os.path.join(directory, filename))
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded, before any worker forks"""
+    import app
+
+    payload_file = os.environ.get('PAYLOAD_FILE', '/tmp/zestmoney-payloads.bin')
+    app.analytics_instance.write_payload_file(payload_file)
+    server.log.info("Prebuilt tab payloads for data version %s in %s",
+                    app.analytics_instance.data_version, payload_file)
+
+    # Chart build times from the prebuild above; workers report only their own requests
+    app.TELEMETRY.flush()
+
+    # Keep the collector from touching (and so copying) the prebuilt objects in workers
+    gc.freeze()
@@ -0,0 +1,119 @@
+import numpy as np
+
+import app
+from app import CohortEngine, cohort_ages
+
+
+def sample_events(users, first_month=2023 * 12, months=12, first_user=0, seed=0):
+    """Parallel arrays of signup, activity and default events, in month order per user"""
+    rng = np.random.default_rng(seed)
+    signup = first_month + rng.integers(0, months, users)
+    active = rng.integers(0, 6, users)
+    user = np.concatenate([np.arange(users), np.repeat(np.arange(users), active), rng.integers(0, users, users // 5)])
+    month = np.concatenate([signup, np.repeat(signup, active), signup[user[-(users // 5):]]])
+    event = np.array(['user_signup'] * users + ['user_active'] * int(active.sum()) + ['default'] * (users // 5))
+    month = np.minimum(month + rng.integers(0, 4, len(month)) * (event != 'user_signup'), first_month + months - 1)
+    order = np.argsort(month, kind='stable')
+    hashes = (user.astype(np.uint64) + np.uint64(first_user + 1)) * np.uint64(0x9E3779B97F4A7C15)
+    return month[order], event[order], hashes[order], np.round(rng.random(len(month)) * 20_000, 2)[order]
+
+
+def naive(months, events, hashes, amounts):
+    """Cohort matrices recomputed from scratch, one user at a time"""
+    first = int(months.min())
+    size = int(months.max()) - first + 1
+    cohort_size = np.zeros(size, dtype=np.int64)
+    retained = np.zeros((size, size), dtype=np.int64)
+    defaults = np.zeros((size, size), dtype=np.int64)
+    default_amount = np.zeros((size, size))
+    for user in np.unique(hashes):
+        mine = hashes == user
+        signups = months[mine & (events == 'user_signup')]
+        cohort = (signups.min() if len(signups) else months[mine].min()) - first
+        cohort_size[cohort] += 1
+        for month in np.unique(months[mine & np.isin(events, ('user_signup', 'user_active'))]):
+            retained[cohort, month - first] += 1
+        for month, amount in zip(months[mine & (events == 'default')], amounts[mine & (events == 'default')]):
+            defaults[cohort, month - first] += 1
+            default_amount[cohort, month - first] += amount
+    return first, cohort_size, retained, defaults, default_amount
+
+
+def assert_matches(engine, expected):
+    first, cohort_size, retained, defaults, default_amount = expected
+    # The engine may cover more months than these events; compare the part they cover
+    offset = first - engine.first_month
+    window = slice(offset, offset + len(cohort_size))
+    assert offset >= 0
+    np.testing.assert_array_equal(engine.cohort_size[window], cohort_size)
+    np.testing.assert_array_equal(engine.retained[window, window], retained)
+    np.testing.assert_array_equal(engine.defaults[window, window], defaults)
+    np.testing.assert_allclose(engine.default_amount[window, window], default_amount)
+
+
+def test_one_shot_matches_a_recompute(tmp_path):
+    events = sample_events(2_000)
+    engine = CohortEngine(str(tmp_path / 'cohorts.npz'))
+    engine.update(*events)
+    assert_matches(engine, naive(*events))
+
+
+def test_monthly_chunks_match_one_shot(tmp_path):
+    months, events, hashes, amounts = sample_events(2_000, seed=1)
+    path = str(tmp_path / 'cohorts.npz')
+    for month in np.unique(months):
+        engine = CohortEngine(path)
+        in_month = months == month
+        engine.update(months[in_month], events[in_month], hashes[in_month], amounts[in_month])
+        engine.save()
+    assert_matches(CohortEngine(path), naive(months, events, hashes, amounts))
+
+
+def test_chunks_that_reach_back_before_the_first_month(tmp_path):
+    # Later users first, then a file of other users that starts six months earlier
+    later = sample_events(1_000, first_month=2024 * 12, months=6, seed=2)
+    earlier = sample_events(1_000, first_month=2023 * 12 + 6, months=12, first_user=1_000, seed=3)
+    path = str(tmp_path / 'cohorts.npz')
+    for chunk in (later, earlier):
+        engine = CohortEngine(path)
+        engine.update(*chunk)
+        engine.save()
+
+    engine = CohortEngine(path)
+    assert engine.first_month == 2023 * 12 + 6
+    combined = tuple(np.concatenate(arrays) for arrays in zip(later, earlier))
+    assert_matches(engine, naive(*combined))
+
+
+def test_saved_dataset_has_month_labels(tmp_path):
+    path = str(tmp_path / 'cohorts.npz')
+    engine = CohortEngine(path)
+    engine.update(*sample_events(200, first_month=2024 * 12 + 10, months=3))
+    engine.save()
+    dataset = CohortEngine.read_dataset(path)
+    assert dataset['month'] == ['2024-11', '2024-12', '2025-01']
+    np.testing.assert_array_equal(dataset['retained'], engine.retained)
+
+
+def test_cohort_ages_shift_rows_to_months_since_signup():
+    matrix = np.array([[10, 5, 2], [0, 8, 4], [0, 0, 6]])
+    aged = cohort_ages(matrix)
+    np.testing.assert_array_equal(aged[:, 0], [10, 8, 6])
+    assert aged[0, 2] == 2 and aged[1, 1] == 4
+    assert np.isnan(aged[1, 2]) and np.isnan(aged[2, 1])
+
+
+def test_events_without_cohort_meaning_are_ignored(tmp_path):
+    engine = CohortEngine(str(tmp_path / 'cohorts.npz'))
+    engine.update(np.array([2024 * 12, 2024 * 12]), np.array(['repayment', 'user_churn']),
+                  np.array([1, 2], dtype=np.uint64), np.zeros(2))
+    assert len(engine.cohort_size) == 0
+
+
+def test_sample_cohorts_are_generated_on_first_load():
+    assert 'cohorts' not in app.SAMPLE_DATA
+    dataset = app.InlineDataSource().load('cohorts')
+    np.testing.assert_array_equal(dataset['retained'], app.sample_cohorts()['retained'])
+    assert dataset['month'][0] == '2023-07'
+    assert app.InlineDataSource({'risk': {}}).load('cohorts') is None
+    assert app.InlineDataSource({}, fallback=app.InlineDataSource()).load('cohorts')['month'] == dataset['month']
@@ -0,0 +1,104 @@
+import base64
+import json
+import shutil
+import subprocess
+
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+from plotly.io.json import to_json_plotly
+
+from app import FIGURE_SHIM, FIGURE_TEMPLATE, compact_figure, encode_arrays, typed_array
+
+
+def decode(spec):
+    """Values of a typed-array spec, read back the way the browser shim does"""
+    values = np.frombuffer(base64.b64decode(spec['bdata']), dtype='<' + spec['dtype'])
+    if 'shape' in spec:
+        values = values.reshape([int(size) for size in spec['shape'].split(',')])
+    return values
+
+
+@pytest.mark.parametrize('values, dtype', [
+    (np.array([-128, 0, 127]), 'i1'),
+    (np.array([0, 200, 255]), 'u1'),
+    (np.array([-30_000, 5, 30_000]), 'i2'),
+    (np.array([0, 65_535]), 'u2'),
+    (np.array([-2 ** 31, 2 ** 31 - 1]), 'i4'),
+    (np.array([0, 2 ** 32 - 1], dtype=np.uint64), 'u4'),
+    (np.array([0, 2 ** 40]), 'f8'),
+    (np.array([1.0, 2.0, 300.0]), 'i2'),
+    (np.array([0.5, -1.25, 1e300]), 'f8'),
+    (np.array([1.0, np.nan, np.inf, -np.inf]), 'f8'),
+    (np.array([], dtype=np.float64), 'i1'),
+])
+def test_typed_array_round_trips_in_the_narrowest_exact_dtype(values, dtype):
+    spec = typed_array(values)
+    assert spec['dtype'] == dtype
+    np.testing.assert_array_equal(decode(spec), values)
+
+
+def test_typed_array_keeps_the_shape_of_a_matrix():
+    matrix = np.arange(12, dtype=np.float64).reshape(3, 4) / 4
+    spec = typed_array(matrix)
+    assert spec['shape'] == '3,4'
+    np.testing.assert_array_equal(decode(spec), matrix)
+
+
+def test_encode_arrays_only_encodes_long_numeric_arrays():
+    numbers = list(range(40))
+    trace = {
+        'x': numbers,
+        'y': numbers[:10],
+        'text': [str(n) for n in numbers],
+        'customdata': [1, 'a'] * 20,
+        'ids': [None] + numbers[1:],
+        'marker': {'color': np.linspace(0, 1, 40), 'size': 8},
+        'name': 'revenue'
+    }
+    encoded = encode_arrays(trace)
+    np.testing.assert_array_equal(decode(encoded['x']), numbers)
+    np.testing.assert_array_equal(decode(encoded['marker']['color']), np.linspace(0, 1, 40))
+    for key in ('y', 'text', 'customdata', 'ids', 'name'):
+        assert encoded[key] == trace[key]
+    assert encoded['marker']['size'] == 8
+
+
+def test_compact_figure_matches_the_full_figure():
+    x = np.linspace(2015, 2024, 500)
+    figure = go.Figure([go.Scatter(x=x, y=np.sin(x)), go.Heatmap(z=np.arange(400.0).reshape(40, 10))])
+    full = json.loads(figure.to_json())
+    compact = json.loads(to_json_plotly(compact_figure(figure)))
+    assert compact['layout']['template'] == FIGURE_TEMPLATE
+    np.testing.assert_array_equal(decode(compact['data'][0]['x']), x)
+    np.testing.assert_array_equal(decode(compact['data'][0]['y']), np.sin(x))
+    np.testing.assert_array_equal(decode(compact['data'][1]['z']), np.asarray(full['data'][1]['z']))
+    assert len(json.dumps(compact)) < len(json.dumps(full))
+
+
+SHIM_CHECK = """
+var calls = [];
+window.Plotly = {newPlot: function(gd, data, layout) { calls.push([data, layout]); }};
+window.Plotly.newPlot('graph', {data: %(data)s, layout: {template: '%(template)s'}});
+var figure = calls[0][0], trace = figure.data[0];
+console.log(JSON.stringify({
+    x: Array.from(trace.x), z: trace.z.map(function(row) { return Array.from(row); }),
+    typed: trace.x instanceof Float64Array, text: trace.text,
+    template: typeof figure.layout.template === 'object'
+}));
+"""
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+def test_browser_shim_decodes_typed_arrays_and_the_template():
+    x = np.linspace(0, 1, 50)
+    z = np.arange(400, dtype=np.float64).reshape(40, 10) - 0.5
+    trace = encode_arrays({'x': x, 'z': z, 'text': ['a'] * 50})
+    shim = FIGURE_SHIM.replace('__TEMPLATES__', json.dumps({FIGURE_TEMPLATE: {'layout': {}}}))
+    script = ('globalThis.window = globalThis;\n' + shim
+              + SHIM_CHECK % {'data': to_json_plotly([trace]), 'template': FIGURE_TEMPLATE})
+    result = json.loads(subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True).stdout)
+    assert result['typed'] and result['template']
+    np.testing.assert_array_equal(result['x'], x)
+    np.testing.assert_array_equal(result['z'], z)
+    assert result['text'] == ['a'] * 50
@@ -0,0 +1,93 @@
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from app import FileDataSource, InlineDataSource, SQLDataSource, open_data_source
+
+
+def touch_later(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_inline_version_sees_changes_inside_long_arrays():
+    values = np.arange(5_000, dtype=np.float64)
+    before = InlineDataSource({'revenue': {'amount': values}}).version()
+    changed = values.copy()
+    changed[2_500] += 1
+    assert InlineDataSource({'revenue': {'amount': changed}}).version() != before
+    assert InlineDataSource({'revenue': {'amount': values.copy()}}).version() == before
+
+
+def test_inline_version_depends_on_dtype_names_and_lists():
+    ints = InlineDataSource({'revenue': {'amount': np.arange(10)}}).version()
+    assert InlineDataSource({'revenue': {'amount': np.arange(10, dtype=np.float64)}}).version() != ints
+    assert InlineDataSource({'revenue': {'total': np.arange(10)}}).version() != ints
+    labels = InlineDataSource({'risk': {'category': ['Credit', 'Market']}}).version()
+    assert InlineDataSource({'risk': {'category': ['Credit', 'Funding']}}).version() != labels
+    mixed = np.array([1, 'a', None], dtype=object)
+    assert InlineDataSource({'risk': {'x': mixed}}).version() == InlineDataSource({'risk': {'x': mixed.copy()}}).version()
+
+
+def test_inline_load_returns_copies():
+    source = InlineDataSource({'risk': {'category': ['Credit']}})
+    source.load('risk')['category'].append('Market')
+    assert source.load('risk') == {'category': ['Credit']}
+    assert source.load('missing') is None
+
+
+def test_file_source_reads_csv_and_parquet(tmp_path):
+    pd.DataFrame({'month': ['Jan', 'Feb'], 'revenue': [1.5, 2.5]}).to_csv(tmp_path / 'revenue.csv', index=False)
+    pd.DataFrame({'category': ['Credit'], 'impact': [9]}).to_parquet(tmp_path / 'risk.parquet')
+    source = FileDataSource(str(tmp_path))
+    revenue = source.load('revenue')
+    assert revenue['month'].tolist() == ['Jan', 'Feb']
+    np.testing.assert_array_equal(revenue['revenue'], [1.5, 2.5])
+    assert source.load('risk')['impact'].tolist() == [9]
+    assert source.load('funding') is None
+
+
+def test_file_source_falls_back_and_versions_its_files(tmp_path):
+    fallback = InlineDataSource({'funding': {'round': ['Seed']}})
+    path = tmp_path / 'revenue.csv'
+    path.write_text('month,revenue\nJan,1\n')
+    source = FileDataSource(str(tmp_path), fallback=fallback)
+    assert source.load('funding') == {'round': ['Seed']}
+
+    before = source.version()
+    assert source.version() == before
+    path.write_text('month,revenue\nJan,2\n')
+    touch_later(path)
+    assert source.version() != before
+    (tmp_path / 'notes.txt').write_text('not a dataset')
+    assert source.version() == FileDataSource(str(tmp_path), fallback=fallback).version()
+
+
+def test_sqlite_source_reads_tables_and_falls_back(tmp_path):
+    path = str(tmp_path / 'data.db')
+    with sqlite3.connect(path) as connection:
+        connection.execute('CREATE TABLE risk (category TEXT, impact INTEGER)')
+        connection.execute("INSERT INTO risk VALUES ('Credit', 9), ('Market', 7)")
+    connection.close()
+    source = SQLDataSource(path, fallback=InlineDataSource({'funding': {'round': ['Seed']}}))
+    assert source.load('risk') == {'category': ['Credit', 'Market'], 'impact': [9, 7]}
+    assert source.load('funding') == {'round': ['Seed']}
+    assert SQLDataSource(path).load('funding') is None
+
+    before = source.version()
+    with sqlite3.connect(path) as connection:
+        connection.execute("INSERT INTO risk VALUES ('Funding', 8)")
+    connection.close()
+    touch_later(path)
+    assert source.version() != before
+
+
+def test_open_data_source_picks_the_source_from_the_spec(tmp_path, monkeypatch):
+    monkeypatch.delenv('INGEST_STATE', raising=False)
+    assert isinstance(open_data_source(''), InlineDataSource)
+    assert isinstance(open_data_source(str(tmp_path)), FileDataSource)
+    source = open_data_source(f'sqlite:///{tmp_path}/data.db')
+    assert isinstance(source, SQLDataSource)
+    assert (source.path, source.engine) == (f'{tmp_path}/data.db', 'sqlite')
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from app import InlineDataSource, Settings, ZestMoneyAnalytics, downsample, lttb_indices, minmax_indices
+from bench import synthetic_datasets
+
+
+def noisy_series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(2015, 2024, n)
+    return x, np.sin(x * 3) * 100 + rng.normal(0, 5, n)
+
+
+@pytest.mark.parametrize('n, n_out', [(10_000, 800), (1_001, 1_000), (50, 3)])
+def test_lttb_keeps_the_ends_and_picks_one_point_per_bucket(n, n_out):
+    x, y = noisy_series(n)
+    indices = lttb_indices(x, y, n_out)
+    assert len(indices) == n_out
+    assert indices[0] == 0 and indices[-1] == n - 1
+    assert (np.diff(indices) > 0).all()
+
+
+@pytest.mark.parametrize('n_out', [1_000, 2_000, 2])
+def test_lttb_returns_short_input_unchanged(n_out):
+    x, y = noisy_series(1_000)
+    np.testing.assert_array_equal(lttb_indices(x, y, n_out), np.arange(1_000))
+
+
+def test_lttb_keeps_a_spike():
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.zeros(10_000)
+    y[6_543] = 1_000
+    assert 6_543 in lttb_indices(x, y, 100)
+
+
+def test_minmax_keeps_each_bucket_extremes():
+    _, y = noisy_series(10_000, seed=1)
+    n_out = 200
+    indices = minmax_indices(y, n_out)
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert (np.diff(indices) > 0).all()
+    assert len(indices) <= n_out
+    size = -(-len(y) // ((n_out - 2) // 2))
+    for start in range(0, len(y), size):
+        bucket = y[start:start + size]
+        assert start + int(np.argmin(bucket)) in indices
+        assert start + int(np.argmax(bucket)) in indices
+    assert np.argmin(y) in indices and np.argmax(y) in indices
+
+
+def test_minmax_ignores_nans_and_returns_short_input_unchanged():
+    y = np.array([np.nan, 3.0, -1.0, np.nan, 7.0, 2.0, np.nan, 0.0])
+    np.testing.assert_array_equal(minmax_indices(y, 8), np.arange(8))
+    indices = minmax_indices(y, 4)
+    assert {2, 4} <= set(indices.tolist())
+    assert indices[0] == 0 and indices[-1] == 7
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_downsample_at_or_below_the_target_is_unchanged(method):
+    x, y = noisy_series(800)
+    out_x, out_y = downsample(x, y, 800, method=method)
+    np.testing.assert_array_equal(out_x, x)
+    np.testing.assert_array_equal(out_y, y)
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_downsample_keeps_the_first_and_last_points(method):
+    x, y = noisy_series(10_000)
+    out_x, out_y = downsample(x, y, 500, method=method)
+    assert len(out_x) <= 500
+    assert (out_x[0], out_y[0]) == (x[0], y[0])
+    assert (out_x[-1], out_y[-1]) == (x[-1], y[-1])
+
+
+def test_x_range_keeps_the_window_and_a_point_either_side():
+    x, y = noisy_series(10_000)
+    out_x, out_y = downsample(x, y, 10_000, x_range=(2018, 2019))
+    inside = (x >= 2018) & (x <= 2019)
+    first, last = np.flatnonzero(inside)[[0, -1]]
+    np.testing.assert_array_equal(out_x, x[first - 1:last + 2])
+    np.testing.assert_array_equal(out_y, y[first - 1:last + 2])
+
+
+def test_x_range_is_downsampled_within_the_window():
+    x, y = noisy_series(100_000)
+    out_x, _ = downsample(x, y, 300, x_range=(2018, 2019))
+    assert len(out_x) == 300
+    assert out_x[0] < 2018 <= out_x[1] and out_x[-2] <= 2019 < out_x[-1]
+
+
+def test_dates_and_x_range_strings():
+    x = np.arange('2020-01-01', '2024-01-01', dtype='datetime64[D]')
+    y = np.arange(len(x), dtype=np.float64)
+    out_x, out_y = downsample(x, y, 100, x_range=('2022-01-01', '2022-12-31'))
+    assert len(out_x) == 100
+    assert out_x[0] < np.datetime64('2022-01-01') <= out_x[1]
+    assert (np.diff(out_y) > 0).all()
+
+
+def test_webgl_threshold_follows_the_downsample_target(monkeypatch):
+    assert Settings().webgl_threshold == Settings().downsample_points
+    assert Settings(downsample_points=2_000).webgl_threshold == 2_000
+    monkeypatch.setenv('WEBGL_THRESHOLD', '0')
+    assert Settings.from_env(downsample_points=2_000).webgl_threshold == 0
+
+
+def test_downsampled_series_stay_svg_and_larger_traces_use_webgl():
+    datasets = synthetic_datasets(20_000, segments=True)
+    analytics = ZestMoneyAnalytics(InlineDataSource(datasets, fallback=InlineDataSource()), settings=Settings())
+    for chart in ('revenue_loss', 'user_growth', 'burn_rate'):
+        assert {trace['type'] for trace in analytics.build_figure(chart)['data']} <= {'scatter', 'bar'}
+    assert 'scattergl' in {trace['type'] for trace in analytics.build_figure('opportunity_matrix')['data']}
@@ -0,0 +1,45 @@
+import json
+import os
+import re
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def environment(monkeypatch):
+    monkeypatch.setenv('ASSET_BROTLI_QUALITY', '1')
+    monkeypatch.setenv('TAB_MODE', 'server')
+    monkeypatch.delenv('LAZY_GRAPHS', raising=False)
+    monkeypatch.delenv('DASH_REQUESTS_PATHNAME_PREFIX', raising=False)
+    monkeypatch.delenv('DATA_SOURCE', raising=False)
+    monkeypatch.delenv('INGEST_STATE', raising=False)
+    return {name: value for name, value in os.environ.items() if name != 'PYTEST_CURRENT_TEST'}
+
+
+def test_export_leaves_the_environment_alone(tmp_path, environment):
+    out = str(tmp_path / 'dist')
+    manifest = app.export_static(out, prefix='/reports/')
+    assert {name: value for name, value in os.environ.items() if name != 'PYTEST_CURRENT_TEST'} == environment
+    assert app.Settings.from_env().tab_mode == 'server'
+
+    with open(os.path.join(out, 'index.html')) as f:
+        index = f.read()
+    config = re.search(r'<script id="_dash-config" type="application/json">(.*?)</script>', index, re.S)
+    assert json.loads(config.group(1))['requests_pathname_prefix'] == '/reports/'
+    assert '/reports/_dash-component-suites/' in index
+    for path in manifest['files']:
+        assert os.path.exists(os.path.join(out, path))
+        assert os.path.exists(os.path.join(out, path + '.gz'))
+
+    # Every tab's layout is in the exported page, since nothing serves tab switches
+    with open(os.path.join(out, '_dash-layout.json')) as f:
+        layout = f.read()
+    assert layout.count('"type":"tab-pane"') == len(app.ZestMoneyAnalytics().tab_builders)
+    assert layout.count('"type":"Graph"') > 20
+
+    # Unchanged data and code: nothing to do
+    assert app.export_static(out, prefix='/reports/') is None
+    with open(os.path.join(out, 'export-manifest.json')) as f:
+        assert json.load(f)['data_version'] == manifest['data_version']
@@ -0,0 +1,83 @@
+import os
+
+import pandas as pd
+import pytest
+
+import app
+from app import FigureCache, Settings, ZestMoneyAnalytics
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = FigureCache(max_entries=2)
+    cache.put(('risk', 'v1'), 'risk layout')
+    cache.put(('market', 'v1'), 'market layout')
+    assert cache.get_or_build(('risk', 'v1'), lambda: 'rebuilt') == 'risk layout'
+    cache.put(('customer', 'v1'), 'customer layout')
+    assert len(cache) == 2
+    assert ('market', 'v1') not in cache
+    assert ('risk', 'v1') in cache and ('customer', 'v1') in cache
+
+
+def test_builds_only_on_a_miss():
+    cache = FigureCache()
+    builds = []
+    for _ in range(3):
+        cache.get_or_build(('risk', 'v1'), lambda: builds.append(1) or 'layout')
+    assert len(builds) == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_invalidate_one_tab_or_everything():
+    cache = FigureCache()
+    for key in [('risk', 'v1'), ('risk', 'v2'), ('market', 'v1')]:
+        cache.put(key, 'layout')
+    cache.invalidate('risk')
+    assert len(cache) == 1 and ('market', 'v1') in cache
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+@pytest.fixture
+def risk_csv(tmp_path, monkeypatch):
+    path = tmp_path / 'risk.csv'
+    pd.DataFrame(app.SAMPLE_DATA['risk']).to_csv(path, index=False)
+    monkeypatch.setenv('DATA_SOURCE', str(tmp_path))
+    monkeypatch.delenv('INGEST_STATE', raising=False)
+    return path
+
+
+def rewrite(path, **changes):
+    frame = pd.read_csv(path).assign(**changes)
+    stat = os.stat(path)
+    frame.to_csv(path, index=False)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_changed_source_data_invalidates_cached_tabs(risk_csv):
+    analytics = ZestMoneyAnalytics(settings=Settings(data_version_check_seconds=3_600))
+    analytics.get_tab_content('risk')
+    version = analytics.data_version
+    rewrite(risk_csv, mitigation_cost=1)
+
+    # Throttled: the change is seen once the interval has passed
+    assert analytics.check_data_version() == version
+    assert analytics.check_data_version(max_age=0) != version
+    assert len(analytics.figure_cache) == 0
+    assert analytics.risk_data['mitigation_cost'].tolist() == [1] * 6
+
+
+def test_dataset_read_after_a_change_forces_the_next_check(risk_csv):
+    analytics = ZestMoneyAnalytics(settings=Settings(data_version_check_seconds=3_600))
+    version = analytics.data_version
+    rewrite(risk_csv, mitigation_cost=1)
+    analytics.risk_data
+    assert analytics.check_data_version() != version
+
+
+def test_requests_check_the_data_version(risk_csv):
+    analytics = ZestMoneyAnalytics(settings=Settings(data_version_check_seconds=0))
+    client = analytics.create_app().server.test_client()
+    version = analytics.data_version
+    rewrite(risk_csv, mitigation_cost=1)
+    client.get('/_dash-layout')
+    assert analytics.data_version != version
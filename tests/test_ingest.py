@@ -0,0 +1,142 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import EventIngest, HyperLogLog
+
+EVENT_TYPES = ['loan_disbursed', 'repayment', 'default', 'expense', 'user_signup', 'user_active', 'user_churn']
+
+
+def sample_events(rows, seed=0):
+    """Events over 2022-2024 in date order, each user's starting with their signup"""
+    rng = np.random.default_rng(seed)
+    users = rows // 10
+    signup_day = rng.integers(0, 3 * 365, users)
+    user_id = np.concatenate([np.arange(users), rng.integers(0, users, rows - users)])
+    events = np.concatenate([np.full(users, 'user_signup'), rng.choice(EVENT_TYPES[:4] + EVENT_TYPES[5:], rows - users)])
+    days = np.minimum(signup_day[user_id] + rng.integers(0, 400, rows) * (events != 'user_signup'), 3 * 365 - 1)
+    order = np.argsort(days, kind='stable')
+    events = events[order]
+    return pd.DataFrame({
+        'event_type': events,
+        'timestamp': (np.datetime64('2022-01-01') + days[order]).astype(str),
+        'user_id': user_id[order],
+        'amount': np.round(rng.random(rows) * 50_000, 2),
+        'revenue': np.round(rng.random(rows) * 500, 2),
+        'category': np.where(events == 'expense', rng.choice(['marketing', 'employee', 'other'], rows), None)
+    })
+
+
+def ingest_state(tmp_path, name, frames, block_bytes=64 << 20):
+    """Ingest each frame as one more batch of rows appended to the same CSV"""
+    path = tmp_path / f'{name}.csv'
+    ingest = None
+    for number, frame in enumerate(frames):
+        frame.to_csv(path, mode='a', header=number == 0, index=False)
+        ingest = EventIngest(str(tmp_path / f'{name}.pkl'), block_bytes=block_bytes)
+        ingest.ingest([str(path)])
+    return ingest
+
+
+def assert_same_totals(left, right):
+    assert left.state['years'].keys() == right.state['years'].keys()
+    for year, totals in left.state['years'].items():
+        for name, total in totals.items():
+            assert total == pytest.approx(right.state['years'][year][name]), (year, name)
+    for year, counter in left.state['active_users'].items():
+        np.testing.assert_array_equal(counter.registers, right.state['active_users'][year].registers)
+
+
+def test_chunked_ingest_matches_one_shot(tmp_path):
+    events = sample_events(20_000)
+    one_shot = ingest_state(tmp_path, 'one_shot', [events])
+    chunked = ingest_state(tmp_path, 'chunked', [events], block_bytes=4096)
+    assert_same_totals(chunked, one_shot)
+    np.testing.assert_array_equal(chunked.cohorts.retained, one_shot.cohorts.retained)
+
+
+def test_incremental_ingest_only_reads_new_rows(tmp_path):
+    events = sample_events(20_000)
+    one_shot = ingest_state(tmp_path, 'one_shot', [events])
+    incremental = ingest_state(tmp_path, 'incremental', [events[:7_000], events[7_000:12_000], events[12_000:]])
+    assert_same_totals(incremental, one_shot)
+    np.testing.assert_array_equal(incremental.cohorts.retained, one_shot.cohorts.retained)
+    np.testing.assert_array_equal(incremental.cohorts.defaults, one_shot.cohorts.defaults)
+
+    rerun = EventIngest(str(tmp_path / 'incremental.pkl'))
+    assert rerun.ingest([str(tmp_path / 'incremental.csv')]) == 0
+
+
+def test_partial_trailing_line_waits_for_its_newline(tmp_path):
+    events = sample_events(1_000)
+    path = tmp_path / 'events.csv'
+    events.to_csv(path, index=False)
+    with open(path, 'a') as f:
+        f.write('user_active,2024-12-3')
+    ingest = EventIngest(str(tmp_path / 'state.pkl'))
+    assert ingest.ingest([str(path)]) == len(events)
+    assert ingest.held_bytes == len('user_active,2024-12-3')
+    with open(path, 'a') as f:
+        f.write('1,7,0,0,\n')
+    ingest = EventIngest(str(tmp_path / 'state.pkl'))
+    assert ingest.ingest([str(path)]) == 1
+    assert ingest.held_bytes == 0
+
+
+def test_final_line_without_newline_is_taken_once_the_file_is_unchanged(tmp_path):
+    events = sample_events(1_000)
+    path = tmp_path / 'events.csv'
+    events.to_csv(path, index=False)
+    with open(path, 'a') as f:
+        f.write('user_signup,2024-12-31,7,0,0,')
+    state = str(tmp_path / 'state.pkl')
+    assert EventIngest(state).ingest([str(path)]) == len(events)
+    ingest = EventIngest(state)
+    assert ingest.ingest([str(path)]) == 1
+    assert ingest.held_bytes == 0
+    signups = (events['event_type'] == 'user_signup') & events['timestamp'].str.startswith('2024')
+    assert ingest.state['years'][2024]['signups'] == signups.sum() + 1
+    assert EventIngest(state).ingest([str(path)]) == 0
+
+
+def test_final_flag_takes_the_last_line_right_away(tmp_path):
+    path = tmp_path / 'events.csv'
+    sample_events(1_000).to_csv(path, index=False)
+    with open(path, 'a') as f:
+        f.write('user_signup,2024-12-31,7,0,0,')
+    ingest = EventIngest(str(tmp_path / 'state.pkl'))
+    assert ingest.ingest([str(path)], final=True) == 1_001
+    assert ingest.held_bytes == 0
+
+
+def test_chunk_without_categories_aggregates_quietly(tmp_path):
+    events = sample_events(1_000)
+    events['category'] = np.nan
+    ingest = EventIngest(str(tmp_path / 'state.pkl'))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        ingest.aggregate(events)
+    assert all(totals['marketing'] == 0 for totals in ingest.state['years'].values())
+
+
+@pytest.mark.parametrize('distinct', [100, 10_000, 500_000])
+def test_hyperloglog_error_is_within_bounds(distinct):
+    rng = np.random.default_rng(distinct)
+    hashes = pd.util.hash_array(np.arange(distinct).astype(str))
+    counter = HyperLogLog()
+    # Each value three times, in shuffled batches
+    for batch in np.array_split(rng.permutation(np.tile(hashes, 3)), 7):
+        counter.add_hashes(batch)
+    # Standard error is 1.04 / sqrt(2**14), about 0.8%; allow four of them
+    assert counter.count() == pytest.approx(distinct, rel=0.033)
+
+
+def test_hyperloglog_registers_merge_like_a_union():
+    hashes = pd.util.hash_array(np.arange(50_000).astype(str))
+    left, right, both = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    left.add_hashes(hashes[:30_000])
+    right.add_hashes(hashes[20_000:])
+    both.add_hashes(hashes)
+    np.testing.assert_array_equal(np.maximum(left.registers, right.registers), both.registers)
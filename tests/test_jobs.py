@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+import pytest
+
+import app
+from app import JobQueue, run_job, write_job_state
+
+
+class RecordingExecutor:
+    """Executor stand-in that records submissions instead of running them"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def submit(self, func, *args):
+        with self.lock:
+            self.calls.append(args)
+        future = Future()
+        future.set_result(None)
+        return future
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs'))
+    queue.recorder = RecordingExecutor()
+    queue.executor = lambda: queue.recorder
+    return queue
+
+
+def submit_concurrently(queue, kind, params, threads=16):
+    barrier = threading.Barrier(threads)
+    job_ids = []
+
+    def submit():
+        barrier.wait()
+        job_ids.append(queue.submit(kind, params))
+
+    workers = [threading.Thread(target=submit) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return job_ids
+
+
+def test_identical_requests_share_one_job(queue):
+    job_ids = submit_concurrently(queue, 'tab', {'tab': 'risk', 'data_version': 'v1'})
+    assert len(set(job_ids)) == 1
+    assert len(queue.recorder.calls) == 1
+    assert queue.status(job_ids[0])['status'] == 'queued'
+
+
+def test_different_parameters_are_different_jobs(queue):
+    first = queue.submit('tab', {'tab': 'risk', 'data_version': 'v1'})
+    second = queue.submit('tab', {'tab': 'risk', 'data_version': 'v2'})
+    third = queue.submit('tab', {'tab': 'market', 'data_version': 'v1'})
+    assert len({first, second, third}) == 3
+    assert len(queue.recorder.calls) == 3
+
+
+@pytest.mark.parametrize('status, age', [('failed', 0), ('running', 1_000), ('queued', 1_000)])
+def test_failed_or_stale_job_is_restarted_once(queue, status, age):
+    params = {'tab': 'risk', 'data_version': 'v1'}
+    job_id = queue.submit('tab', params)
+    write_job_state(queue.path(job_id), {'kind': 'tab', 'params': params, 'status': status, 'progress': None,
+                                         'message': '', 'updated': time.time() - age})
+    assert set(submit_concurrently(queue, 'tab', params)) == {job_id}
+    assert len(queue.recorder.calls) == 2
+    assert queue.status(job_id)['status'] == 'queued'
+
+
+def test_live_job_is_not_restarted(queue):
+    params = {'tab': 'risk', 'data_version': 'v1'}
+    job_id = queue.submit('tab', params)
+    write_job_state(queue.path(job_id), {'kind': 'tab', 'params': params, 'status': 'running', 'progress': 0.5,
+                                         'message': '', 'updated': time.time()})
+    queue.submit('tab', params)
+    assert len(queue.recorder.calls) == 1
+
+
+def test_prune_removes_old_finished_jobs_and_claims(queue):
+    params = {'tab': 'risk', 'data_version': 'v1'}
+    job_id = queue.submit('tab', params)
+    write_job_state(queue.path(job_id), {'kind': 'tab', 'params': params, 'status': 'failed', 'progress': None,
+                                         'message': '', 'updated': time.time()})
+    queue.submit('tab', params)
+    write_job_state(queue.path(job_id), {'kind': 'tab', 'params': params, 'status': 'done', 'progress': 1,
+                                         'message': '', 'updated': time.time() - 2 * queue.ttl_seconds})
+    old = time.time() - 2 * queue.ttl_seconds
+    for filename in os.listdir(queue.directory):
+        os.utime(os.path.join(queue.directory, filename), (old, old))
+    queue.prune()
+    assert os.listdir(queue.directory) == []
+
+
+def test_run_job_writes_the_result(queue):
+    analytics = app.ZestMoneyAnalytics()
+    params = {'charts': ['funding'], 'kwargs': {}, 'data_version': analytics.data_version}
+    job_id = queue.submit('figures', params)
+    run_job(queue.directory, job_id, 'figures', params)
+    state = queue.status(job_id)
+    assert state['status'] == 'done', state['message']
+    assert queue.result(job_id)[0]['data'][0]['type'] == 'bar'
+
+
+def test_run_job_fails_for_data_it_cannot_load(queue):
+    params = {'tab': 'risk', 'data_version': 'not-a-version'}
+    job_id = queue.submit('tab', params)
+    run_job(queue.directory, job_id, 'tab', params)
+    state = queue.status(job_id)
+    assert state['status'] == 'failed'
+    assert 'not-a-version' in state['message']
+    assert not os.path.exists(queue.path(job_id, '.result.json'))
+
+
+def test_job_runs_in_the_process_pool(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs'))
+    params = {'charts': ['funding'], 'kwargs': {}, 'data_version': app.ZestMoneyAnalytics().data_version}
+    job_id = queue.submit('figures', params)
+    deadline = time.time() + 120
+    while queue.status(job_id)['status'] not in ('done', 'failed') and time.time() < deadline:
+        time.sleep(0.1)
+    queue.executor().shutdown()
+    assert queue.status(job_id)['status'] == 'done', queue.status(job_id)['message']
+    assert len(queue.result(job_id)) == 1
+
+
+def test_jobs_after_the_data_changes_load_the_new_version(tmp_path, monkeypatch):
+    data = tmp_path / 'data'
+    data.mkdir()
+    risk = data / 'risk.csv'
+    pd.DataFrame(app.SAMPLE_DATA['risk']).to_csv(risk, index=False)
+    monkeypatch.setenv('DATA_SOURCE', str(data))
+    monkeypatch.delenv('INGEST_STATE', raising=False)
+    monkeypatch.setattr(app, '_job_analytics', None)
+    settings = app.Settings(background_jobs=True, job_dir=str(tmp_path / 'jobs'), data_version_check_seconds=3_600)
+    analytics = app.ZestMoneyAnalytics(settings=settings)
+    recorder = RecordingExecutor()
+    analytics.jobs.executor = lambda: recorder
+
+    versions = []
+    for cost in (None, 1):
+        if cost is not None:
+            stat = os.stat(risk)
+            pd.read_csv(risk).assign(mitigation_cost=cost).to_csv(risk, index=False)
+            os.utime(risk, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        analytics.render_tab('risk')
+        directory, job_id, kind, params = recorder.calls[-1]
+        run_job(directory, job_id, kind, params)
+        state = analytics.jobs.status(job_id)
+        assert state['status'] == 'done', state['message']
+        versions.append(params['data_version'])
+    assert versions[0] != versions[1] == analytics.data_version == app._job_analytics.data_version
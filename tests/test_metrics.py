@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+import app
+from app import MetricCache, MetricRegistry
+
+DATASETS = {
+    'financial': {'revenue_cr': [10, 20, 40], 'expenses_cr': [30, 35, 45]},
+    'market': {'size_billions': [100, 50]}
+}
+
+
+def registry_with_dependencies():
+    registry = MetricRegistry()
+
+    # Registered before the metric it uses
+    @registry.metric('margin_pct', 'financial', ['profit', 'revenue_cr'])
+    def margin_pct(profit, revenue):
+        return profit / revenue * 100
+
+    @registry.metric('profit', 'financial', ['revenue_cr', 'expenses_cr'])
+    def profit(revenue, expenses):
+        return revenue - expenses
+
+    @registry.metric('latest_margin', 'financial', ['margin_pct'])
+    def latest_margin(margin):
+        return float(margin[-1])
+
+    @registry.metric('total_market', 'market', ['size_billions'])
+    def total_market(size):
+        return float(size.sum())
+
+    return registry
+
+
+def test_metrics_resolve_their_dependencies_in_any_order():
+    results = registry_with_dependencies().compute('financial', DATASETS['financial'])
+    assert set(results) == {'margin_pct', 'profit', 'latest_margin'}
+    np.testing.assert_array_equal(results['profit'], [-20, -15, -5])
+    np.testing.assert_allclose(results['margin_pct'], [-200, -75, -12.5])
+    assert results['latest_margin'] == -12.5
+
+
+def test_each_metric_and_column_is_computed_once():
+    registry = MetricRegistry()
+    seen = []
+
+    @registry.metric('doubled', 'financial', ['revenue_cr'])
+    def doubled(revenue):
+        seen.append(revenue)
+        return revenue * 2
+
+    @registry.metric('quadrupled', 'financial', ['doubled', 'revenue_cr'])
+    def quadrupled(doubled, revenue):
+        seen.append(revenue)
+        return doubled * 2
+
+    @registry.metric('octupled', 'financial', ['doubled', 'quadrupled'])
+    def octupled(doubled, quadrupled):
+        return doubled * 2 + quadrupled
+
+    assert registry.compute('financial', DATASETS['financial'])['octupled'].tolist() == [80, 160, 320]
+    assert len(seen) == 2 and seen[0] is seen[1]
+    assert seen[0].dtype == np.float64
+
+
+def test_cache_loads_each_dataset_once():
+    loads = []
+    cache = MetricCache(registry_with_dependencies(), lambda name: loads.append(name) or DATASETS[name])
+    assert cache['latest_margin'] == -12.5
+    assert cache['profit'].tolist() == [-20, -15, -5]
+    assert cache['total_market'] == 150
+    assert loads == ['financial', 'market']
+
+
+def test_unknown_metric_is_an_error():
+    cache = MetricCache(registry_with_dependencies(), DATASETS.get)
+    with pytest.raises(KeyError, match="Unknown metric 'ebitda'"):
+        cache['ebitda']
+
+
+def test_unknown_input_is_an_error():
+    registry = MetricRegistry()
+    registry.metric('burn', 'financial', ['cash_cr'])(lambda cash: cash)
+    with pytest.raises(KeyError, match="'cash_cr' is neither a column nor a metric of dataset 'financial'"):
+        registry.compute('financial', DATASETS['financial'])
+
+
+def test_circular_metrics_are_an_error():
+    registry = MetricRegistry()
+    registry.metric('a', 'financial', ['b'])(lambda b: b)
+    registry.metric('b', 'financial', ['a'])(lambda a: a)
+    with pytest.raises(ValueError, match='depends on itself'):
+        registry.compute('financial', DATASETS['financial'])
+
+
+def test_the_app_kpis_compute():
+    kpis = app.ZestMoneyAnalytics().kpis
+    assert set(kpis) == set(app.ZestMoneyAnalytics.KPI_METRICS)
+    assert all(isinstance(value, float) for value in kpis.values())
@@ -0,0 +1,121 @@
+import gzip
+
+import flask
+import pytest
+
+import app
+from app import compress_payload, payload_response
+
+BODY = b'{"figure": [' + b'1.5, ' * 2_000 + b'0]}'
+
+
+@pytest.fixture
+def respond():
+    server = flask.Flask(__name__)
+
+    def respond(variants, accept_encoding=None, **kwargs):
+        headers = {} if accept_encoding is None else {'Accept-Encoding': accept_encoding}
+        headers.update(kwargs.pop('headers', {}))
+        with server.test_request_context('/', headers=headers):
+            return payload_response(variants, **kwargs)
+    return respond
+
+
+def test_variants_decompress_to_the_body():
+    variants = compress_payload(BODY)
+    assert variants['identity'] == BODY
+    assert gzip.decompress(variants['gzip']) == BODY
+    if app.brotli is not None:
+        assert app.brotli.decompress(variants['br']) == BODY
+        assert len(variants['br']) < len(variants['gzip']) < len(BODY)
+
+
+def test_gzip_variant_is_deterministic():
+    assert compress_payload(BODY)['gzip'] == compress_payload(BODY)['gzip']
+
+
+@pytest.mark.skipif(app.brotli is None, reason='needs brotli')
+@pytest.mark.parametrize('accept_encoding, encoding', [
+    ('br, gzip, deflate', 'br'),
+    ('gzip, deflate', 'gzip'),
+    ('br;q=0.5, gzip', 'gzip'),
+    ('deflate', None),
+    ('identity', None),
+    ('gzip;q=0, br;q=0', None),
+    (None, None),
+])
+def test_encoding_is_negotiated(respond, accept_encoding, encoding):
+    variants = compress_payload(BODY)
+    response = respond(variants, accept_encoding)
+    assert response.headers.get('Content-Encoding') == encoding
+    assert response.get_data() == variants[encoding or 'identity']
+    assert response.headers['Vary'] == 'Accept-Encoding'
+
+
+def test_brotli_is_skipped_when_there_is_no_variant(respond):
+    variants = {'identity': BODY, 'gzip': gzip.compress(BODY)}
+    response = respond(variants, 'br, gzip')
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert respond(variants, 'br').headers.get('Content-Encoding') is None
+
+
+def test_etag_names_the_encoding_and_revalidates_to_304(respond):
+    variants = compress_payload(BODY)
+    response = respond(variants, 'gzip', etag='abc', cache_control='public, max-age=60')
+    assert response.headers['ETag'] == '"abc-gzip"'
+    assert response.headers['Cache-Control'] == 'public, max-age=60'
+
+    revalidated = respond(variants, 'gzip', etag='abc', headers={'If-None-Match': '"abc-gzip"'})
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b''
+    assert revalidated.headers['ETag'] == '"abc-gzip"'
+    assert revalidated.headers['Vary'] == 'Accept-Encoding'
+
+    # A tag for another encoding's bytes, or older content, gets the full body
+    assert respond(variants, 'identity', etag='abc', headers={'If-None-Match': '"abc-gzip"'}).status_code == 200
+    assert respond(variants, 'gzip', etag='abd', headers={'If-None-Match': '"abc-gzip"'}).status_code == 200
+
+
+def test_no_etag_without_one(respond):
+    response = respond(compress_payload(BODY), 'gzip', headers={'If-None-Match': '*'})
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+    assert response.headers['Vary'] == 'Accept-Encoding'
+
+
+@pytest.fixture(scope='module')
+def client():
+    analytics = app.ZestMoneyAnalytics(settings=app.Settings(tab_mode='server', payload_store=True))
+    return analytics.create_app().server.test_client()
+
+
+def tab_switch(client, tab, **headers):
+    body = {'output': 'tab-content-area.children', 'outputs': {'id': 'tab-content-area', 'property': 'children'},
+            'inputs': [{'id': 'main-tabs', 'property': 'active_tab', 'value': tab}], 'changedPropIds': []}
+    return client.post('/_dash-update-component', json=body, headers=headers)
+
+
+@pytest.mark.parametrize('path', ['/', '/_dash-layout', '/_dash-dependencies'])
+def test_get_routes_revalidate_to_304(client, path):
+    first = client.get(path, headers={'Accept-Encoding': 'gzip'})
+    assert first.status_code == 200 and first.headers['ETag']
+    again = client.get(path, headers={'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.get_data() == b''
+
+
+def test_bundles_revalidate_to_304(client):
+    index = client.get('/').get_data(as_text=True)
+    bundle = app.StaticAssets.SUITE_URL.search(index).group(0)
+    first = client.get('/' + bundle, headers={'Accept-Encoding': 'br'})
+    assert first.status_code == 200
+    again = client.get('/' + bundle, headers={'Accept-Encoding': 'br', 'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_tab_switches_are_never_304(client):
+    first = tab_switch(client, 'risk')
+    assert first.status_code == 200
+    assert 'ETag' not in first.headers
+    assert first.get_json()['response']['tab-content-area']['children']
+    assert tab_switch(client, 'risk', **{'If-None-Match': '*'}).status_code == 200
@@ -0,0 +1,61 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app import optimize_portfolio
+
+
+def brute_force(weights, value, risk, budget, risk_cap):
+    """Highest total value over every subset within the budget and risk cap"""
+    best = 0.0
+    allowed = [i for i in range(len(weights)) if risk[i] <= risk_cap]
+    for size in range(len(allowed) + 1):
+        for subset in itertools.combinations(allowed, size):
+            if sum(weights[i] for i in subset) <= budget + 1e-9:
+                best = max(best, sum(value[i] for i in subset))
+    return best
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_integer_costs_match_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = 12
+    capital = rng.integers(1, 15, n).astype(float)
+    value = rng.integers(1, 100, n).astype(float)
+    risk = rng.integers(1, 10, n).astype(float)
+    budget, risk_cap = 40.0, 6.0
+
+    selected = optimize_portfolio(capital, value, risk, budget, risk_cap)
+    assert capital[selected].sum() <= budget
+    assert (risk[selected] <= risk_cap).all()
+    assert value[selected].sum() == pytest.approx(brute_force(capital, value, risk, budget, risk_cap))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_fractional_costs_round_up_and_stay_within_budget(seed):
+    rng = np.random.default_rng(seed)
+    n = 12
+    capital = np.round(rng.random(n) * 12 + 0.1, 2)
+    value = np.round(rng.random(n) * 100, 1)
+    risk = np.round(rng.random(n) * 9 + 1, 1)
+    budget, risk_cap, unit = 30.0, 6.5, 0.5
+
+    selected = optimize_portfolio(capital, value, risk, budget, risk_cap, unit=unit)
+    assert len(set(selected)) == len(selected)
+    assert capital[selected].sum() <= budget
+    assert (risk[selected] <= risk_cap).all()
+    # Optimal for costs rounded up to the unit, and never better than the exact optimum
+    rounded = np.ceil(capital / unit) * unit
+    assert value[selected].sum() == pytest.approx(brute_force(rounded, value, risk, budget, risk_cap))
+    assert value[selected].sum() <= brute_force(capital, value, risk, budget, risk_cap) + 1e-9
+
+
+def test_nothing_fits():
+    selected = optimize_portfolio([50, 60], [10, 20], [1, 1], budget=40, risk_cap=5)
+    assert selected.dtype == np.int64 and len(selected) == 0
+
+
+def test_risky_and_worthless_opportunities_are_skipped():
+    selected = optimize_portfolio([5, 5, 5], [100, 0, 10], [9, 1, 1], budget=20, risk_cap=5)
+    assert selected.tolist() == [2]
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import app
+from app import RiskGrid
+
+
+def sample_register(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    # Scores a little outside 1..10 are clipped into the edge cells
+    return rng.random(rows) * 10.6, rng.random(rows) * 10.6, np.round(rng.random(rows) * 100, 1)
+
+
+def test_counts_and_costs_match_a_scan():
+    probability, impact, cost = sample_register(5_000)
+    grid = RiskGrid(probability, impact, cost)
+    p = np.clip(np.rint(probability), 1, 10)
+    i = np.clip(np.rint(impact), 1, 10)
+    for row in range(10):
+        for column in range(10):
+            in_cell = (i == row + 1) & (p == column + 1)
+            assert grid.counts[row, column] == in_cell.sum()
+            assert grid.costs[row, column] == pytest.approx(cost[in_cell].sum())
+    assert grid.counts.sum() == 5_000
+
+
+def test_items_are_the_cell_costliest_first():
+    probability, impact, cost = sample_register(5_000, seed=1)
+    grid = RiskGrid(probability, impact, cost)
+    p = np.clip(np.rint(probability), 1, 10)
+    i = np.clip(np.rint(impact), 1, 10)
+    for probability_score, impact_score in [(1, 1), (3, 7), (10, 10), (10, 1)]:
+        items = grid.items(probability_score, impact_score)
+        expected = np.flatnonzero((p == probability_score) & (i == impact_score))
+        assert sorted(items.tolist()) == expected.tolist()
+        assert (np.diff(cost[items]) <= 0).all()
+
+
+def test_items_outside_the_grid_are_empty():
+    grid = RiskGrid(*sample_register(100))
+    assert len(grid.items(0, 5)) == 0
+    assert len(grid.items(5, 11)) == 0
+
+
+def test_analytics_builds_the_grid_once():
+    analytics = app.ZestMoneyAnalytics()
+    grid = analytics.risk_grid()
+    assert analytics.risk_grid() is grid
+    assert grid.counts.sum() == len(analytics.risk_data['category'])
+
+
+def test_critical_risks_come_from_the_register():
+    risks = {'category': ['Credit', 'Market', 'Funding', 'Fraud', 'Tech'],
+             'probability': [9, 3, 8, 6, 9], 'impact': [9, 4, 9, 10, 8], 'mitigation_cost': [20, 5, 30, 12.5, 1]}
+    analytics = app.ZestMoneyAnalytics(app.InlineDataSource({'risk': risks}, fallback=app.InlineDataSource()))
+    card = analytics.critical_risks()
+    items = [item.children for item in card.children[1].children]
+    # Tech ties Funding at 72 but costs less
+    assert items == ['Credit: probability 9, impact 9', 'Funding: probability 8, impact 9',
+                     'Tech: probability 9, impact 8']
+    assert card.children[4].children == 'Total: $68.5M across 5 risks'
+    assert card.children[5].children == 'Top 3: $51M'
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+import app
+from app import RUNWAY_PERCENTILES, RunwaySimulator, calibrate_runway
+
+SCENARIO = dict(revenue=2_000, opex=2_600, revenue_growth=0.15, growth_volatility=0.25,
+                expense_growth=0.08, expense_volatility=0.1, provision_ratio=0.06, provision_volatility=0.3)
+
+
+def test_calibration_recovers_steady_growth():
+    years = np.arange(2018, 2025)
+    revenue = 100 * 1.2 ** (years - 2018)
+    provisions = 0.05 * revenue
+    expenses = 150 * 1.1 ** (years - 2018) + provisions
+    calibration = calibrate_runway({'year': years, 'revenue_cr': revenue, 'expenses_cr': expenses,
+                                    'bad_debt_provisions': provisions})
+    assert calibration['year'] == 2024
+    assert calibration['revenue'] == pytest.approx(revenue[-1])
+    assert calibration['opex'] == pytest.approx(150 * 1.1 ** 6)
+    assert calibration['revenue_growth'] == pytest.approx(20)
+    assert calibration['expense_growth'] == pytest.approx(10)
+    assert calibration['provision_ratio'] == pytest.approx(0.05)
+    assert calibration['growth_volatility'] == pytest.approx(0, abs=1e-9)
+
+
+def test_calibration_of_the_sample_data():
+    calibration = calibrate_runway(app.SAMPLE_DATA['financial'])
+    assert calibration['revenue'] > 0 and calibration['opex'] > 0
+    assert calibration['growth_volatility'] > 0 and calibration['provision_ratio'] > 0
+
+
+def test_a_seed_reproduces_the_simulation():
+    first = RunwaySimulator(paths=20_000, seed=7).simulate(5_000, **SCENARIO)
+    second = RunwaySimulator(paths=20_000, seed=7).simulate(5_000, **SCENARIO)
+    other = RunwaySimulator(paths=20_000, seed=8).simulate(5_000, **SCENARIO)
+    assert first['cash'] == second['cash']
+    np.testing.assert_array_equal(first['runway_counts'], second['runway_counts'])
+    assert first['cash'] != other['cash']
+
+
+def test_batches_do_not_change_the_result():
+    whole = RunwaySimulator(paths=10_000, batch_size=1 << 17).simulate(5_000, **SCENARIO)
+    batched = RunwaySimulator(paths=10_000, batch_size=999).simulate(5_000, **SCENARIO)
+    assert whole['cash'] == batched['cash']
+    np.testing.assert_array_equal(whole['runway_counts'], batched['runway_counts'])
+
+
+def test_percentile_bands_are_ordered():
+    result = RunwaySimulator(paths=20_000).simulate(5_000, **SCENARIO)
+    bands = np.array([result['cash'][percentile] for percentile in RUNWAY_PERCENTILES])
+    assert bands.shape == (len(RUNWAY_PERCENTILES), RunwaySimulator().years + 1)
+    assert (np.diff(bands, axis=0) >= 0).all()
+    assert (np.diff(bands[:, 1:], axis=0).sum(axis=0) > 0).all()
+    assert result['runway_counts'].sum() == 20_000
+
+
+def test_scenarios_on_the_same_paths_move_consistently():
+    # Common random numbers: every scenario rescales the same shocks, so deltas are not noise
+    simulator = RunwaySimulator(paths=20_000)
+    base = simulator.simulate(5_000, **SCENARIO)
+    richer = simulator.simulate(6_000, **SCENARIO)
+    for percentile in RUNWAY_PERCENTILES:
+        np.testing.assert_allclose(np.subtract(richer['cash'][percentile], base['cash'][percentile]), 1_000,
+                                   rtol=1e-3)
+    # Each path lasts at least as long with more cash, and no longer with more costs
+    assert (np.cumsum(richer['runway_counts']) <= np.cumsum(base['runway_counts'])).all()
+    costlier = simulator.simulate(5_000, **dict(SCENARIO, opex=3_000))
+    assert (np.cumsum(costlier['runway_counts']) >= np.cumsum(base['runway_counts'])).all()
+    assert all(np.all(np.less_equal(costlier['cash'][p][1:], base['cash'][p][1:])) for p in RUNWAY_PERCENTILES)
+
+
+@pytest.mark.parametrize('cash', [1_000, 0])
+def test_cash_that_is_not_burning_never_runs_out(cash):
+    scenario = dict(SCENARIO, revenue=0, opex=0)
+    result = RunwaySimulator(paths=5_000).simulate(cash, **scenario)
+    assert result['median_runway'] is None
+    assert result['out_within_year'] == 0
+    assert result['runway_counts'][-1] == 5_000
+    assert all(values == [cash] * 6 for values in result['cash'].values())
+
+
+def test_a_certain_burn_runs_out_on_schedule():
+    scenario = dict(SCENARIO, revenue=0, opex=1_200, growth_volatility=0, expense_growth=0,
+                    expense_volatility=0, provision_volatility=0)
+    result = RunwaySimulator(paths=1_000).simulate(1_500, **scenario)
+    # 1,200 a year burns 1,500 in 15 months
+    assert result['median_runway'] == 15
+    assert result['runway_counts'][15] == 1_000
+    assert result['out_within_year'] == 0
@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app import Telemetry
+
+
+def parse(exposition):
+    """{sample name with labels: value} from Prometheus text format"""
+    samples = {}
+    for line in exposition.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+def write_snapshot(directory, pid, snapshot):
+    with open(os.path.join(directory, f'{pid}.json'), 'w') as f:
+        json.dump(snapshot, f)
+
+
+@pytest.fixture
+def telemetry(tmp_path):
+    telemetry = Telemetry(str(tmp_path))
+    telemetry.counter('requests_total', 'Requests', ['route'])
+    telemetry.histogram('render_seconds', 'Render time', ['tab'], (0.1, 1))
+    telemetry.gauge('in_flight', 'Requests in flight')
+    return telemetry
+
+
+def test_snapshots_of_other_processes_are_merged(telemetry, tmp_path):
+    metrics = telemetry.metrics
+    metrics['requests_total'].inc(route='index')
+    metrics['render_seconds'].observe(0.05, tab='risk')
+    metrics['in_flight'].inc()
+
+    exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+    exited.wait()
+    write_snapshot(tmp_path, os.getppid(), {
+        'requests_total': [[['index'], 2], [['layout'], 5]],
+        'render_seconds': [[['risk'], [0, 3, 1, 2.5]], [['market'], [1, 0, 0, 0.02]]],
+        'in_flight': [[[], 2]]
+    })
+    write_snapshot(tmp_path, exited.pid, {
+        'requests_total': [[['index'], 4]],
+        'render_seconds': [[['risk'], [1, 0, 0, 0.01]]],
+        'in_flight': [[[], 7]],
+        'retired_metric': [[[], 1]]
+    })
+    (tmp_path / 'notes.json').write_text('{}')
+    (tmp_path / '12345678.json').write_text('{"requests_total": [[["index"], 1')
+
+    samples = parse(telemetry.exposition())
+    # Counters and histograms keep the totals of exited workers; gauges only count live ones
+    assert samples['requests_total{route="index"}'] == 7
+    assert samples['requests_total{route="layout"}'] == 5
+    assert samples['in_flight'] == 3
+    assert samples['render_seconds_bucket{tab="risk",le="0.1"}'] == 2
+    assert samples['render_seconds_bucket{tab="risk",le="1.0"}'] == 5
+    assert samples['render_seconds_bucket{tab="risk",le="+Inf"}'] == 6
+    assert samples['render_seconds_count{tab="risk"}'] == 6
+    assert samples['render_seconds_sum{tab="risk"}'] == pytest.approx(2.56)
+    assert samples['render_seconds_count{tab="market"}'] == 1
+    assert not any(name.startswith('retired_metric') for name in samples)
+
+
+def test_flush_writes_a_snapshot_other_processes_can_read(telemetry, tmp_path):
+    telemetry.metrics['requests_total'].inc(3, route='index')
+    telemetry.metrics['render_seconds'].observe(5, tab='risk')
+    telemetry.flush()
+    with open(tmp_path / f'{os.getpid()}.json') as f:
+        assert json.load(f) == telemetry.snapshot()
+
+    # Read back as if by another worker, which skips only its own pid
+    reader = Telemetry(str(tmp_path))
+    reader.counter('requests_total', 'Requests', ['route'])
+    reader.histogram('render_seconds', 'Render time', ['tab'], (0.1, 1))
+    os.rename(tmp_path / f'{os.getpid()}.json', tmp_path / f'{os.getppid()}.json')
+    samples = parse(reader.exposition())
+    assert samples['requests_total{route="index"}'] == 3
+    assert samples['render_seconds_bucket{tab="risk",le="1.0"}'] == 0
+    assert samples['render_seconds_bucket{tab="risk",le="+Inf"}'] == 1
+
+
+def test_labels_are_escaped(telemetry):
+    telemetry.metrics['requests_total'].inc(route='say "hi"\\\n')
+    assert 'requests_total{route="say \\"hi\\"\\\\\\n"} 1' in telemetry.exposition()
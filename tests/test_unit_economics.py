@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import app
+from app import CUSTOMER_SEGMENTS, UnitEconomics, assign_segments, row_positions, sample_unit_economics
+
+
+def naive_summary(tables, start, end, discount_rate=0.12, horizon_months=36):
+    """Segment users, LTV and CAC recomputed with pandas joins and groupbys"""
+    users = pd.DataFrame(tables['users'])
+    users['signup_date'] = pd.to_datetime(users['signup_date'])
+    users['segment'] = np.array(CUSTOMER_SEGMENTS)[
+        assign_segments(users['occupation'], users['industry'], users['age'])]
+
+    transactions = pd.DataFrame(tables['transactions']).merge(users[['user_id', 'signup_date']], on='user_id')
+    age = (pd.to_datetime(transactions['date']) - transactions['signup_date']).dt.days / 365.25
+    counted = (age >= 0) & (age < horizon_months / 12)
+    margin = (transactions['revenue'] - transactions['credit_loss']) * (1 + discount_rate) ** -age
+    ltv = margin[counted].groupby(transactions['user_id'][counted]).sum()
+    users['ltv'] = users['user_id'].map(ltv).fillna(0)
+
+    acquired = users[users['signup_date'].between(pd.Timestamp(start), pd.Timestamp(end))]
+    spend = pd.DataFrame(tables['marketing_spend'])
+    spend = spend[pd.to_datetime(spend['date']).between(pd.Timestamp(start), pd.Timestamp(end))]
+    channel_cac = spend.groupby('channel')['spend'].sum() / acquired.groupby('channel').size()
+    acquired = acquired.assign(cac=acquired['channel'].map(channel_cac).fillna(0))
+    return acquired.groupby('segment').agg(users=('user_id', 'size'), ltv=('ltv', 'mean'), cac=('cac', 'mean'))
+
+
+def as_frame(summary):
+    frame = pd.DataFrame({key: summary[key] for key in ('users', 'ltv', 'cac')}, index=summary['segment'])
+    return frame[frame['users'] > 0]
+
+
+@pytest.fixture(scope='module')
+def tables():
+    return sample_unit_economics(users=3_000, months=24, seed=4)
+
+
+@pytest.mark.parametrize('start, end', [('2023-01-01', '2024-12-31'), ('2023-07-01', '2024-03-31'),
+                                        ('2024-05-01', '2024-05-31')])
+def test_summary_matches_pandas(tables, start, end):
+    model = UnitEconomics(tables['users'], tables['transactions'], tables['marketing_spend'])
+    summary = as_frame(model.summary(start, end))
+    expected = naive_summary(tables, start, end).reindex(summary.index)
+    np.testing.assert_array_equal(summary['users'], expected['users'])
+    np.testing.assert_allclose(summary['ltv'], expected['ltv'], rtol=1e-9)
+    np.testing.assert_allclose(summary['cac'], expected['cac'], rtol=1e-9)
+
+
+def test_whole_range_is_the_default(tables):
+    model = UnitEconomics(tables['users'], tables['transactions'], tables['marketing_spend'])
+    first, last = model.date_range()
+    everything = model.summary()
+    np.testing.assert_array_equal(everything['users'], model.summary(first, last)['users'])
+    assert everything['users'].sum() == len(tables['users']['user_id'])
+
+
+def test_sparse_and_shuffled_ids_match_dense(tables):
+    dense = UnitEconomics(tables['users'], tables['transactions'], tables['marketing_spend'])
+    order = np.random.default_rng(0).permutation(len(tables['users']['user_id']))
+    users = {key: np.asarray(values)[order] for key, values in tables['users'].items()}
+    users['user_id'] = users['user_id'] * 7_919 + 10 ** 9
+    transactions = dict(tables['transactions'], user_id=tables['transactions']['user_id'] * 7_919 + 10 ** 9)
+    sparse = UnitEconomics(users, transactions, tables['marketing_spend'])
+    for start, end in [(None, None), ('2024-01-01', '2024-06-30')]:
+        left, right = dense.summary(start, end), sparse.summary(start, end)
+        np.testing.assert_array_equal(left['users'], right['users'])
+        np.testing.assert_allclose(left['ltv'], right['ltv'])
+        np.testing.assert_allclose(left['cac'], right['cac'])
+
+
+def test_unknown_users_and_channels_are_left_out_of_ltv_and_cac():
+    users = {'user_id': np.array([1, 2]), 'signup_date': np.array(['2024-01-10', '2024-01-20'], dtype='datetime64[D]'),
+             'channel': np.array(['search', 'walk-in']), 'segment': np.array(['A', 'A'])}
+    transactions = {'user_id': np.array([1, 2, 3]), 'date': np.array(['2024-01-10'] * 3, dtype='datetime64[D]'),
+                    'revenue': np.array([100.0, 50.0, 1_000.0])}
+    spend = {'date': np.array(['2024-01-01', '2024-01-01'], dtype='datetime64[D]'),
+             'channel': np.array(['search', 'social']), 'spend': np.array([300.0, 900.0])}
+    summary = UnitEconomics(users, transactions, spend).summary()
+    # User 2's transaction predates the signup; user 3 is unknown; social acquired nobody
+    assert summary['users'].tolist() == [2]
+    assert summary['ltv'].tolist() == [50.0]
+    assert summary['cac'].tolist() == [150.0]
+
+
+def test_row_positions_dense_and_sparse():
+    keys = np.array([0, 1, 2, 5, 9])
+    ids = np.array([5, 3, 0, 9, 12, -1])
+    assert row_positions(keys, ids).tolist() == [3, -1, 0, 4, -1, -1]
+    assert row_positions(keys * 1_000, ids * 1_000).tolist() == [3, -1, 0, 4, -1, -1]
+    assert row_positions(np.array(['a', 'c']), np.array(['c', 'b'])).tolist() == [1, -1]
+    assert row_positions(np.array([], dtype=np.int64), np.array([1])).tolist() == [-1]
+
+
+def test_sample_tables_are_generated_on_first_load():
+    assert not {'users', 'transactions', 'marketing_spend'} & set(app.SAMPLE_DATA)
+    source = app.InlineDataSource()
+    users = source.load('users')
+    np.testing.assert_array_equal(users['user_id'], sample_unit_economics()['users']['user_id'])
+    # Loads are copies of the one generated sample
+    users['age'][:] = 0
+    assert source.load('users')['age'].min() > 0
+    assert source.load('marketing_spend')['spend'].sum() > 0
+
+
+def card_text(component):
+    """All strings in a Dash component tree, in order"""
+    if isinstance(component, str):
+        return [component]
+    if isinstance(component, (list, tuple)):
+        return [text for child in component for text in card_text(child)]
+    return card_text(getattr(component, 'children', None) or [])
+
+
+def test_segment_insights_come_from_the_ltv_model():
+    analytics = app.ZestMoneyAnalytics()
+    summary = analytics.ltv_cac()
+    text = card_text(analytics.segment_insights())
+    best = int(np.argmax(summary['ltv']))
+    assert text[1] == f"{summary['segment'][best]}: ₹{summary['ltv'][best] / 1e5:.1f}L LTV"
+    best = int(np.argmax(summary['ltv_cac']))
+    assert f"{summary['segment'][best]}: {summary['ltv_cac'][best]:.1f}x LTV/CAC" in text
+    assert 'Segment Insights' in card_text(analytics.create_customer_content())
+
+
+def test_segment_insights_flag_segments_below_three_times():
+    users = {'user_id': np.array([1, 2]), 'signup_date': np.array(['2024-01-10'] * 2, dtype='datetime64[D]'),
+             'channel': np.array(['search', 'social']), 'segment': np.array(['Students', 'SME Owners'])}
+    transactions = {'user_id': np.array([1, 2]), 'date': np.array(['2024-02-10'] * 2, dtype='datetime64[D]'),
+                    'revenue': np.array([100.0, 50_000.0])}
+    spend = {'date': np.array(['2024-01-01'] * 2, dtype='datetime64[D]'),
+             'channel': np.array(['search', 'social']), 'spend': np.array([1_000.0, 1_000.0])}
+    analytics = app.ZestMoneyAnalytics(app.InlineDataSource(
+        {'users': users, 'transactions': transactions, 'marketing_spend': spend}, fallback=app.InlineDataSource()))
+    text = card_text(analytics.segment_insights())
+    assert text[1].startswith('SME Owners: ₹0.5L LTV')
+    assert text[-1] == 'Below the 3x threshold: Students'